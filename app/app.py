@@ -5,61 +5,127 @@ A web interface for browsing and copying AI prompts and skills.
 
 import json
 import os
-from flask import Flask, render_template
+from flask import Flask, jsonify, render_template, request, url_for
+
+import http_cache
+import instrumentation
+from catalog import Catalog
+from catalog_bundle import BundleCatalog
+from catalog_views import DEFAULT_PER_PAGE, SORT_OPTIONS, CatalogViews, ListingQuery
+from catalog_watcher import CatalogWatcher
+from content_store import ContentStore, StoreError, find_version, history_file
+from page_cache import PageCache
+from search import FACET_FIELDS, SearchIndex
 
 app = Flask(__name__)
 
 # Get the base directory (parent of app folder)
 BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+APP_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# In-process cache of prompts.json and all referenced content files, or the
+# precompiled bundle from scripts/build_catalog.py when CATALOG_BUNDLE is set
+CATALOG_BUNDLE = os.environ.get('CATALOG_BUNDLE')
+if CATALOG_BUNDLE:
+    catalog = BundleCatalog(CATALOG_BUNDLE)
+else:
+    catalog = Catalog(os.path.join(APP_DIR, 'prompts.json'), BASE_DIR)
+
+# Bodies of every recorded version, keyed by content hash; see
+# scripts/prompt_history.py
+store = ContentStore(os.path.join(BASE_DIR, 'store'))
+
+# Polls the library for edits when started; see start_catalog_watcher()
+CATALOG_WATCH_INTERVAL = float(os.environ.get('CATALOG_WATCH_INTERVAL', '1.0'))
+watcher = None
+
+# Templates and static assets are fixed for the life of the process, so
+# hash them once and fold the result into every page ETag
+ASSET_VERSION = http_cache.tree_hash(
+    os.path.join(APP_DIR, 'templates'), os.path.join(APP_DIR, 'static')
+)
+
+# Registered before compression so response sizes are measured as sent.
+# SERVER_TIMING=1 adds Server-Timing headers; PROFILE_SAMPLING=1 samples
+# request stacks and serves them on /debug/profile
+metrics = instrumentation.init_app(
+    app,
+    server_timing=os.environ.get('SERVER_TIMING') == '1',
+    profile=os.environ.get('PROFILE_SAMPLING') == '1',
+)
+http_cache.init_app(app)
+
+# Fully rendered HTML keyed by page name and ETag
+pages = PageCache()
+
+# Full-text index over metadata and content, synced with the catalog
+search_index = SearchIndex()
+
+# Sorted views and facet counts behind the paginated index page
+views = CatalogViews()
+
+# Facet dropdowns on the index page: (query parameter, field, label)
+FACET_SELECTS = [
+    ('category', 'Category', 'Categories'),
+    ('status', 'Status', 'Statuses'),
+    ('audience', 'TargetAudience', 'Audiences'),
+]
+
+
+def _cache_metrics():
+    """Catalog and page cache counters for /metrics, read at scrape time."""
+    stats = catalog.get_stats()
+    page_stats = pages.get_stats()
+    return [
+        ('catalog_loads_total', 'counter', 'Catalog loads and reloads', stats['misses'] + stats['reloads']),
+        ('catalog_load_seconds_total', 'counter', 'Time spent loading the catalog', stats['load_seconds']),
+        ('catalog_entries_reloaded_total', 'counter', 'Entries (re)built', stats['entries_reloaded']),
+        ('catalog_files_read_total', 'counter', 'Catalog files read', stats['files_read']),
+        ('catalog_bytes_read_total', 'counter', 'Catalog bytes read', stats['bytes_read']),
+        ('catalog_entries', 'gauge', 'Entries in the catalog', stats['entries']),
+        ('catalog_generation', 'gauge', 'Catalog generation', stats['generation']),
+        ('page_cache_hits_total', 'counter', 'Rendered page cache hits', page_stats['hits']),
+        ('page_cache_misses_total', 'counter', 'Rendered page cache misses', page_stats['misses']),
+    ]
+
+
+metrics.add_collector(_cache_metrics)
+
+# Upper bound on the per_page query parameter of the search API
+MAX_PER_PAGE = 1000
+
+
+def start_catalog_watcher():
+    """
+    Start the background watcher over prompts/, skills/ and prompts.json.
+
+    Once running, requests read the in-memory catalog snapshot without
+    touching the filesystem and edits are applied by the watcher. A bundle
+    catalog is already immutable, so nothing is started for it.
+
+    Returns:
+        CatalogWatcher or None: The running watcher.
+    """
+    global watcher
+    if watcher is None and isinstance(catalog, Catalog):
+        watcher = CatalogWatcher(
+            catalog,
+            [os.path.join(BASE_DIR, 'prompts'), os.path.join(BASE_DIR, 'skills'), catalog.items_json_path],
+            interval=CATALOG_WATCH_INTERVAL,
+        ).start()
+    return watcher
 
 
 def load_items():
     """
-    Load prompts and skills from the JSON data store and enrich with file content.
+    Load prompts and skills from the catalog cache.
 
     Returns:
-        list: List of item dictionaries with full content loaded.
-    """
-    items_json_path = os.path.join(os.path.dirname(__file__), 'prompts.json')
-
-    with open(items_json_path, 'r', encoding='utf-8') as f:
-        items = json.load(f)
-
-    # Load the actual content for each item
-    for item in items:
-        item_type = item.get('Type', 'prompt')
-
-        if item_type == 'skill':
-            # Load skill content from folder
-            skill_folder = os.path.join(BASE_DIR, item.get('SkillFolder', ''))
-            platforms = item.get('Platforms', [])
-            item['SkillVersions'] = {}
-
-            for platform in platforms:
-                skill_file = os.path.join(skill_folder, f'SKILL_{platform}.md')
-                try:
-                    with open(skill_file, 'r', encoding='utf-8') as f:
-                        item['SkillVersions'][platform] = f.read()
-                except FileNotFoundError:
-                    item['SkillVersions'][platform] = f"[Error: Skill file not found at {skill_file}]"
-                except Exception as e:
-                    item['SkillVersions'][platform] = f"[Error loading skill: {str(e)}]"
-
-            # Set primary content to first available platform
-            if platforms and item['SkillVersions']:
-                item['PromptContent'] = item['SkillVersions'].get(platforms[0], '')
-        else:
-            # Load prompt content from file
-            content_file_path = os.path.join(BASE_DIR, item.get('PromptContentFile', ''))
-            try:
-                with open(content_file_path, 'r', encoding='utf-8') as f:
-                    item['PromptContent'] = f.read()
-            except FileNotFoundError:
-                item['PromptContent'] = f"[Error: Content file not found at {item.get('PromptContentFile', '')}]"
-            except Exception as e:
-                item['PromptContent'] = f"[Error loading content: {str(e)}]"
-
-    return items
+        list: List of catalog entries. Metadata is available immediately and
+        content is read on first access. The list is shared between requests
+        and must not be modified.
+    """
+    return catalog.get_items()
 
 
 # Keep backwards compatibility
@@ -68,28 +134,332 @@ def load_prompts():
     return load_items()
 
 
+def _last_modified(item):
+    """Last change to an item's files or to its record in prompts.json."""
+    return max(filter(None, [item.last_modified, catalog.last_modified]), default=None)
+
+
 @app.route('/')
 def index():
-    """Render the main page with all prompts and skills."""
-    items = load_items()
-    return render_template('index.html', prompts=items)
+    """
+    Render one page of the library.
+
+    Query parameters: ``q`` (search), ``type``, ``category``, ``status``,
+    ``audience`` (filters), ``sort`` (title, version or updated), ``page``
+    and ``per_page``. Only the entries on the requested page are rendered.
+    """
+    query = ListingQuery.from_args(request.args)
+    views.sync(catalog)
+    parts = [ASSET_VERSION, catalog.metadata_hash]
+    matches = None
+    if query.q:
+        search_index.sync(catalog)
+        matches = search_index.ranking(query.q)
+        # Search also covers content, so the page depends on every body
+        parts.append(catalog.version)
+    listing = views.query(query, matches)
+    last_modified = catalog.last_modified
+    if query.q or query.sort == 'updated':
+        # These listings also depend on the content files
+        last_modified = max(filter(None, [views.last_modified(), last_modified]), default=None)
+    key = query.cache_key()
+    etag = http_cache.make_etag(*parts, listing['order'], key)
+    return http_cache.conditional(
+        etag,
+        lambda: pages.get_or_render(
+            f'index?{key}', etag, lambda: render_template(
+                'index.html', prompts=listing['items'], listing=listing, query=query,
+                facet_selects=FACET_SELECTS, sort_options=SORT_OPTIONS, default_per_page=DEFAULT_PER_PAGE,
+            )
+        ),
+        last_modified=last_modified,
+    )
 
 
 @app.route('/prompt/<int:prompt_id>')
 def prompt_detail(prompt_id):
     """Render a detail page for a single prompt or skill."""
-    items = load_items()
-    item = next((p for p in items if p['id'] == prompt_id), None)
+    item = catalog.get(prompt_id)
     if item is None:
         return "Item not found", 404
-    return render_template('detail.html', prompt=item)
+    etag = http_cache.make_etag(ASSET_VERSION, item.version)
+    return http_cache.conditional(
+        etag,
+        lambda: pages.get_or_render(
+            f'prompt/{prompt_id}', etag, lambda: render_template('detail.html', prompt=item)
+        ),
+        last_modified=_last_modified(item),
+    )
+
+
+def _requested_content(item_id):
+    """
+    Resolve the item and body requested by the content endpoints.
+
+    Skills accept an optional ``platform`` query parameter and default to
+    their first platform.
+
+    Returns:
+        tuple: (item, platform, content, error response or None)
+    """
+    item = catalog.get(item_id)
+    if item is None:
+        return None, None, None, (jsonify({'error': 'Item not found'}), 404)
+
+    platform = request.args.get('platform')
+    if item.get('Type', 'prompt') == 'skill' and platform:
+        content = item.get('SkillVersions', {}).get(platform)
+        if content is None:
+            return item, platform, None, (jsonify({'error': f'Platform not found: {platform}'}), 404)
+    else:
+        platform = None
+        content = item.get('PromptContent', '')
+    return item, platform, content, None
+
+
+@app.route('/api/items/<int:item_id>/content')
+def item_content(item_id):
+    """Return the content of a single prompt or skill as JSON."""
+    item, platform, content, error = _requested_content(item_id)
+    if error:
+        return error
+
+    return http_cache.conditional(
+        http_cache.make_etag(item.version, platform),
+        lambda: json.dumps({'id': item_id, 'platform': platform, 'content': content}),
+        last_modified=_last_modified(item),
+        mimetype='application/json',
+    )
+
+
+@app.route('/api/items/<int:item_id>/content.txt')
+def item_content_text(item_id):
+    """
+    Return the content of a single prompt or skill as plain text.
+
+    When the catalog is served from a bundle, gzip clients get the body
+    precompressed at build time.
+    """
+    item, platform, content, error = _requested_content(item_id)
+    if error:
+        return error
+
+    encoded = None
+    if hasattr(item, 'gzip_body'):
+        encoded = {'gzip': lambda: item.gzip_body(platform)}
+    return http_cache.conditional(
+        http_cache.make_etag(item.version, platform, 'text'),
+        lambda: content,
+        last_modified=_last_modified(item),
+        mimetype='text/plain',
+        encoded=encoded,
+    )
+
+
+@app.route('/api/items/<int:item_id>/history')
+def item_history(item_id):
+    """List the recorded versions of a prompt or skill, oldest first."""
+    item = catalog.get(item_id)
+    if item is None:
+        return jsonify({'error': 'Item not found'}), 404
+
+    def build():
+        current = item.current_files()
+        return json.dumps({
+            'id': item_id,
+            'versions': [
+                {
+                    'version': record.get('Version'),
+                    'date': record.get('Date'),
+                    'files': record.get('Files', {}),
+                    'current': record.get('Files') == current,
+                }
+                for record in item.get('History', [])
+            ],
+        })
+
+    return http_cache.conditional(
+        http_cache.make_etag(item.version, 'history'),
+        build,
+        last_modified=_last_modified(item),
+        mimetype='application/json',
+    )
+
+
+def _version_hash(item, version):
+    """
+    Resolve the content hash of an item's body at a recorded version.
+
+    Skills accept an optional ``platform`` query parameter and default to
+    their first platform.
+
+    Returns:
+        tuple: (content hash, error response or None)
+    """
+    record = find_version(item.get('History', []), version)
+    if record is None:
+        return None, (jsonify({'error': f'Version not found: {version}'}), 404)
+    path = history_file(item.metadata, request.args.get('platform'))
+    blob_hash = record.get('Files', {}).get(path)
+    if blob_hash is None:
+        return None, (jsonify({'error': f"Platform not found: {request.args.get('platform')}"}), 404)
+    if blob_hash not in store:
+        return None, (jsonify({'error': f'Content of version {version} is not in the store'}), 404)
+    return blob_hash, None
+
+
+def _store_error(error):
+    """
+    Response for a blob that is in the store but cannot be read back.
+
+    Unknown versions and blobs missing from the store are reported as 404s
+    by _version_hash before anything is read, so a StoreError here means a
+    stored blob (or a delta base it depends on) is damaged.
+    """
+    return jsonify({'error': f'Corrupt blob in content store: {error}'}), 500
+
+
+@app.route('/api/items/<int:item_id>/versions/<version>/content.txt')
+def item_version_content(item_id, version):
+    """Return the body of a prompt or skill at a recorded version as plain text."""
+    item = catalog.get(item_id)
+    if item is None:
+        return jsonify({'error': 'Item not found'}), 404
+    blob_hash, error = _version_hash(item, version)
+    if error:
+        return error
+
+    # Bodies are addressed by hash, so the hash is a complete validator
+    try:
+        return http_cache.conditional(
+            http_cache.make_etag(blob_hash),
+            lambda: store.get(blob_hash),
+            mimetype='text/plain',
+        )
+    except StoreError as e:
+        return _store_error(e)
+
+
+@app.route('/api/items/<int:item_id>/diff')
+def item_diff(item_id):
+    """
+    Return a unified diff of a prompt or skill between two recorded versions.
+
+    Query parameters: ``from`` (required), ``to`` (defaults to the latest
+    recorded version) and ``platform`` for skills.
+    """
+    item = catalog.get(item_id)
+    if item is None:
+        return jsonify({'error': 'Item not found'}), 404
+    history = item.get('History', [])
+    old_version = request.args.get('from')
+    new_version = request.args.get('to') or (history[-1].get('Version') if history else None)
+    if not old_version:
+        return jsonify({'error': 'Missing from parameter'}), 400
+
+    old_hash, error = _version_hash(item, old_version)
+    if error:
+        return error
+    new_hash, error = _version_hash(item, new_version)
+    if error:
+        return error
+
+    path = history_file(item.metadata, request.args.get('platform'))
+    try:
+        return http_cache.conditional(
+            http_cache.make_etag(old_hash, new_hash, path, 'diff'),
+            lambda: store.diff(old_hash, new_hash, f'{path}@{old_version}', f'{path}@{new_version}'),
+            mimetype='text/plain',
+        )
+    except StoreError as e:
+        return _store_error(e)
+
+
+@app.route('/api/search')
+def search():
+    """
+    Search prompts and skills.
+
+    Query parameters: ``q`` (free text), ``type``, ``category``, ``status``,
+    ``audience`` (facet filters), ``page`` and ``per_page``.
+    """
+    search_index.sync(catalog)
+    filters = {field: request.args.get(param) for param, field in FACET_FIELDS.items()}
+    page = request.args.get('page', 1, type=int)
+    per_page = min(max(request.args.get('per_page', 20, type=int), 1), MAX_PER_PAGE)
+
+    found = search_index.search(request.args.get('q', ''), filters, page=page, per_page=per_page)
+    results = []
+    for hit in found['results']:
+        item = catalog.get(hit['id'])
+        if item is None:
+            continue
+        results.append({
+            'id': item.id,
+            'title': item.get('Title'),
+            'type': item.get('Type', 'prompt'),
+            'category': item.get('Category'),
+            'usecase': item.get('UseCase'),
+            'url': url_for('prompt_detail', prompt_id=item.id),
+            'score': hit['score'],
+        })
+    found['results'] = results
+    found['query'] = request.args.get('q', '')
+    return jsonify(found)
+
+
+@app.route('/api/catalog/stats')
+def catalog_stats():
+    """Return the catalog and page cache counters."""
+    stats = catalog.get_stats()
+    stats['pages'] = pages.get_stats()
+    if watcher is not None:
+        stats['watcher'] = dict(watcher.stats)
+    return jsonify(stats)
+
+
+@app.route('/healthz')
+def healthz():
+    """
+    Liveness check.
+
+    Never touches the filesystem; the catalog version is reported once the
+    catalog has been loaded and is null before that.
+    """
+    return jsonify({
+        'status': 'ok',
+        'pid': os.getpid(),
+        'catalog_version': catalog.version if catalog.is_loaded else None,
+    })
+
+
+@app.route('/readyz')
+def readyz():
+    """Readiness check: 200 once the catalog is loaded and serving, 503 otherwise."""
+    try:
+        items = catalog.get_items()
+        version = catalog.version
+    except Exception as e:
+        return jsonify({'status': 'unavailable', 'error': str(e)}), 503
+    return jsonify({
+        'status': 'ready',
+        'catalog_version': version,
+        'generation': catalog.generation,
+        'entries': len(items),
+        'watching': watcher is not None,
+    })
 
 
 @app.route('/guide')
 def guide():
     """Render the how-to-use guide page."""
-    return render_template('guide.html')
+    etag = http_cache.make_etag(ASSET_VERSION, 'guide')
+    return http_cache.conditional(
+        etag,
+        lambda: pages.get_or_render('guide', etag, lambda: render_template('guide.html')),
+    )
 
 
 if __name__ == '__main__':
+    start_catalog_watcher()
     app.run(debug=True, host='0.0.0.0', port=5000)
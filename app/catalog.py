@@ -0,0 +1,474 @@
+"""
+Kearney AI Skills Library - Catalog Cache
+Keeps prompts.json metadata in memory, indexed by id, and reads prompt/skill
+content lazily. Only the entries whose files changed on disk are reloaded,
+either on request or when notified by a CatalogWatcher.
+"""
+
+import hashlib
+import json
+import os
+import threading
+import time
+from collections.abc import Mapping
+from datetime import datetime, timezone
+from typing import NamedTuple
+
+
+def content_hash(text):
+    """Return the SHA-256 hex digest of a content body."""
+    return hashlib.sha256(text.encode('utf-8')).hexdigest()
+
+
+def catalog_version(metadata_hash, entries):
+    """
+    Hash the catalog metadata and every entry version.
+
+    A catalog bundle built from a source catalog carries the same version,
+    so it identifies the served content regardless of how it is loaded.
+    """
+    digest = hashlib.sha256(str(metadata_hash).encode('utf-8'))
+    for entry in entries:
+        digest.update(f'\0{entry.version}'.encode('utf-8'))
+    return digest.hexdigest()
+
+
+def _mtime_datetime(signature):
+    """Convert a file signature to a UTC datetime, or None."""
+    if signature is None:
+        return None
+    return datetime.fromtimestamp(signature[0] / 1e9, tz=timezone.utc)
+
+
+def _file_signature(path):
+    """Return a cheap change signature for a file, or None if it is missing."""
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return (st.st_mtime_ns, st.st_size)
+
+
+class CatalogEntry(Mapping):
+    """
+    A single prompt or skill.
+
+    Metadata from prompts.json is available immediately. The PromptContent
+    and SkillVersions bodies are read from disk on first access, so code and
+    templates can keep treating the entry like the old item dictionary.
+    """
+
+    CONTENT_KEYS = ('PromptContent', 'SkillVersions')
+
+    def __init__(self, raw, catalog):
+        self.id = raw.get('id')
+        self.metadata = raw
+        self.files = {}
+        self.file_hashes = {}
+        self.errors = {}
+        self._catalog = catalog
+        self._content = None
+        self._version = None
+        self._lock = threading.Lock()
+
+    @property
+    def is_loaded(self):
+        """True once the content files have been read."""
+        return self._content is not None
+
+    @property
+    def content(self):
+        """The content fields, loaded on first access."""
+        if self._content is None:
+            with self._lock:
+                if self._content is None:
+                    self._content = self._load_content()
+                    self._catalog._track(self)
+        return self._content
+
+    @property
+    def version(self):
+        """
+        Hash of this entry's metadata and content file hashes.
+
+        Changes whenever the entry's prompts.json record or any of its
+        content files change. Reading it loads the content.
+        """
+        if self._version is None:
+            self.content
+            digest = hashlib.sha256(json.dumps(self.metadata, sort_keys=True).encode('utf-8'))
+            for path, file_hash in sorted(self.file_hashes.items()):
+                digest.update(f'\0{path}\0{file_hash}'.encode('utf-8'))
+            self._version = digest.hexdigest()
+        return self._version
+
+    @property
+    def last_modified(self):
+        """
+        Latest change to this entry's own content files and History.
+
+        prompts.json is shared by every entry, so its modification time is
+        only used for an entry without files or History; otherwise every
+        write to it (e.g. recording a version) would make all entries tie.
+
+        Uses the signatures recorded when the content was read. An entry
+        that has not been read yet records its signatures on first use, and
+        the catalog then checks them for changes like those of read files,
+        so orders sorted on this value are rebuilt when a file is edited.
+        """
+        if not self.files:
+            with self._lock:
+                if not self.files:
+                    self.files = {path: _file_signature(path) for _, path, _ in self._content_files()}
+                    self._catalog._track(self)
+        times = [_mtime_datetime(sig) for sig in list(self.files.values())]
+        times.append(self._history_date())
+        times = [t for t in times if t is not None]
+        return max(times) if times else self._catalog.last_modified
+
+    def _history_date(self):
+        """Date of the latest History record as a UTC datetime, or None."""
+        history = self.metadata.get('History') or []
+        try:
+            return datetime.fromisoformat(str(history[-1]['Date'])).replace(tzinfo=timezone.utc)
+        except (IndexError, KeyError, TypeError, ValueError):
+            return None
+
+    def current_files(self):
+        """
+        Hashes of this entry's content files, keyed by path relative to the
+        library root as in prompts.json ``History`` records. Loads the content.
+        """
+        self.content
+        return self.file_hashes
+
+    def _content_keys(self):
+        if self.metadata.get('Type', 'prompt') != 'skill':
+            return ('PromptContent',)
+        if self.metadata.get('Platforms'):
+            return ('SkillVersions', 'PromptContent')
+        return ('SkillVersions',)
+
+    def __getitem__(self, key):
+        if key in self.CONTENT_KEYS:
+            content = self.content
+            if key not in content:
+                raise KeyError(key)
+            return content[key]
+        return self.metadata[key]
+
+    def __iter__(self):
+        yield from self.metadata
+        yield from self._content_keys()
+
+    def __len__(self):
+        return len(self.metadata) + len(self._content_keys())
+
+    def __repr__(self):
+        return f"<CatalogEntry id={self.id!r} loaded={self.is_loaded}>"
+
+    def _content_files(self):
+        """Return (platform, path, hash key) per content file; platform is None for prompts."""
+        base_dir = self._catalog.base_dir
+        if self.metadata.get('Type', 'prompt') == 'skill':
+            skill_folder = os.path.join(base_dir, self.metadata.get('SkillFolder', ''))
+            files = []
+            for platform in self.metadata.get('Platforms', []):
+                skill_file = os.path.join(skill_folder, f'SKILL_{platform}.md')
+                files.append((platform, skill_file, os.path.relpath(skill_file, base_dir)))
+            return files
+        content_file = self.metadata.get('PromptContentFile', '')
+        return [(None, os.path.join(base_dir, content_file), content_file)]
+
+    def content_paths(self):
+        """Absolute paths of the content files this entry reads, without reading them."""
+        return {os.path.abspath(path) for _, path, _ in self._content_files()}
+
+    def _read_file(self, content, platform, path, hash_key):
+        """Read one content file into ``content`` and record its signature and hash."""
+        read_text = self._catalog._read_text
+        self.files[path] = _file_signature(path)
+        self.errors.pop(path, None)
+        if platform is not None:
+            try:
+                text = read_text(path)
+            except FileNotFoundError:
+                text = self.errors[path] = f"[Error: Skill file not found at {path}]"
+            except Exception as e:
+                text = self.errors[path] = f"[Error loading skill: {str(e)}]"
+            content['SkillVersions'][platform] = text
+        else:
+            try:
+                text = read_text(path)
+            except FileNotFoundError:
+                text = self.errors[path] = f"[Error: Content file not found at {hash_key}]"
+            except Exception as e:
+                text = self.errors[path] = f"[Error loading content: {str(e)}]"
+            content['PromptContent'] = text
+        self.file_hashes[hash_key] = content_hash(text)
+
+    def _set_primary_content(self, content):
+        # Set primary content of a skill to its first available platform
+        platforms = self.metadata.get('Platforms', [])
+        if 'SkillVersions' in content and platforms and content['SkillVersions']:
+            content['PromptContent'] = content['SkillVersions'].get(platforms[0], '')
+
+    def _load_content(self):
+        """Read the content files for this entry."""
+        content = {}
+        if self.metadata.get('Type', 'prompt') == 'skill':
+            content['SkillVersions'] = {}
+        for platform, path, hash_key in self._content_files():
+            self._read_file(content, platform, path, hash_key)
+        self._set_primary_content(content)
+        return content
+
+    def reloaded(self, paths):
+        """
+        Return a copy of this entry with the given content files re-read.
+
+        Content from the entry's other files is carried over, so editing one
+        skill platform re-reads just that file. An entry whose content was
+        never loaded is returned unloaded.
+        """
+        entry = CatalogEntry(self.metadata, self._catalog)
+        if not self.is_loaded:
+            return entry
+        content = dict(self._content)
+        if 'SkillVersions' in content:
+            content['SkillVersions'] = dict(content['SkillVersions'])
+        entry.files = dict(self.files)
+        entry.file_hashes = dict(self.file_hashes)
+        entry.errors = dict(self.errors)
+        for platform, path, hash_key in entry._content_files():
+            if os.path.abspath(path) in paths:
+                entry._read_file(content, platform, path, hash_key)
+        entry._set_primary_content(content)
+        entry._content = content
+        return entry
+
+    def files_changed(self):
+        """True if any content file read by this entry changed on disk."""
+        return any(_file_signature(path) != sig for path, sig in self.files.items())
+
+
+class CatalogSnapshot(NamedTuple):
+    """An immutable view of the catalog; replaced as a whole on every change."""
+    items: list
+    index: dict
+    generation: int
+    metadata_hash: str
+    last_modified: datetime
+
+
+EMPTY_SNAPSHOT = CatalogSnapshot(None, {}, 0, None, None)
+
+
+class Catalog:
+    """
+    In-process cache of the prompt and skill library.
+
+    Metadata is loaded once and indexed by id. Revalidation stats
+    prompts.json and the content files of entries that have actually been
+    read; only entries whose metadata or files changed are replaced.
+
+    Readers always see one consistent CatalogSnapshot: updates build a new
+    snapshot and swap it in with a single assignment. While a watcher (see
+    catalog_watcher) is attached, requests do no filesystem checks at all
+    and changes arrive through ``apply_changes``.
+    """
+
+    def __init__(self, items_json_path, base_dir, check_interval=1.0):
+        self.items_json_path = items_json_path
+        self.base_dir = base_dir
+        self.check_interval = check_interval
+        self.watched = False
+        self.stats = {
+            'hits': 0,
+            'misses': 0,
+            'reloads': 0,
+            'entries_reloaded': 0,
+            'files_read': 0,
+            'bytes_read': 0,
+            'load_seconds': 0.0,
+        }
+        self._lock = threading.Lock()
+        self._stats_lock = threading.Lock()
+        self._snapshot = EMPTY_SNAPSHOT
+        self._tracked = {}
+        self._json_signature = None
+        self._raw_items = None
+        self._metadata = (None, None)
+        self._version = (None, None)
+        self._last_check = 0.0
+
+    @property
+    def generation(self):
+        return self._snapshot.generation
+
+    @property
+    def metadata_hash(self):
+        return self._snapshot.metadata_hash
+
+    @property
+    def last_modified(self):
+        return self._snapshot.last_modified
+
+    @property
+    def is_loaded(self):
+        """True once prompts.json has been read."""
+        return self._snapshot.items is not None
+
+    @property
+    def version(self):
+        """Version of the current snapshot (see catalog_version); loads all content."""
+        snapshot = self.snapshot()
+        cached_snapshot, version = self._version
+        if cached_snapshot is not snapshot:
+            version = catalog_version(snapshot.metadata_hash, snapshot.items)
+            self._version = (snapshot, version)
+        return version
+
+    def snapshot(self):
+        """Return the current snapshot, reloading changed entries if needed."""
+        self._refresh()
+        return self._snapshot
+
+    def get_items(self):
+        """
+        Return the list of entries, reloading changed entries if needed.
+
+        The returned list is shared between requests and must be treated as
+        read-only.
+        """
+        return self.snapshot().items
+
+    def get(self, item_id):
+        """Return the entry with the given id, or None."""
+        return self.snapshot().index.get(item_id)
+
+    def get_stats(self):
+        """Return a snapshot of the cache counters."""
+        with self._lock:
+            snapshot = self._snapshot
+            stats = dict(self.stats)
+            stats['generation'] = snapshot.generation
+            stats['entries'] = len(snapshot.items or [])
+            stats['entries_loaded'] = sum(1 for entry in snapshot.items or [] if entry.is_loaded)
+            stats['watched'] = self.watched
+            return stats
+
+    def apply_changes(self, paths):
+        """
+        Apply file changes reported by a watcher.
+
+        prompts.json is re-read if it is among ``paths``. Entries whose
+        metadata changed are replaced; loaded entries re-read only their
+        changed files. A new snapshot is published if anything changed.
+        """
+        paths = {os.path.abspath(path) for path in paths}
+        with self._lock:
+            if self._snapshot.items is None:
+                self._load()
+                return
+            start = time.perf_counter()
+            if os.path.abspath(self.items_json_path) in paths:
+                self._read_items_json()
+
+            snapshot = self._snapshot
+            items = []
+            changed = False
+            for raw in self._raw_items:
+                entry = snapshot.index.get(raw.get('id'))
+                if entry is None or entry.metadata != raw:
+                    entry = CatalogEntry(raw, self)
+                elif entry.content_paths() & paths:
+                    entry = entry.reloaded(paths)
+                else:
+                    items.append(entry)
+                    continue
+                self.stats['entries_reloaded'] += 1
+                changed = True
+                items.append(entry)
+
+            if changed or len(items) != len(snapshot.items):
+                self.stats['reloads'] += 1
+                self._publish(items, snapshot.generation + 1)
+            self.stats['load_seconds'] += time.perf_counter() - start
+
+    def _refresh(self):
+        if self.watched and self._snapshot.items is not None:
+            self.stats['hits'] += 1
+            return
+        with self._lock:
+            if self._snapshot.items is None:
+                self.stats['misses'] += 1
+                self._load()
+            elif self._should_check() and self._is_stale():
+                self.stats['reloads'] += 1
+                self._load()
+            else:
+                self.stats['hits'] += 1
+
+    def _should_check(self):
+        now = time.monotonic()
+        if now - self._last_check < self.check_interval:
+            return False
+        self._last_check = now
+        return True
+
+    def _is_stale(self):
+        if _file_signature(self.items_json_path) != self._json_signature:
+            return True
+        return any(entry.files_changed() for entry in list(self._tracked.values()))
+
+    def _track(self, entry):
+        """Check the files an entry has recorded signatures for when revalidating."""
+        if self._snapshot.index.get(entry.id) is entry:
+            self._tracked[entry.id] = entry
+
+    def _read_text(self, path):
+        with open(path, 'r', encoding='utf-8') as f:
+            content = f.read()
+        with self._stats_lock:
+            self.stats['files_read'] += 1
+            self.stats['bytes_read'] += len(content)
+        return content
+
+    def _read_items_json(self):
+        signature = _file_signature(self.items_json_path)
+        text = self._read_text(self.items_json_path)
+        self._raw_items = json.loads(text)
+        self._json_signature = signature
+        self._metadata = (content_hash(text), _mtime_datetime(signature))
+
+    def _publish(self, items, generation):
+        """Swap in a new snapshot built from ``items``."""
+        metadata_hash, last_modified = self._metadata
+        self._snapshot = CatalogSnapshot(
+            items, {entry.id: entry for entry in items}, generation, metadata_hash, last_modified
+        )
+        self._tracked = {entry.id: entry for entry in items if entry.files}
+        self._last_check = time.monotonic()
+
+    def _load(self):
+        start = time.perf_counter()
+        if self._raw_items is None or _file_signature(self.items_json_path) != self._json_signature:
+            self._read_items_json()
+
+        snapshot = self._snapshot
+        items = []
+        changed = False
+        for raw in self._raw_items:
+            entry = snapshot.index.get(raw.get('id'))
+            if entry is None or entry.metadata != raw or entry.files_changed():
+                entry = CatalogEntry(raw, self)
+                self.stats['entries_reloaded'] += 1
+                changed = True
+            items.append(entry)
+
+        generation = snapshot.generation
+        if changed or len(items) != len(snapshot.index):
+            generation += 1
+        self._publish(items, generation)
+        self.stats['load_seconds'] += time.perf_counter() - start
@@ -0,0 +1,300 @@
+"""
+Kearney AI Skills Library - Catalog Bundle
+A single precompiled file holding the whole library: normalized metadata,
+content bodies (plain and gzip), content hashes and precomputed search
+terms. Built by scripts/build_catalog.py and memory-mapped by the app, so
+loading the catalog is one file open and requests never touch the
+filesystem.
+
+Layout: MAGIC, an 8-byte big-endian header length, a JSON header, then a
+blob of bodies and search terms referenced from the header by
+(offset, length) relative to the start of the blob.
+"""
+
+import gzip
+import hashlib
+import json
+import mmap
+import os
+import threading
+import time
+from datetime import datetime, timezone
+
+from catalog import CatalogEntry, _file_signature, catalog_version
+from search import INDEX_VERSION, document_terms, entry_document
+
+MAGIC = b'KAICAT1\n'
+FORMAT_VERSION = 1
+HEADER_LENGTH_BYTES = 8
+
+
+class BundleError(Exception):
+    """Raised when a bundle cannot be built or read."""
+
+
+def _timestamp(dt):
+    return dt.timestamp() if dt is not None else None
+
+
+def _datetime(timestamp):
+    return datetime.fromtimestamp(timestamp, tz=timezone.utc) if timestamp is not None else None
+
+
+class _BlobWriter:
+    """Accumulates blob sections, storing identical bodies once."""
+
+    def __init__(self):
+        self.parts = []
+        self.size = 0
+        self._bodies = {}
+
+    def add(self, data):
+        offset = self.size
+        self.parts.append(data)
+        self.size += len(data)
+        return [offset, len(data)]
+
+    def add_body(self, text):
+        """Store a body and its gzip form; return [offset, length, gz_offset, gz_length]."""
+        data = text.encode('utf-8')
+        key = hashlib.sha256(data).digest()
+        ref = self._bodies.get(key)
+        if ref is None:
+            ref = self._bodies[key] = self.add(data) + self.add(gzip.compress(data, compresslevel=9, mtime=0))
+        return ref
+
+
+def build_bundle(catalog, allow_errors=False):
+    """
+    Compile a source Catalog into bundle bytes.
+
+    Every content file is read and hashed. Entries whose files are missing
+    or unreadable fail the build instead of being served as error strings,
+    unless ``allow_errors`` keeps the error text as the body.
+
+    Returns:
+        bytes: The bundle file contents.
+
+    Raises:
+        BundleError: Listing every content file that could not be read.
+    """
+    entries = catalog.get_items()
+    errors = []
+    for entry in entries:
+        entry.content
+        errors += [f"item {entry.id}: {error}" for error in entry.errors.values()]
+    if errors and not allow_errors:
+        raise BundleError('\n'.join(errors))
+
+    blob = _BlobWriter()
+    items = []
+    for entry in entries:
+        bodies = {}
+        if 'SkillVersions' in entry.content:
+            bodies['SkillVersions'] = {
+                platform: blob.add_body(text) for platform, text in entry.content['SkillVersions'].items()
+            }
+        if 'PromptContent' in entry.content:
+            bodies['PromptContent'] = blob.add_body(entry.content['PromptContent'])
+
+        fields, _ = entry_document(entry)
+        terms = json.dumps(document_terms(fields), separators=(',', ':')).encode('utf-8')
+        items.append({
+            'metadata': entry.metadata,
+            'version': entry.version,
+            'last_modified': _timestamp(entry.last_modified),
+            'file_hashes': entry.file_hashes,
+            'bodies': bodies,
+            'terms': blob.add(terms),
+        })
+
+    header = json.dumps({
+        'format': FORMAT_VERSION,
+        'version': catalog_version(catalog.metadata_hash, entries),
+        'built_at': datetime.now(timezone.utc).isoformat(),
+        'metadata_hash': catalog.metadata_hash,
+        'last_modified': _timestamp(catalog.last_modified),
+        'search_version': INDEX_VERSION,
+        'items': items,
+    }, separators=(',', ':')).encode('utf-8')
+    return b''.join([MAGIC, len(header).to_bytes(HEADER_LENGTH_BYTES, 'big'), header] + blob.parts)
+
+
+def write_bundle(catalog, path, allow_errors=False):
+    """Build a bundle and write it atomically. Returns the bundle header."""
+    data = build_bundle(catalog, allow_errors)
+    tmp_path = f'{path}.tmp'
+    with open(tmp_path, 'wb') as f:
+        f.write(data)
+    os.replace(tmp_path, path)
+    return _parse_header(data)[0]
+
+
+def _parse_header(buffer):
+    """Return (header dict, blob start offset) for bundle bytes or an mmap."""
+    if buffer[:len(MAGIC)] != MAGIC:
+        raise BundleError('not a catalog bundle')
+    start = len(MAGIC) + HEADER_LENGTH_BYTES
+    length = int.from_bytes(buffer[len(MAGIC):start], 'big')
+    header = json.loads(buffer[start:start + length])
+    if header.get('format') != FORMAT_VERSION:
+        raise BundleError(f"unsupported bundle format: {header.get('format')}")
+    return header, start + length
+
+
+class BundleEntry(CatalogEntry):
+    """
+    A catalog entry backed by a memory-mapped bundle.
+
+    Bodies are decoded from the mapping on first access; the version,
+    hashes and modification time were computed at build time.
+    """
+
+    def __init__(self, item, catalog, blob, blob_start, search_version):
+        super().__init__(item['metadata'], catalog)
+        self.file_hashes = item['file_hashes']
+        self._version = item['version']
+        self._last_modified = _datetime(item['last_modified'])
+        self._bodies = item['bodies']
+        self._terms = item['terms'] if search_version == INDEX_VERSION else None
+        self._blob = blob
+        self._blob_start = blob_start
+
+    @property
+    def last_modified(self):
+        return self._last_modified
+
+    def _slice(self, offset, length):
+        start = self._blob_start + offset
+        return self._blob[start:start + length]
+
+    def _load_content(self):
+        content = {}
+        if 'SkillVersions' in self._bodies:
+            content['SkillVersions'] = {
+                platform: self._slice(*ref[:2]).decode('utf-8')
+                for platform, ref in self._bodies['SkillVersions'].items()
+            }
+        if 'PromptContent' in self._bodies:
+            content['PromptContent'] = self._slice(*self._bodies['PromptContent'][:2]).decode('utf-8')
+        return content
+
+    def gzip_body(self, platform=None):
+        """Return the precompressed body for a skill platform or the primary content, or None."""
+        if platform is not None:
+            ref = self._bodies.get('SkillVersions', {}).get(platform)
+        else:
+            ref = self._bodies.get('PromptContent')
+        return self._slice(*ref[2:]) if ref else None
+
+    @property
+    def search_terms(self):
+        """Precomputed search term frequencies, or None if built with another tokenizer."""
+        if self._terms is None:
+            return None
+        return json.loads(self._slice(*self._terms))
+
+    def __repr__(self):
+        return f"<BundleEntry id={self.id!r} loaded={self.is_loaded}>"
+
+
+class BundleCatalog:
+    """
+    Catalog served from a bundle file, with the same interface as Catalog.
+
+    The file is memory-mapped and only its header is parsed up front.
+    Revalidation stats the bundle alone (at most once per
+    ``check_interval``) and swaps in a rebuilt bundle as a whole.
+    """
+
+    def __init__(self, path, check_interval=1.0):
+        self.path = path
+        self.check_interval = check_interval
+        self.generation = 0
+        self.version = None
+        self.metadata_hash = None
+        self.last_modified = None
+        self.stats = {
+            'hits': 0,
+            'misses': 0,
+            'reloads': 0,
+            'entries_reloaded': 0,
+            'files_read': 0,
+            'bytes_read': 0,
+            'load_seconds': 0.0,
+        }
+        self._lock = threading.Lock()
+        self._items = None
+        self._index = {}
+        self._signature = None
+        self._last_check = 0.0
+
+    @property
+    def is_loaded(self):
+        """True once the bundle has been mapped."""
+        return self._items is not None
+
+    def get_items(self):
+        """Return the shared, read-only list of entries."""
+        self._refresh()
+        return self._items
+
+    def get(self, item_id):
+        """Return the entry with the given id, or None."""
+        self._refresh()
+        return self._index.get(item_id)
+
+    def get_stats(self):
+        """Return a snapshot of the cache counters."""
+        with self._lock:
+            stats = dict(self.stats)
+            stats['generation'] = self.generation
+            stats['entries'] = len(self._items or [])
+            stats['entries_loaded'] = sum(1 for entry in self._items or [] if entry.is_loaded)
+            stats['bundle_version'] = self.version
+            return stats
+
+    def _refresh(self):
+        with self._lock:
+            if self._items is None:
+                self.stats['misses'] += 1
+                self._load()
+            elif self._should_check() and _file_signature(self.path) != self._signature:
+                self.stats['reloads'] += 1
+                self._load()
+            else:
+                self.stats['hits'] += 1
+
+    def _should_check(self):
+        now = time.monotonic()
+        if now - self._last_check < self.check_interval:
+            return False
+        self._last_check = now
+        return True
+
+    def _track(self, entry):
+        pass
+
+    def _load(self):
+        start = time.perf_counter()
+        with open(self.path, 'rb') as f:
+            signature = _file_signature(self.path)
+            blob = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        header, blob_start = _parse_header(blob)
+
+        items = [
+            BundleEntry(item, self, blob, blob_start, header.get('search_version'))
+            for item in header['items']
+        ]
+        self.stats['files_read'] += 1
+        self.stats['bytes_read'] += blob_start
+        self.stats['entries_reloaded'] += len(items)
+        self.version = header['version']
+        self.metadata_hash = header['metadata_hash']
+        self.last_modified = _datetime(header['last_modified'])
+        self.generation += 1
+        self._index = {entry.id: entry for entry in items}
+        self._items = items
+        self._signature = signature
+        self._last_check = time.monotonic()
+        self.stats['load_seconds'] += time.perf_counter() - start
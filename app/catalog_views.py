@@ -0,0 +1,261 @@
+"""
+Kearney AI Skills Library - Catalog Views
+Precomputed orderings and facet counts over the catalog, so the index page
+can be filtered, sorted and paginated on the server at a per-request cost
+that does not grow with the library.
+"""
+
+import hashlib
+import heapq
+import threading
+from collections import OrderedDict
+from typing import NamedTuple
+from urllib.parse import urlencode
+
+from search import FACET_FIELDS, entry_facets
+
+DEFAULT_PER_PAGE = 24
+MAX_PER_PAGE = 100
+
+
+def _version_number(value):
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return 0.0
+
+
+def _updated(entry):
+    last_modified = entry.last_modified
+    return last_modified.timestamp() if last_modified is not None else 0.0
+
+
+# Sort name -> (key function, descending). 'default' keeps the prompts.json
+# order and 'relevance' the search ranking of the ``q`` query.
+SORTS = {
+    'default': None,
+    'relevance': None,
+    'title': (lambda entry: str(entry.get('Title') or '').lower(), False),
+    'version': (lambda entry: _version_number(entry.get('Version')), True),
+    'updated': (_updated, True),
+}
+
+# Sort choices offered on the index page
+SORT_OPTIONS = [
+    ('relevance', 'Best match'),
+    ('default', 'Library order'),
+    ('title', 'Title (A-Z)'),
+    ('version', 'Version (highest)'),
+    ('updated', 'Recently updated'),
+]
+
+
+class ListingQuery(NamedTuple):
+    """A normalized index page request."""
+    q: str = ''
+    filters: tuple = ()
+    sort: str = 'default'
+    page: int = 1
+    per_page: int = DEFAULT_PER_PAGE
+
+    @classmethod
+    def from_args(cls, args):
+        """
+        Build a query from request arguments.
+
+        Unknown sorts fall back to the default order ('relevance' when there
+        is a search term) and per_page is clamped to MAX_PER_PAGE.
+        """
+        q = (args.get('q') or '').strip()
+        filters = tuple((param, args[param]) for param in FACET_FIELDS if args.get(param))
+        sort = args.get('sort') or ''
+        if sort not in SORTS or (sort == 'relevance' and not q):
+            sort = 'relevance' if q else 'default'
+        page = max(args.get('page', 1, type=int) or 1, 1)
+        per_page = min(max(args.get('per_page', DEFAULT_PER_PAGE, type=int) or DEFAULT_PER_PAGE, 1), MAX_PER_PAGE)
+        return cls(q, filters, sort, page, per_page)
+
+    @property
+    def facet_filters(self):
+        """The filters keyed by facet field (e.g. 'Type') instead of parameter."""
+        return {FACET_FIELDS[param]: value for param, value in self.filters}
+
+    def params(self, **changes):
+        """
+        Return the query arguments of this listing, with ``changes`` applied.
+
+        Default values are left out. Changing anything but the page returns
+        to the first page; a value of None removes a filter.
+        """
+        values = {'q': self.q, **dict(self.filters), 'sort': self.sort,
+                  'page': self.page, 'per_page': self.per_page}
+        if 'page' not in changes:
+            values['page'] = 1
+        values.update(changes)
+        default_sort = 'relevance' if values.get('q') else 'default'
+        defaults = {'q': '', 'sort': default_sort, 'page': 1, 'per_page': DEFAULT_PER_PAGE}
+        return {key: value for key, value in values.items()
+                if value not in (None, '') and defaults.get(key) != value}
+
+    def cache_key(self):
+        """A canonical string for caching the rendered page."""
+        return urlencode(sorted(self.params(page=self.page).items()))
+
+
+class _Order(NamedTuple):
+    entries: list
+    rank: dict
+    digest: str
+
+
+class _Views:
+    """Facet sets, lazily built sort orders and cached facet counts of one item list."""
+
+    def __init__(self, items):
+        self.items = items
+        self.by_id = {entry.id: entry for entry in items}
+        self.facet_index = {field: {} for field in FACET_FIELDS.values()}
+        for entry in items:
+            for field, value in entry_facets(entry).items():
+                if value is not None:
+                    self.facet_index[field].setdefault(value, set()).add(entry.id)
+        self.orders = {}
+        self.facet_counts = OrderedDict()
+
+
+class CatalogViews:
+    """
+    Sorted views and facet counts of the catalog.
+
+    Everything is rebuilt when the catalog publishes a new item list, and
+    the rebuilt views are swapped in as a whole. Each sort order is computed
+    on first use; facet counts are cached per filter combination (up to
+    ``max_facet_sets``).
+    """
+
+    def __init__(self, max_facet_sets=256):
+        self.max_facet_sets = max_facet_sets
+        self._views = _Views([])
+        self._lock = threading.Lock()
+
+    def sync(self, catalog):
+        """Rebuild the views if the catalog changed since the last sync."""
+        items = catalog.get_items()
+        if items is self._views.items:
+            return
+        with self._lock:
+            if items is not self._views.items:
+                self._views = _Views(items)
+
+    def order(self, sort, views=None):
+        """Return the entries, their ranks and a digest of the order for a sort."""
+        views = views or self._views
+        with self._lock:
+            order = views.orders.get(sort)
+            if order is None:
+                spec = SORTS.get(sort)
+                if spec is None:
+                    entries = list(views.items)
+                else:
+                    key, descending = spec
+                    # sorted() is stable in both directions, so ties keep
+                    # the prompts.json order
+                    entries = sorted(views.items, key=key, reverse=descending)
+                ids = [entry.id for entry in entries]
+                digest = hashlib.sha256(','.join(map(str, ids)).encode('utf-8')).hexdigest()[:16]
+                order = views.orders[sort] = _Order(entries, {d: i for i, d in enumerate(ids)}, digest)
+            return order
+
+    def last_modified(self, views=None):
+        """Newest modification time of any entry and its content files, or None."""
+        entries = self.order('updated', views).entries
+        return entries[0].last_modified if entries else None
+
+    @staticmethod
+    def _matching(views, filters, skip=None):
+        """Ids matching every filter except ``skip``, or None for all entries."""
+        matched = None
+        for field, value in filters.items():
+            if field == skip:
+                continue
+            ids = views.facet_index.get(field, {}).get(value, set())
+            matched = set(ids) if matched is None else matched & ids
+        return matched
+
+    def facet_counts(self, filters, matches=None, views=None):
+        """
+        Count the entries per facet value.
+
+        Counts for each field apply every filter except that field's own, so
+        they show how many results choosing another value would give.
+        """
+        views = views or self._views
+        key = tuple(sorted(filters.items()))
+        if matches is None:
+            with self._lock:
+                if key in views.facet_counts:
+                    views.facet_counts.move_to_end(key)
+                    return views.facet_counts[key]
+
+        counts = {}
+        for field, values in views.facet_index.items():
+            matched = self._matching(views, filters, skip=field)
+            if matches is not None:
+                matched = set(matches) if matched is None else matched & matches.keys()
+            counts[field] = {
+                value: len(ids) if matched is None else len(ids & matched)
+                for value, ids in values.items()
+            }
+
+        if matches is None:
+            with self._lock:
+                views.facet_counts[key] = counts
+                if len(views.facet_counts) > self.max_facet_sets:
+                    views.facet_counts.popitem(last=False)
+        return counts
+
+    def query(self, query, matches=None):
+        """
+        Return one page of the listing.
+
+        Args:
+            query: A ListingQuery.
+            matches: Optional {id: search rank} restricting the results to a
+                search; required for the 'relevance' sort.
+
+        Returns:
+            dict: 'items' (entries on the page), 'total', 'page', 'pages',
+            'per_page', 'facets' and 'order' (a digest of the sort order).
+        """
+        views = self._views
+        filters = query.facet_filters
+        candidates = self._matching(views, filters)
+        if matches is not None:
+            # The search index may have synced to another catalog snapshot
+            # than these views, so ids it ranked can be missing here
+            candidates = (views.by_id.keys() if candidates is None else candidates) & matches.keys()
+
+        if query.sort == 'relevance' and matches is not None:
+            entries, rank, digest = None, matches, ''
+        else:
+            entries, rank, digest = self.order(query.sort, views)
+
+        total = len(views.items) if candidates is None else len(candidates)
+        pages = max(1, -(-total // query.per_page))
+        page = min(query.page, pages)
+        start = (page - 1) * query.per_page
+        end = start + query.per_page
+        if candidates is None:
+            items = entries[start:end]
+        else:
+            items = [views.by_id[d] for d in heapq.nsmallest(end, candidates, key=rank.__getitem__)[start:]]
+
+        return {
+            'items': items,
+            'total': total,
+            'page': page,
+            'pages': pages,
+            'per_page': query.per_page,
+            'facets': self.facet_counts(filters, matches, views),
+            'order': digest,
+        }
@@ -0,0 +1,100 @@
+"""
+Kearney AI Skills Library - Catalog Watcher
+Polls prompts/, skills/ and prompts.json in a background thread and applies
+changed files to the catalog incrementally, so requests never stat the
+filesystem themselves.
+"""
+
+import logging
+import os
+import threading
+
+from catalog import _file_signature
+
+logger = logging.getLogger(__name__)
+
+
+class CatalogWatcher:
+    """
+    Background poller that keeps a Catalog fresh.
+
+    Each poll walks the watched directories and compares file signatures
+    with the previous scan; only the paths that were added, changed or
+    removed are handed to ``Catalog.apply_changes``. While the watcher runs,
+    the catalog serves its current snapshot without any per-request checks.
+    """
+
+    def __init__(self, catalog, paths, interval=1.0):
+        self.catalog = catalog
+        self.paths = [os.path.abspath(path) for path in paths]
+        self.interval = interval
+        self.stats = {'polls': 0, 'changes': 0}
+        self._signatures = None
+        self._stop = threading.Event()
+        self._thread = None
+
+    def scan(self):
+        """Return {path: signature} for every file under the watched paths."""
+        signatures = {}
+        for root in self.paths:
+            if os.path.isfile(root):
+                signatures[root] = _file_signature(root)
+                continue
+            for dirpath, dirnames, filenames in os.walk(root):
+                dirnames[:] = [name for name in dirnames if not name.startswith('.')]
+                for name in filenames:
+                    path = os.path.join(dirpath, name)
+                    signatures[path] = _file_signature(path)
+        return signatures
+
+    def poll(self):
+        """
+        Scan once and apply any changes to the catalog.
+
+        Returns:
+            set: The paths that changed since the previous poll.
+        """
+        signatures = self.scan()
+        previous, self._signatures = self._signatures, signatures
+        self.stats['polls'] += 1
+        if previous is None:
+            return set()
+        changed = {
+            path for path in signatures.keys() | previous.keys()
+            if signatures.get(path) != previous.get(path)
+        }
+        if changed:
+            self.stats['changes'] += len(changed)
+            self.catalog.apply_changes(changed)
+        return changed
+
+    def start(self):
+        """
+        Load the catalog, then poll in a daemon thread until stopped.
+
+        All content is read up front so that the first request for any
+        entry is served from memory too.
+        """
+        self._signatures = self.scan()
+        for entry in self.catalog.get_items():
+            entry.content
+        self.catalog.watched = True
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name='catalog-watcher', daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        """Stop polling and return the catalog to per-request revalidation."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        self.catalog.watched = False
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            try:
+                self.poll()
+            except Exception:
+                logger.exception('Catalog watcher poll failed')
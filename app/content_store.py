@@ -0,0 +1,262 @@
+"""
+Kearney AI Skills Library - Content Store
+Content-addressed store of prompt and skill bodies, keyed by the same
+SHA-256 content hashes as the catalog (CatalogEntry.file_hashes) and the
+validation response cache, with each version stored as a compressed
+line delta against the version before it.
+
+The versions of an entry are listed in its prompts.json ``History``:
+
+    "History": [
+      {"Version": 1.0, "Date": "2025-06-02", "Files": {"prompts/Example.txt": "<sha256>"}},
+      {"Version": 2.0, "Date": "2025-09-14", "Files": {"prompts/Example.txt": "<sha256>"}}
+    ]
+
+``Files`` maps each content file (relative to the library root, as in
+``file_hashes``) to the hash of its body at that version. See
+scripts/prompt_history.py for recording versions.
+"""
+
+import difflib
+import json
+import os
+import posixpath
+import threading
+import zlib
+from collections import OrderedDict
+
+from catalog import content_hash
+
+# Deltas are applied in a chain back to a full copy; past this many links
+# a version is stored in full again, bounding the cost of a read
+MAX_DELTA_CHAIN = 16
+
+
+class StoreError(Exception):
+    """A blob is missing or does not match its hash."""
+
+
+def line_delta(base, text):
+    """
+    Return an edit script turning ``base`` into ``text``.
+
+    Operations are [start, end] (copy those lines of ``base``) or a string
+    (insert it), so the script's size follows the size of the edit.
+    """
+    a = base.splitlines(keepends=True)
+    b = text.splitlines(keepends=True)
+    ops = []
+    matcher = difflib.SequenceMatcher(None, a, b, autojunk=False)
+    for tag, i1, i2, j1, j2 in matcher.get_opcodes():
+        if tag == 'equal':
+            ops.append([i1, i2])
+        elif j2 > j1:
+            ops.append(''.join(b[j1:j2]))
+    return ops
+
+
+def apply_delta(base, ops):
+    """Apply an edit script from ``line_delta`` to ``base``."""
+    lines = base.splitlines(keepends=True)
+    return ''.join(''.join(lines[op[0]:op[1]]) if isinstance(op, list) else op for op in ops)
+
+
+def find_version(history, version):
+    """Return the latest History record with the given Version, or None."""
+    for record in reversed(history or []):
+        if str(record.get('Version')) == str(version):
+            return record
+    return None
+
+
+def history_file(metadata, platform=None):
+    """
+    Return the History ``Files`` key of an entry's body.
+
+    Prompts have one content file; skills have one per platform and default
+    to their first platform.
+    """
+    if metadata.get('Type', 'prompt') != 'skill':
+        return metadata.get('PromptContentFile', '')
+    platforms = metadata.get('Platforms', [])
+    platform = platform or (platforms[0] if platforms else None)
+    if platform not in platforms:
+        return None
+    return posixpath.normpath(posixpath.join(metadata.get('SkillFolder', ''), f'SKILL_{platform}.md'))
+
+
+class ContentStore:
+    """
+    Content-addressed blob store.
+
+    Each blob lives in ``objects/<hh>/<rest of hash>`` and is zlib
+    compressed. ``put`` with a ``base`` hash stores a line delta against
+    that blob when it is smaller than a full copy. Blobs are immutable, so
+    reads are cached and writes of an existing hash are skipped.
+    """
+
+    def __init__(self, root, max_cached=256):
+        self.root = root
+        self.max_cached = max_cached
+        self.stats = {'reads': 0, 'hits': 0, 'writes': 0, 'full': 0, 'delta': 0}
+        self._texts = OrderedDict()
+        self._diffs = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _path(self, blob_hash):
+        return os.path.join(self.root, 'objects', blob_hash[:2], blob_hash[2:])
+
+    def __contains__(self, blob_hash):
+        return os.path.exists(self._path(blob_hash))
+
+    def _read_object(self, blob_hash):
+        """
+        Return the header and decoded payload of a stored object.
+
+        The payload of a full copy is its text and that of a delta its edit
+        script. Anything that does not parse raises StoreError.
+        """
+        try:
+            with open(self._path(blob_hash), 'rb') as f:
+                data = zlib.decompress(f.read())
+        except FileNotFoundError:
+            raise StoreError(f"blob {blob_hash} not found") from None
+        except zlib.error as e:
+            raise StoreError(f"blob {blob_hash} is corrupt: {e}") from None
+        header, _, payload = data.partition(b'\n')
+        try:
+            header = json.loads(header)
+            if header['kind'] == 'full':
+                return header, payload.decode('utf-8')
+            if header['kind'] == 'delta' and isinstance(header['base'], str):
+                return header, json.loads(payload)
+            raise ValueError(f"unknown kind {header['kind']!r}")
+        except (ValueError, KeyError, TypeError) as e:
+            # JSONDecodeError and UnicodeDecodeError are ValueErrors
+            raise StoreError(f"blob {blob_hash} is corrupt: {e!r}") from None
+
+    def _chain_length(self, blob_hash):
+        header, _ = self._read_object(blob_hash)
+        return header.get('chain', 0)
+
+    def _cache(self, cache, key, value):
+        with self._lock:
+            cache[key] = value
+            cache.move_to_end(key)
+            while len(cache) > self.max_cached:
+                cache.popitem(last=False)
+
+    def _cached(self, cache, key):
+        with self._lock:
+            value = cache.get(key)
+            if value is not None:
+                cache.move_to_end(key)
+                self.stats['hits'] += 1
+            return value
+
+    def get(self, blob_hash):
+        """
+        Return the text of a blob.
+
+        Raises:
+            StoreError: If the blob (or a base it depends on) is missing or
+                does not hash to ``blob_hash``.
+        """
+        text = self._cached(self._texts, blob_hash)
+        if text is not None:
+            return text
+
+        # Walk back to the nearest full or cached copy, then replay deltas
+        chain = []
+        current = blob_hash
+        while True:
+            base_text = self._cached(self._texts, current) if chain else None
+            if base_text is not None:
+                text = base_text
+                break
+            header, payload = self._read_object(current)
+            self.stats['reads'] += 1
+            if header['kind'] == 'full':
+                text = payload
+                chain.append((current, None))
+                break
+            chain.append((current, payload))
+            current = header['base']
+
+        for chain_hash, ops in reversed(chain):
+            if ops is not None:
+                try:
+                    text = apply_delta(text, ops)
+                except (TypeError, IndexError) as e:
+                    raise StoreError(f"blob {chain_hash} is corrupt: {e!r}") from None
+            if content_hash(text) != chain_hash:
+                raise StoreError(f"blob {chain_hash} does not match its hash")
+            self._cache(self._texts, chain_hash, text)
+        return text
+
+    def put(self, text, base=None):
+        """
+        Store a body and return its content hash.
+
+        Args:
+            text: The body.
+            base: Optional hash of a previous version to store a delta
+                against; ignored if it is not in the store.
+        """
+        blob_hash = content_hash(text)
+        if blob_hash in self:
+            return blob_hash
+
+        data = b'{"kind": "full"}\n' + text.encode('utf-8')
+        kind = 'full'
+        if base and base != blob_hash and base in self:
+            chain = self._chain_length(base) + 1
+            if chain <= MAX_DELTA_CHAIN:
+                header = json.dumps({'kind': 'delta', 'base': base, 'chain': chain})
+                delta = (header + '\n' + json.dumps(line_delta(self.get(base), text))).encode('utf-8')
+                if len(zlib.compress(delta, 9)) < len(zlib.compress(data, 9)):
+                    data, kind = delta, 'delta'
+
+        path = self._path(blob_hash)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp = f'{path}.tmp'
+        with open(tmp, 'wb') as f:
+            f.write(zlib.compress(data, 9))
+        os.replace(tmp, path)
+        self.stats['writes'] += 1
+        self.stats[kind] += 1
+        self._cache(self._texts, blob_hash, text)
+        return blob_hash
+
+    def diff(self, old_hash, new_hash, old_name='a', new_name='b'):
+        """Return a unified diff between two blobs."""
+        key = (old_hash, new_hash, old_name, new_name)
+        diff = self._cached(self._diffs, key)
+        if diff is None:
+            diff = ''.join(difflib.unified_diff(
+                self.get(old_hash).splitlines(keepends=True),
+                self.get(new_hash).splitlines(keepends=True),
+                old_name, new_name,
+            ))
+            self._cache(self._diffs, key, diff)
+        return diff
+
+    def verify(self, blob_hash):
+        """Return None if a blob reads back intact, otherwise the error message."""
+        with self._lock:
+            self._texts.pop(blob_hash, None)
+        try:
+            self.get(blob_hash)
+        except StoreError as e:
+            return str(e)
+        return None
+
+    def disk_usage(self):
+        """Return the number of stored blobs and their total size in bytes."""
+        count = size = 0
+        for root, _, files in os.walk(os.path.join(self.root, 'objects')):
+            for filename in files:
+                if not filename.endswith('.tmp'):
+                    count += 1
+                    size += os.path.getsize(os.path.join(root, filename))
+        return count, size
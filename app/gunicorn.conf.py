@@ -0,0 +1,28 @@
+"""
+Gunicorn settings for the skills library; picked up automatically when
+gunicorn is started from the app/ directory.
+
+Every setting can be overridden with the environment variables below or on
+the command line.
+"""
+
+import multiprocessing
+import os
+
+bind = os.environ.get('BIND', '0.0.0.0:8000')
+workers = int(os.environ.get('WEB_CONCURRENCY', multiprocessing.cpu_count() * 2 + 1))
+threads = int(os.environ.get('WEB_THREADS', '4'))
+worker_class = 'gthread'
+keepalive = 5
+timeout = 30
+
+# Import wsgi.py (and load the catalog) once in the master before forking
+preload_app = True
+
+accesslog = os.environ.get('ACCESS_LOG')
+errorlog = '-'
+
+
+def post_fork(server, worker):
+    from wsgi import post_fork as start_worker
+    start_worker()
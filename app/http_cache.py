@@ -0,0 +1,200 @@
+"""
+Kearney AI Skills Library - HTTP Caching
+Conditional responses (ETag / Last-Modified / 304) and a cache of
+precompressed gzip and brotli response bodies.
+"""
+
+import gzip
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+
+from flask import Response, request
+from werkzeug.http import is_resource_modified
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+
+COMPRESSIBLE_MIMETYPES = {
+    'text/html',
+    'text/plain',
+    'text/css',
+    'text/javascript',
+    'application/javascript',
+    'application/json',
+    'image/svg+xml',
+}
+
+# Bodies smaller than this are not worth compressing
+MIN_COMPRESS_SIZE = 512
+
+
+def make_etag(*parts):
+    """Build an ETag value from version strings."""
+    digest = hashlib.sha256()
+    for part in parts:
+        digest.update(str(part).encode('utf-8'))
+        digest.update(b'\0')
+    return digest.hexdigest()[:32]
+
+
+def tree_hash(*directories):
+    """
+    Hash the contents of every file under the given directories.
+
+    Used to fold the templates and static assets into page ETags, so a
+    deploy that only changes markup still invalidates client caches.
+    """
+    digest = hashlib.sha256()
+    for directory in directories:
+        for root, dirs, files in os.walk(directory):
+            dirs.sort()
+            for filename in sorted(files):
+                path = os.path.join(root, filename)
+                digest.update(os.path.relpath(path, directory).encode('utf-8'))
+                with open(path, 'rb') as f:
+                    digest.update(f.read())
+    return digest.hexdigest()
+
+
+def conditional(etag, build, last_modified=None, mimetype='text/html', encoded=None):
+    """
+    Return a 304 if the client's validators match, otherwise the built body.
+
+    Args:
+        etag: ETag for the resource.
+        build: Callable returning the response body. Not called for a 304.
+        last_modified: Optional datetime of the last change.
+        mimetype: Mimetype of the body.
+        encoded: Optional {encoding: callable} returning a precompressed
+            body (e.g. from the catalog bundle), used instead of ``build``
+            when it is the encoding the client prefers.
+
+    Returns:
+        Response: A 304 or 200 response with validators set.
+    """
+    response = Response(mimetype=mimetype)
+    response.set_etag(etag)
+    if last_modified is not None:
+        response.last_modified = last_modified
+    response.cache_control.no_cache = True
+
+    if not is_resource_modified(request.environ, etag=etag, last_modified=last_modified):
+        response.status_code = 304
+        return response
+
+    encoding = _choose_encoding() if encoded else None
+    if encoding in (encoded or {}):
+        response.set_data(encoded[encoding]())
+        response.headers['Content-Encoding'] = encoding
+        response.vary.add('Accept-Encoding')
+        response.set_etag(etag, weak=True)
+        return response
+
+    response.set_data(build())
+    return response
+
+
+def _choose_encoding():
+    """Pick the best content encoding the client accepts."""
+    accept = request.accept_encodings
+    if brotli is not None and accept['br']:
+        return 'br'
+    if accept['gzip']:
+        return 'gzip'
+    return None
+
+
+def _compress(data, encoding):
+    if encoding == 'br':
+        return brotli.compress(data)
+    return gzip.compress(data, compresslevel=6, mtime=0)
+
+
+class CompressionCache:
+    """
+    Bounded LRU of compressed bodies keyed by (ETag, encoding).
+
+    Responses with the same ETag have the same body, so each variant is
+    compressed once and served from memory afterwards.
+    """
+
+    def __init__(self, max_entries=512):
+        self.max_entries = max_entries
+        self.stats = {'hits': 0, 'misses': 0}
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            data = self._entries.get(key)
+            if data is None:
+                self.stats['misses'] += 1
+                return None
+            self._entries.move_to_end(key)
+            self.stats['hits'] += 1
+            return data
+
+    def put(self, key, data):
+        with self._lock:
+            self._entries[key] = data
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+
+def compress_response(response, cache):
+    """
+    Serve a gzip/brotli variant of a response if the client accepts one.
+
+    Variants are looked up by ETag before the body is read, so cached static
+    files and rendered pages are not re-read or re-compressed.
+    """
+    if response.status_code != 200 or response.mimetype not in COMPRESSIBLE_MIMETYPES:
+        return response
+    if 'Content-Encoding' in response.headers or 'Content-Range' in response.headers:
+        return response
+
+    response.vary.add('Accept-Encoding')
+    encoding = _choose_encoding()
+    if encoding is None:
+        return response
+
+    etag, _ = response.get_etag()
+    key = (etag, encoding) if etag else None
+    compressed = cache.get(key) if key else None
+
+    if compressed is None:
+        response.direct_passthrough = False
+        data = response.get_data()
+        if len(data) < MIN_COMPRESS_SIZE:
+            return response
+        compressed = _compress(data, encoding)
+        if key:
+            cache.put(key, compressed)
+    else:
+        # Release the original body (e.g. an open static file)
+        response.close()
+
+    response.set_data(compressed)
+    response.headers['Content-Encoding'] = encoding
+    if etag:
+        # The encoded body differs byte-wise, so downgrade to a weak ETag
+        response.set_etag(etag, weak=True)
+    return response
+
+
+def init_app(app, max_entries=512):
+    """Register response compression on a Flask app."""
+    cache = CompressionCache(max_entries=max_entries)
+    app.extensions['compression_cache'] = cache
+
+    @app.after_request
+    def _compress_after_request(response):
+        return compress_response(response, cache)
+
+    return cache
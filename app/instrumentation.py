@@ -0,0 +1,256 @@
+"""
+Kearney AI Skills Library - Request Instrumentation
+Per-route latency and response size histograms, template render times and
+catalog counters, exposed in the Prometheus text format on /metrics.
+Optionally adds Server-Timing headers and samples the stacks of in-flight
+requests for profiling.
+"""
+
+import bisect
+import os
+import sys
+import threading
+import time
+from collections import Counter
+
+from flask import Response, g, request
+from flask.signals import before_render_template, template_rendered
+
+# Seconds; request latencies in this app range from well under a
+# millisecond (cached pages) to full renders
+LATENCY_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5)
+SIZE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304)
+
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+# Upper bound on the seconds a single /debug/profile capture may run
+MAX_PROFILE_SECONDS = 60
+
+
+def _format_value(value):
+    if value == float('inf'):
+        return '+Inf'
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return repr(value)
+
+
+def _format_labels(names, values):
+    if not names:
+        return ''
+    escaped = (str(v).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n') for v in values)
+    return '{' + ','.join(f'{name}="{value}"' for name, value in zip(names, escaped)) + '}'
+
+
+class Histogram:
+    """A labelled histogram with fixed buckets."""
+
+    def __init__(self, name, help, labelnames=(), buckets=LATENCY_BUCKETS):
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(buckets)
+        self._series = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value, *labels):
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(labels)
+            if series is None:
+                series = self._series[labels] = [[0] * (len(self.buckets) + 1), 0.0]
+            series[0][index] += 1
+            series[1] += value
+
+    def render(self):
+        lines = [f'# HELP {self.name} {self.help}', f'# TYPE {self.name} histogram']
+        with self._lock:
+            series = [(labels, list(counts), total) for labels, (counts, total) in self._series.items()]
+        names = self.labelnames + ('le',)
+        for labels, counts, total in sorted(series):
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float('inf'),), counts):
+                cumulative += count
+                lines.append(f'{self.name}_bucket{_format_labels(names, labels + (_format_value(bound),))} {cumulative}')
+            lines.append(f'{self.name}_sum{_format_labels(self.labelnames, labels)} {_format_value(total)}')
+            lines.append(f'{self.name}_count{_format_labels(self.labelnames, labels)} {cumulative}')
+        return lines
+
+
+class Metrics:
+    """
+    Registry of histograms and collectors rendered on /metrics.
+
+    Collectors are callables returning (name, type, help, value) tuples and
+    are evaluated at scrape time, so counters kept elsewhere (catalog and
+    page cache stats) cost nothing on the request path.
+    """
+
+    def __init__(self):
+        self.histograms = []
+        self.collectors = []
+
+    def histogram(self, name, help, labelnames=(), buckets=LATENCY_BUCKETS):
+        histogram = Histogram(name, help, labelnames, buckets)
+        self.histograms.append(histogram)
+        return histogram
+
+    def add_collector(self, collect):
+        self.collectors.append(collect)
+
+    def render(self):
+        """Return all metrics in the Prometheus text exposition format."""
+        lines = []
+        for histogram in self.histograms:
+            lines += histogram.render()
+        for collect in self.collectors:
+            for name, kind, help, value in collect():
+                lines += [f'# HELP {name} {help}', f'# TYPE {name} {kind}', f'{name} {_format_value(value)}']
+        return '\n'.join(lines) + '\n'
+
+
+class StackSampler:
+    """
+    Sampling profiler for request threads.
+
+    A background thread records the stack of every thread that is serving
+    a request once per ``interval`` and counts identical stacks, giving
+    folded output for flame graph tools. Threads do not survive fork, so
+    the sampler starts on the first request in each process.
+    """
+
+    def __init__(self, interval=0.005, max_depth=64):
+        self.interval = interval
+        self.max_depth = max_depth
+        self.active = set()
+        self.samples = Counter()
+        self._lock = threading.Lock()
+        self._pid = None
+        self._stop = threading.Event()
+
+    def ensure_running(self):
+        if self._pid == os.getpid():
+            return
+        with self._lock:
+            if self._pid != os.getpid():
+                self._pid = os.getpid()
+                self._stop.clear()
+                threading.Thread(target=self._run, name='stack-sampler', daemon=True).start()
+
+    def stop(self):
+        self._stop.set()
+        self._pid = None
+
+    def sample(self):
+        """Record one sample of every active request thread."""
+        frames = sys._current_frames()
+        for ident in list(self.active):
+            frame = frames.get(ident)
+            stack = []
+            while frame is not None and len(stack) < self.max_depth:
+                code = frame.f_code
+                stack.append(f'{os.path.basename(code.co_filename)}:{code.co_name}')
+                frame = frame.f_back
+            if stack:
+                key = ';'.join(reversed(stack))
+                with self._lock:
+                    self.samples[key] += 1
+
+    def folded(self, reset=False):
+        """Return the samples as 'frame;frame;frame count' lines, hottest first."""
+        with self._lock:
+            samples = self.samples
+            if reset:
+                self.samples = Counter()
+        return ''.join(f'{stack} {count}\n' for stack, count in samples.most_common())
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            self.sample()
+
+
+def init_app(app, server_timing=False, profile=False):
+    """
+    Instrument a Flask app and register /metrics.
+
+    Call before registering other after_request hooks (such as response
+    compression) so response sizes are measured as sent.
+
+    Args:
+        server_timing: Add a Server-Timing header with the request and
+            template render durations.
+        profile: Sample request stacks and serve them on /debug/profile.
+
+    Returns:
+        Metrics: The registry, for adding collectors.
+    """
+    metrics = Metrics()
+    latency = metrics.histogram(
+        'http_request_duration_seconds', 'Request latency by route', ('method', 'route', 'status'))
+    size = metrics.histogram(
+        'http_response_size_bytes', 'Response body size by route', ('route',), SIZE_BUCKETS)
+    render = metrics.histogram(
+        'template_render_seconds', 'Jinja template render time', ('template',))
+    sampler = StackSampler() if profile else None
+    app.extensions['metrics'] = metrics
+
+    @before_render_template.connect_via(app)
+    def _render_started(sender, template, context, **extra):
+        g._render_start = time.perf_counter()
+
+    @template_rendered.connect_via(app)
+    def _render_finished(sender, template, context, **extra):
+        start = g.pop('_render_start', None)
+        if start is not None:
+            seconds = time.perf_counter() - start
+            render.observe(seconds, template.name or '')
+            g._render_seconds = g.get('_render_seconds', 0.0) + seconds
+
+    @app.before_request
+    def _start_timer():
+        g._request_start = time.perf_counter()
+        if sampler is not None:
+            sampler.ensure_running()
+            sampler.active.add(threading.get_ident())
+
+    @app.after_request
+    def _record_request(response):
+        seconds = time.perf_counter() - g.get('_request_start', time.perf_counter())
+        if sampler is not None:
+            sampler.active.discard(threading.get_ident())
+        route = request.url_rule.rule if request.url_rule is not None else '<unmatched>'
+        latency.observe(seconds, request.method, route, str(response.status_code))
+        if not response.direct_passthrough:
+            size.observe(response.content_length or 0, route)
+        if server_timing:
+            timings = [f'app;dur={seconds * 1000:.2f}']
+            if '_render_seconds' in g:
+                timings.append(f'render;dur={g._render_seconds * 1000:.2f}')
+            response.headers.add('Server-Timing', ', '.join(timings))
+        return response
+
+    @app.teardown_request
+    def _forget_thread(exc):
+        if sampler is not None:
+            sampler.active.discard(threading.get_ident())
+
+    def metrics_view():
+        return Response(metrics.render(), content_type=CONTENT_TYPE)
+
+    app.add_url_rule('/metrics', 'metrics', metrics_view)
+
+    if sampler is not None:
+        app.extensions['profiler'] = sampler
+
+        def profile_view():
+            """Folded request stacks; ?seconds=N captures a fresh window first."""
+            sampler.active.discard(threading.get_ident())
+            seconds = min(request.args.get('seconds', 0, type=float), MAX_PROFILE_SECONDS)
+            if seconds > 0:
+                sampler.folded(reset=True)
+                time.sleep(seconds)
+            return Response(sampler.folded(reset=request.args.get('reset') == '1'), mimetype='text/plain')
+
+        app.add_url_rule('/debug/profile', 'debug_profile', profile_view)
+
+    return metrics
@@ -0,0 +1,69 @@
+"""
+Kearney AI Skills Library - Rendered Page Cache
+Bounded LRU of fully rendered HTML keyed by page name and catalog version.
+"""
+
+import threading
+from collections import OrderedDict
+
+
+class PageCache:
+    """
+    Cache of rendered page bodies.
+
+    Each page name (e.g. ``index`` or ``prompt/3``) holds one body together
+    with the version it was rendered from. A lookup with a different version
+    replaces just that page, so a catalog change only evicts the pages that
+    depend on the changed entry.
+    """
+
+    def __init__(self, max_entries=1024):
+        self.max_entries = max_entries
+        self.stats = {'hits': 0, 'misses': 0, 'stale': 0, 'evictions': 0}
+        self._pages = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get_or_render(self, name, version, render):
+        """
+        Return the cached body for a page, rendering it if missing or stale.
+
+        Args:
+            name: Page name.
+            version: Version string the page depends on.
+            render: Callable returning the page as a string.
+
+        Returns:
+            bytes: The UTF-8 encoded page body.
+        """
+        with self._lock:
+            cached = self._pages.get(name)
+            if cached is not None and cached[0] == version:
+                self._pages.move_to_end(name)
+                self.stats['hits'] += 1
+                return cached[1]
+            if cached is not None:
+                self.stats['stale'] += 1
+            self.stats['misses'] += 1
+
+        # Render outside the lock so slow pages don't block cache hits
+        body = render().encode('utf-8')
+
+        with self._lock:
+            self._pages[name] = (version, body)
+            self._pages.move_to_end(name)
+            while len(self._pages) > self.max_entries:
+                self._pages.popitem(last=False)
+                self.stats['evictions'] += 1
+        return body
+
+    def get_stats(self):
+        """Return a snapshot of the cache counters."""
+        with self._lock:
+            stats = dict(self.stats)
+            stats['pages'] = len(self._pages)
+            return stats
+
+    def clear(self):
+        """Drop every cached page."""
+        with self._lock:
+            self._pages.clear()
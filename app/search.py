@@ -0,0 +1,329 @@
+"""
+Kearney AI Skills Library - Search Index
+In-memory inverted index over catalog metadata and content bodies with BM25
+ranking, prefix matching and facet filters.
+"""
+
+import bisect
+import hashlib
+import heapq
+import json
+import math
+import re
+import threading
+from collections import Counter, OrderedDict, defaultdict
+
+TOKEN_RE = re.compile(r"[a-z0-9]+")
+
+STOP_WORDS = frozenset(
+    'a an and are as at be by for from how in is it of on or that the this to '
+    'we what when with you your'.split()
+)
+
+# Per-field multipliers applied to term frequencies
+FIELD_WEIGHTS = {
+    'Title': 3.0,
+    'UseCase': 2.0,
+    'Category': 1.5,
+    'Description': 1.0,
+    'WhenToUse': 1.0,
+    'TargetAudience': 1.0,
+    'content': 1.0,
+}
+
+# Facet fields and the query parameters that filter on them
+FACET_FIELDS = {
+    'type': 'Type',
+    'category': 'Category',
+    'status': 'Status',
+    'audience': 'TargetAudience',
+}
+
+# Upper bound on the terms a single prefix may expand to
+MAX_PREFIX_EXPANSIONS = 64
+
+# Full rankings kept per query (see SearchIndex.ranking)
+MAX_CACHED_RANKINGS = 256
+
+# Identifies the tokenizer and field weights, so precomputed term
+# frequencies (see catalog_bundle) are only reused when they still match
+INDEX_VERSION = hashlib.sha256(
+    json.dumps([TOKEN_RE.pattern, sorted(STOP_WORDS), FIELD_WEIGHTS], sort_keys=True).encode('utf-8')
+).hexdigest()[:16]
+
+
+def tokenize(text):
+    """Split text into lowercase search tokens, dropping stop words."""
+    return [t for t in TOKEN_RE.findall(text.lower()) if t not in STOP_WORDS]
+
+
+def document_terms(fields):
+    """Return the field-weighted term frequencies of a document."""
+    weighted = Counter()
+    for name, text in fields.items():
+        weight = FIELD_WEIGHTS.get(name, 1.0)
+        for token, count in Counter(tokenize(text)).items():
+            weighted[token] += weight * count
+    return weighted
+
+
+def entry_facets(entry):
+    """Return the facet values of a catalog entry."""
+    metadata = entry.metadata
+    return {field: metadata.get(field, 'prompt' if field == 'Type' else None)
+            for field in FACET_FIELDS.values()}
+
+
+def entry_document(entry):
+    """
+    Build the searchable fields and facet values for a catalog entry.
+
+    Returns:
+        tuple: (fields, facets) where fields maps field name to text.
+    """
+    metadata = entry.metadata
+    fields = {name: str(metadata.get(name) or '') for name in FIELD_WEIGHTS if name != 'content'}
+    if metadata.get('Type', 'prompt') == 'skill':
+        fields['content'] = '\n'.join(entry.get('SkillVersions', {}).values())
+    else:
+        fields['content'] = entry.get('PromptContent', '')
+    return fields, entry_facets(entry)
+
+
+class SearchIndex:
+    """
+    Inverted index supporting incremental add/remove of documents.
+
+    Queries are AND-ed across tokens. Each token also matches indexed terms
+    it is a prefix of, so "hypo" finds "hypothesis".
+    """
+
+    def __init__(self, k1=1.2, b=0.75, max_rankings=MAX_CACHED_RANKINGS):
+        self.k1 = k1
+        self.b = b
+        self.max_rankings = max_rankings
+        self.generation = None
+        self._postings = defaultdict(dict)
+        # Sorted terms for prefix lookups, rebuilt once after a batch of changes
+        self._terms = []
+        self._terms_stale = False
+        self._doc_terms = {}
+        self._doc_len = {}
+        self._total_len = 0.0
+        self._doc_order = {}
+        self._facets = {}
+        self._facet_index = {field: defaultdict(set) for field in FACET_FIELDS.values()}
+        self._entries = {}
+        self._next_order = 0
+        self._rankings = OrderedDict()
+        self._lock = threading.RLock()
+
+    def __len__(self):
+        return len(self._doc_terms)
+
+    def add_document(self, doc_id, fields, facets=None):
+        """Index a document, replacing any previous version with the same id."""
+        self.add_terms(doc_id, document_terms(fields), facets)
+
+    def add_terms(self, doc_id, weighted, facets=None):
+        """Index precomputed term frequencies from ``document_terms``."""
+        with self._lock:
+            self.remove_document(doc_id)
+            self._rankings.clear()
+
+            for term, tf in weighted.items():
+                postings = self._postings[term]
+                if not postings:
+                    self._terms_stale = True
+                postings[doc_id] = tf
+
+            length = sum(weighted.values())
+            self._doc_terms[doc_id] = list(weighted)
+            self._doc_len[doc_id] = length
+            self._total_len += length
+            self._doc_order.setdefault(doc_id, self._next_order)
+            self._next_order += 1
+
+            facets = facets or {}
+            self._facets[doc_id] = facets
+            for field, value in facets.items():
+                if field in self._facet_index and value is not None:
+                    self._facet_index[field][value].add(doc_id)
+
+    def remove_document(self, doc_id):
+        """Remove a document from the index if present."""
+        with self._lock:
+            terms = self._doc_terms.pop(doc_id, None)
+            if terms is None:
+                return
+            self._rankings.clear()
+            for term in terms:
+                postings = self._postings[term]
+                postings.pop(doc_id, None)
+                if not postings:
+                    del self._postings[term]
+                    self._terms_stale = True
+            self._total_len -= self._doc_len.pop(doc_id)
+            for field, value in self._facets.pop(doc_id).items():
+                if field in self._facet_index and value is not None:
+                    self._facet_index[field][value].discard(doc_id)
+                    if not self._facet_index[field][value]:
+                        del self._facet_index[field][value]
+
+    def sync(self, catalog):
+        """
+        Bring the index up to date with a catalog.
+
+        Only entries that were replaced since the last sync are re-indexed,
+        and nothing is done while the catalog generation is unchanged.
+        """
+        items = catalog.get_items()
+        with self._lock:
+            if self.generation == catalog.generation and self._entries:
+                return
+            current = {}
+            for entry in items:
+                current[entry.id] = entry
+                if self._entries.get(entry.id) is not entry:
+                    terms = getattr(entry, 'search_terms', None)
+                    if terms is not None:
+                        self.add_terms(entry.id, terms, entry_facets(entry))
+                    else:
+                        fields, facets = entry_document(entry)
+                        self.add_document(entry.id, fields, facets)
+            for doc_id in set(self._entries) - set(current):
+                self.remove_document(doc_id)
+            # Keep result order in step with the catalog order
+            self._doc_order = {entry.id: i for i, entry in enumerate(items)}
+            self._next_order = len(items)
+            self._rankings.clear()
+            self._sort_terms()
+            self._entries = current
+            self.generation = catalog.generation
+
+    def _sort_terms(self):
+        """Rebuild the sorted term list once after terms were added or removed."""
+        if self._terms_stale:
+            self._terms = sorted(self._postings)
+            self._terms_stale = False
+
+    def _expand(self, token):
+        """Return the indexed terms matching a query token exactly or by prefix."""
+        self._sort_terms()
+        start = bisect.bisect_left(self._terms, token)
+        end = bisect.bisect_left(self._terms, token + '\uffff', start)
+        terms = self._terms[start:end]
+        if len(terms) > MAX_PREFIX_EXPANSIONS:
+            terms = heapq.nlargest(MAX_PREFIX_EXPANSIONS, terms, key=lambda t: len(self._postings[t]))
+            if token in self._postings and token not in terms:
+                terms.append(token)
+        return terms
+
+    def _score_token(self, token):
+        """BM25 scores for every document matching one query token."""
+        n_docs = len(self._doc_terms)
+        avg_len = (self._total_len / n_docs) if n_docs and self._total_len else 1.0
+        scores = defaultdict(float)
+        for term in self._expand(token):
+            postings = self._postings[term]
+            df = len(postings)
+            idf = math.log(1 + (n_docs - df + 0.5) / (df + 0.5))
+            # Prefix expansions rank below exact matches
+            boost = 1.0 if term == token else 0.5
+            for doc_id, tf in postings.items():
+                norm = self.k1 * (1 - self.b + self.b * self._doc_len[doc_id] / avg_len)
+                scores[doc_id] += boost * idf * tf * (self.k1 + 1) / (tf + norm)
+        return scores
+
+    def _match(self, tokens):
+        """
+        Score the documents matching every token.
+
+        Returns:
+            tuple: (scores, candidates); scores is None for an empty query,
+            which matches every document.
+        """
+        if not tokens:
+            return None, set(self._doc_terms)
+        scores = None
+        for per_token in sorted((self._score_token(t) for t in tokens), key=len):
+            if scores is None:
+                scores = dict(per_token)
+            else:
+                scores = {d: s + per_token[d] for d, s in scores.items() if d in per_token}
+            if not scores:
+                break
+        return scores, set(scores or ())
+
+    def ranking(self, query):
+        """
+        Return {id: rank} of every document matching a query, best first.
+
+        Rankings are cached per query until the index changes, so listing
+        pages that sort or filter a search do not rescore the library on
+        every request.
+        """
+        tokens = tuple(dict.fromkeys(tokenize(query)))
+        with self._lock:
+            ranking = self._rankings.get(tokens)
+            if ranking is not None:
+                self._rankings.move_to_end(tokens)
+                return ranking
+            scores, candidates = self._match(tokens)
+            order = self._doc_order
+            if scores is not None:
+                ranked = sorted(candidates, key=lambda d: (-scores[d], order[d]))
+            else:
+                ranked = sorted(candidates, key=order.__getitem__)
+            ranking = self._rankings[tokens] = {d: i for i, d in enumerate(ranked)}
+            if len(self._rankings) > self.max_rankings:
+                self._rankings.popitem(last=False)
+            return ranking
+
+    def search(self, query='', filters=None, page=1, per_page=20):
+        """
+        Search the index.
+
+        Args:
+            query: Free-text query. An empty query matches every document.
+            filters: Optional mapping of facet field (e.g. 'Type') to value.
+            page: 1-based page number.
+            per_page: Results per page.
+
+        Returns:
+            dict: 'total', 'page', 'per_page', 'results' (list of
+            {'id', 'score'}) and 'facets' (field -> value -> count over all
+            matching documents).
+        """
+        with self._lock:
+            scores, candidates = self._match(list(dict.fromkeys(tokenize(query))))
+
+            for field, value in (filters or {}).items():
+                if value in (None, ''):
+                    continue
+                candidates &= self._facet_index.get(field, {}).get(value, set())
+
+            facets = {field: Counter() for field in self._facet_index}
+            for doc_id in candidates:
+                for field, value in self._facets[doc_id].items():
+                    if field in facets and value is not None:
+                        facets[field][value] += 1
+
+            page = max(1, page)
+            limit = page * per_page
+            order = self._doc_order
+            if scores is not None:
+                ranked = heapq.nsmallest(limit, candidates, key=lambda d: (-scores[d], order[d]))
+            else:
+                ranked = heapq.nsmallest(limit, candidates, key=order.__getitem__)
+
+            return {
+                'total': len(candidates),
+                'page': page,
+                'per_page': per_page,
+                'results': [
+                    {'id': d, 'score': round(scores[d], 4) if scores is not None else 0.0}
+                    for d in ranked[limit - per_page:]
+                ],
+                'facets': {field: dict(counts) for field, counts in facets.items()},
+            }
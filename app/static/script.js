@@ -1,11 +1,10 @@
 /**
  * Kearney AI Skills Library - Client-Side JavaScript
- * Handles clipboard operations, filtering, tabs, and UI interactions.
+ * Handles clipboard operations, tabs, and UI interactions. Filtering,
+ * sorting and pagination of the library are done by the server, or from
+ * a prebuilt search index on an exported static site.
  */
 
-// Current filter state
-let currentFilter = 'all';
-
 /**
  * Copy the text content of an element to the clipboard.
  * @param {string} elementId - The ID of the element containing text to copy.
@@ -18,8 +17,38 @@ function copyToClipboard(elementId, button) {
         return;
     }
 
-    const text = element.textContent;
+    copyText(element.textContent, button);
+}
+
+/**
+ * Fetch an item's content from the server and copy it to the clipboard.
+ * The index page only ships metadata, so content is requested on demand.
+ * @param {string} url - The content API URL for the item.
+ * @param {HTMLElement} button - The button element that was clicked.
+ */
+function copyItemContent(url, button) {
+    fetch(url)
+        .then(response => {
+            if (!response.ok) {
+                throw new Error('HTTP ' + response.status);
+            }
+            return response.text();
+        })
+        .then(text => {
+            copyText(text, button);
+        })
+        .catch(err => {
+            console.error('Failed to load content:', err);
+            showCopyError(button);
+        });
+}
 
+/**
+ * Copy a string to the clipboard.
+ * @param {string} text - The text to copy.
+ * @param {HTMLElement} button - The button element for feedback.
+ */
+function copyText(text, button) {
     // Use the modern Clipboard API if available
     if (navigator.clipboard && navigator.clipboard.writeText) {
         navigator.clipboard.writeText(text)
@@ -96,93 +125,6 @@ function showCopyError(button) {
     }, 2000);
 }
 
-/**
- * Set the current filter and update the display.
- * @param {string} filter - The filter type ('all', 'prompt', or 'skill').
- * @param {HTMLElement} button - The button that was clicked.
- */
-function setFilter(filter, button) {
-    currentFilter = filter;
-
-    // Update button states
-    document.querySelectorAll('.filter-btn').forEach(btn => {
-        btn.classList.remove('active');
-    });
-    button.classList.add('active');
-
-    // Apply filter
-    filterItems();
-}
-
-/**
- * Filter items based on search input and current filter.
- */
-function filterItems() {
-    const searchInput = document.getElementById('search-input');
-    const searchTerm = searchInput ? searchInput.value.toLowerCase() : '';
-    // Support both old class (prompt-card) and new class (skill-card)
-    const items = document.querySelectorAll('.prompt-card, .skill-card');
-    const noResults = document.getElementById('no-results');
-    const itemsList = document.getElementById('items-list');
-    let visibleCount = 0;
-
-    items.forEach(item => {
-        const type = item.dataset.type || 'prompt';
-        const title = item.dataset.title || '';
-        const usecase = item.dataset.usecase || '';
-
-        // Check filter
-        const matchesFilter = currentFilter === 'all' || type === currentFilter;
-
-        // Check search
-        const matchesSearch = searchTerm === '' ||
-            title.includes(searchTerm) ||
-            usecase.includes(searchTerm);
-
-        // Show or hide
-        if (matchesFilter && matchesSearch) {
-            item.style.display = '';
-            visibleCount++;
-        } else {
-            item.style.display = 'none';
-        }
-    });
-
-    // Update results count
-    const visibleCountSpan = document.getElementById('visible-count');
-    if (visibleCountSpan) {
-        visibleCountSpan.textContent = visibleCount;
-    }
-
-    // Show/hide no results message
-    if (noResults) {
-        noResults.style.display = visibleCount === 0 ? 'block' : 'none';
-    }
-
-    // Hide the grid if no results
-    if (itemsList) {
-        itemsList.style.display = visibleCount === 0 ? 'none' : '';
-    }
-}
-
-/**
- * Clear the search input and reset filters.
- */
-function clearSearch() {
-    const searchInput = document.getElementById('search-input');
-    if (searchInput) {
-        searchInput.value = '';
-    }
-    currentFilter = 'all';
-    document.querySelectorAll('.filter-btn').forEach(btn => {
-        btn.classList.remove('active');
-        if (btn.dataset.filter === 'all') {
-            btn.classList.add('active');
-        }
-    });
-    filterItems();
-}
-
 /**
  * Copy the content of the currently active tab.
  * @param {HTMLElement} button - The button element.
@@ -240,10 +182,253 @@ function toggleFaq(button) {
     }
 }
 
+/**
+ * Sort orders of the static site listing: [key function, descending].
+ * Mirrors SORTS in app/catalog_views.py.
+ */
+const STATIC_SORTS = {
+    title: [doc => String(doc.Title || '').toLowerCase(), false],
+    version: [doc => parseFloat(doc.Version) || 0, true],
+    updated: [doc => doc.updated || 0, true]
+};
+
+/**
+ * Escape a value for use in HTML markup.
+ * @param {*} value - The value to escape.
+ * @returns {string} The escaped text.
+ */
+function escapeHtml(value) {
+    return String(value === undefined || value === null ? '' : value)
+        .replace(/&/g, '&amp;')
+        .replace(/</g, '&lt;')
+        .replace(/>/g, '&gt;')
+        .replace(/"/g, '&quot;')
+        .replace(/'/g, '&#39;');
+}
+
+/**
+ * Search and filter the documents of a static site search index.
+ * Query tokens are AND-ed and also match the terms they are a prefix of,
+ * as in the app's search; results are ranked by weighted term frequency.
+ * @param {Object} index - The search index written by scripts/export_site.py.
+ * @param {URLSearchParams} params - The listing query.
+ * @returns {Array} The matching documents in listing order.
+ */
+function searchStaticIndex(index, params) {
+    const stopWords = new Set(index.stop_words);
+    const words = (params.get('q') || '').toLowerCase().match(new RegExp(index.token_pattern, 'g')) || [];
+    const tokens = [...new Set(words)].filter(token => !stopWords.has(token));
+
+    let scores = null;
+    if (tokens.length) {
+        if (!index.sortedTerms) {
+            index.sortedTerms = Object.keys(index.terms).sort();
+        }
+        const terms = index.sortedTerms;
+        tokens.forEach(token => {
+            const tokenScores = new Map();
+            let lo = 0;
+            let hi = terms.length;
+            while (lo < hi) {
+                const mid = (lo + hi) >> 1;
+                if (terms[mid] < token) {
+                    lo = mid + 1;
+                } else {
+                    hi = mid;
+                }
+            }
+            for (let i = lo; i < terms.length && terms[i].startsWith(token); i++) {
+                // Prefix expansions rank below exact matches
+                const boost = terms[i] === token ? 1 : 0.5;
+                const postings = index.terms[terms[i]];
+                for (let j = 0; j < postings.length; j += 2) {
+                    tokenScores.set(postings[j], (tokenScores.get(postings[j]) || 0) + boost * postings[j + 1]);
+                }
+            }
+            if (scores === null) {
+                scores = tokenScores;
+            } else {
+                const merged = new Map();
+                scores.forEach((score, doc) => {
+                    if (tokenScores.has(doc)) {
+                        merged.set(doc, score + tokenScores.get(doc));
+                    }
+                });
+                scores = merged;
+            }
+        });
+    }
+
+    const results = [];
+    index.docs.forEach((doc, i) => {
+        if (scores !== null && !scores.has(i)) {
+            return;
+        }
+        for (const [param, field] of Object.entries(index.facets)) {
+            const value = params.get(param);
+            if (value && doc[field] !== value) {
+                return;
+            }
+        }
+        results.push(i);
+    });
+
+    const sort = params.get('sort') || (scores !== null ? 'relevance' : 'default');
+    if (sort === 'relevance' && scores !== null) {
+        results.sort((a, b) => scores.get(b) - scores.get(a) || a - b);
+    } else if (STATIC_SORTS[sort]) {
+        const [key, descending] = STATIC_SORTS[sort];
+        results.sort((a, b) => {
+            const x = key(index.docs[a]);
+            const y = key(index.docs[b]);
+            const order = x < y ? -1 : (x > y ? 1 : 0);
+            return (descending ? -order : order) || a - b;
+        });
+    }
+    return results.map(i => index.docs[i]);
+}
+
+/**
+ * Render a library card for a static search index document.
+ * @param {Object} doc - The document.
+ * @returns {string} The card markup.
+ */
+function renderStaticCard(doc) {
+    const isSkill = doc.Type === 'skill';
+    const badge = isSkill
+        ? '<svg class="badge-icon" viewBox="0 0 24 24" fill="none" stroke="currentColor" stroke-width="2"><polyline points="16 18 22 12 16 6"/><polyline points="8 6 2 12 8 18"/></svg> Interactive Skill'
+        : '<svg class="badge-icon" viewBox="0 0 24 24" fill="none" stroke="currentColor" stroke-width="2"><path d="M12 3l1.912 5.813h6.088l-4.912 3.587 1.824 5.6-4.912-3.587-4.912 3.587 1.824-5.6-4.912-3.587h6.088z"/></svg> Prompt';
+    const url = escapeHtml(doc.url);
+    return `
+        <article class="skill-card" data-id="${escapeHtml(doc.id)}" data-type="${escapeHtml(doc.Type)}">
+            <div class="card-content" onclick="window.location='${url}'">
+                <div class="badge-row">
+                    <span class="type-badge ${isSkill ? 'badge-skill' : 'badge-prompt'}">${badge}</span>
+                </div>
+                <h3 class="card-title">${escapeHtml(doc.Title)}</h3>
+                <div class="card-meta">
+                    <span><strong>Category:</strong> ${escapeHtml(doc.Category)}</span>
+                    <span class="meta-divider">•</span>
+                    <span><strong>Audience:</strong> ${escapeHtml(doc.TargetAudience)}</span>
+                </div>
+                <div class="card-usecase">
+                    <span class="usecase-label">Use Case:</span>
+                    <p>${escapeHtml(doc.UseCase)}</p>
+                </div>
+                ${doc.Description ? `<p class="card-description">${escapeHtml(doc.Description)}</p>` : ''}
+            </div>
+            <div class="card-actions">
+                <a href="${url}" class="btn-primary">View Details</a>
+                <button class="btn-icon-only" onclick="event.stopPropagation(); copyItemContent('${escapeHtml(doc.content_url)}', this)" title="Quick Copy">
+                    <svg viewBox="0 0 24 24" fill="none" stroke="currentColor" stroke-width="2">
+                        <rect x="9" y="9" width="13" height="13" rx="2" ry="2"/>
+                        <path d="M5 15H4a2 2 0 01-2-2V4a2 2 0 012-2h9a2 2 0 012 2v1"/>
+                    </svg>
+                </button>
+            </div>
+        </article>`;
+}
+
+/**
+ * Build a listing URL from the current query with some parameters changed.
+ * Changing anything but the page returns to the first page.
+ * @param {URLSearchParams} params - The current query.
+ * @param {Object} changes - Parameters to set; null removes one.
+ * @returns {string} The query string.
+ */
+function staticListingUrl(params, changes) {
+    const next = new URLSearchParams(params);
+    if (!('page' in changes)) {
+        next.delete('page');
+    }
+    Object.entries(changes).forEach(([key, value]) => {
+        if (value === null || value === '' || (key === 'page' && value === 1)) {
+            next.delete(key);
+        } else {
+            next.set(key, value);
+        }
+    });
+    return '?' + next.toString();
+}
+
+/**
+ * Show the listing for the current query string on an exported static site.
+ * The pages are pre-rendered for the library order only, so searches,
+ * facet filters and sorts are answered from the prebuilt search index.
+ * @param {HTMLFormElement} form - The listing form.
+ * @param {Object} index - The search index.
+ */
+function renderStaticListing(form, index) {
+    const params = new URLSearchParams(window.location.search);
+    const results = searchStaticIndex(index, params);
+    const perPage = Math.min(Math.max(parseInt(params.get('per_page'), 10) || index.per_page, 1), index.max_per_page);
+    const pages = Math.max(1, Math.ceil(results.length / perPage));
+    const page = Math.min(Math.max(parseInt(params.get('page'), 10) || 1, 1), pages);
+    const shown = results.slice((page - 1) * perPage, page * perPage);
+
+    document.getElementById('items-list').innerHTML = shown.map(renderStaticCard).join('');
+    document.getElementById('results-count').innerHTML =
+        `Showing <span id="visible-count">${shown.length}</span> of ${results.length} results`;
+
+    // Reflect the query in the form and filter buttons
+    form.elements.q.value = params.get('q') || '';
+    const defaultSort = params.get('q') ? 'relevance' : 'default';
+    form.querySelectorAll('select').forEach(select => {
+        const value = params.get(select.name) || (select.name === 'sort' ? defaultSort : '');
+        if (select.name === 'sort' && value === 'relevance' && !select.querySelector('option[value="relevance"]')) {
+            select.prepend(new Option('Best match', 'relevance'));
+        }
+        select.value = value;
+    });
+    form.querySelectorAll('input[type="hidden"]').forEach(input => input.remove());
+    ['type', 'per_page'].forEach(name => {
+        if (params.get(name)) {
+            const input = document.createElement('input');
+            input.type = 'hidden';
+            input.name = name;
+            input.value = params.get(name);
+            form.appendChild(input);
+        }
+    });
+    document.querySelectorAll('.filter-btn').forEach(button => {
+        const value = button.dataset.filter === 'all' ? null : button.dataset.filter;
+        button.classList.toggle('active', (params.get('type') || null) === value);
+        button.href = staticListingUrl(params, {type: value});
+    });
+
+    document.querySelectorAll('.pagination, .empty-state, .no-results').forEach(el => el.remove());
+    const grid = document.getElementById('items-list');
+    if (pages > 1) {
+        const nav = document.createElement('nav');
+        nav.className = 'pagination';
+        nav.setAttribute('aria-label', 'Pages');
+        nav.innerHTML =
+            (page > 1 ? `<a class="btn-outline" rel="prev" href="${escapeHtml(staticListingUrl(params, {page: page - 1}))}">Previous</a>` : '') +
+            `<span class="pagination-status">Page ${page} of ${pages}</span>` +
+            (page < pages ? `<a class="btn-outline" rel="next" href="${escapeHtml(staticListingUrl(params, {page: page + 1}))}">Next</a>` : '');
+        grid.after(nav);
+    } else if (!shown.length) {
+        const empty = document.createElement('section');
+        empty.className = 'no-results';
+        empty.id = 'no-results';
+        empty.innerHTML = `<p>No skills found matching your criteria.</p><a class="btn-outline" href="${escapeHtml(form.action)}">Clear Search</a>`;
+        grid.after(empty);
+    }
+}
+
 /**
  * Initialize any page-level event listeners.
  */
 document.addEventListener('DOMContentLoaded', function() {
+    // Exported static sites answer filtered listings in the browser
+    const staticForm = document.querySelector('.listing-form[data-search-index]');
+    if (staticForm && window.location.search) {
+        fetch(staticForm.dataset.searchIndex)
+            .then(response => response.json())
+            .then(index => renderStaticListing(staticForm, index))
+            .catch(err => console.error('Failed to load search index:', err));
+    }
+
     // Add keyboard shortcut (Ctrl/Cmd + C on focused code blocks)
     document.querySelectorAll('.prompt-content-wrapper, .code-block').forEach(wrapper => {
         wrapper.addEventListener('keydown', function(e) {
@@ -257,22 +442,4 @@ document.addEventListener('DOMContentLoaded', function() {
             }
         });
     });
-
-    // Add enter key support for search
-    const searchInput = document.getElementById('search-input');
-    if (searchInput) {
-        searchInput.addEventListener('keypress', function(e) {
-            if (e.key === 'Enter') {
-                e.preventDefault();
-                filterItems();
-            }
-        });
-    }
-
-    // Initialize the results count on page load
-    const items = document.querySelectorAll('.prompt-card, .skill-card');
-    const visibleCountSpan = document.getElementById('visible-count');
-    if (visibleCountSpan && items.length > 0) {
-        visibleCountSpan.textContent = items.length;
-    }
 });
@@ -0,0 +1,33 @@
+"""
+Kearney AI Skills Library - Production WSGI Entry Point
+Loads the whole catalog and search index at import time so that a
+pre-forking server (gunicorn with preload_app, see gunicorn.conf.py) parses
+the library once in the master and every worker shares it copy-on-write.
+
+    cd app && gunicorn wsgi:application
+"""
+
+import gc
+
+from app import app, catalog, search_index, start_catalog_watcher
+
+
+def preload():
+    """Read every entry, its content and the search index into memory."""
+    for entry in catalog.get_items():
+        entry.content
+    catalog.version
+    search_index.sync(catalog)
+    # Move everything allocated so far out of the collector's generations so
+    # that garbage collection in the workers does not touch (and copy) the
+    # shared pages
+    gc.freeze()
+
+
+def post_fork():
+    """Per-worker setup: threads do not survive fork, so the watcher starts here."""
+    start_catalog_watcher()
+
+
+preload()
+application = app
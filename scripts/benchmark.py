@@ -0,0 +1,362 @@
+#!/usr/bin/env python3
+"""
+Kearney AI Skills - Performance Benchmarks
+
+Generates synthetic libraries in the prompts.json + prompts/ + skills/*
+layout and times the web app's hot paths against them: catalog load,
+index and detail page renders, search indexing and queries, plus the
+memory held by a fully loaded catalog.
+
+Results are compared with a JSON baseline; --check fails when a hot path
+got slower (or bigger) than the baseline by more than --threshold.
+
+    python scripts/benchmark.py --sizes 100,10000 --save
+    python scripts/benchmark.py --sizes 100,10000 --check
+"""
+
+import contextlib
+import gc
+import json
+import platform
+import random
+import shutil
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timezone
+from pathlib import Path
+
+ROOT_DIR = Path(__file__).parent.parent
+APP_DIR = ROOT_DIR / 'app'
+
+# The benchmarks drive the app modules directly
+sys.path.insert(0, str(APP_DIR))
+
+from catalog import Catalog
+from catalog_views import CatalogViews
+from page_cache import PageCache
+from search import SearchIndex
+
+DEFAULT_SIZES = (100, 10_000)
+DEFAULT_BASELINE = Path(__file__).parent / 'benchmark_baseline.json'
+DEFAULT_THRESHOLD = 0.25
+DEFAULT_REPEAT = 3
+
+# Share of generated entries that are skills, and their platforms
+SKILL_RATIO = 0.2
+SKILL_PLATFORMS = ['claude-code', 'generic']
+
+# Detail pages and queries timed per library
+DETAIL_SAMPLES = 20
+SEARCH_QUERIES = ('analysis', 'hypothesis tree', 'brand chart', 'stakeholder interview', 'pricing mod')
+
+VOCABULARY = (
+    'analysis hypothesis tree issue driver client market pricing model slide chart brand '
+    'stakeholder interview workshop synthesis recommendation revenue cost margin growth '
+    'segment customer survey benchmark roadmap risk scenario forecast dashboard insight '
+    'framework storyline executive summary deliverable workstream milestone data source'
+).split()
+CATEGORIES = ('Brand & Design', 'Problem Solving', 'Analytics', 'Workflow Automation', 'Communication')
+AUDIENCES = ('All Consultants', 'Analysts', 'Managers', 'Developers & Power Users')
+STATUSES = ('Published', 'Draft', 'Beta')
+
+
+def _text(rng, words):
+    lines = []
+    for _ in range(max(1, words // 12)):
+        lines.append(' '.join(rng.choice(VOCABULARY) for _ in range(12)))
+    return '\n'.join(lines) + '\n'
+
+
+def generate_library(root, size, seed=0) -> Path:
+    """
+    Write a synthetic library of ``size`` entries under ``root``.
+
+    Returns:
+        Path: The generated prompts.json.
+    """
+    rng = random.Random(seed)
+    root = Path(root)
+    (root / 'prompts').mkdir(parents=True, exist_ok=True)
+    items = []
+    for item_id in range(1, size + 1):
+        title = ' '.join(rng.choice(VOCABULARY).capitalize() for _ in range(3))
+        item = {
+            'id': item_id,
+            'Title': f'{title} {item_id}',
+            'Category': rng.choice(CATEGORIES),
+            'WhenToUse': _text(rng, 24).strip(),
+            'UseCase': ' '.join(rng.choice(VOCABULARY) for _ in range(2)).title(),
+            'TargetAudience': rng.choice(AUDIENCES),
+            'Version': float(rng.randint(1, 5)),
+            'Status': rng.choice(STATUSES),
+        }
+        if rng.random() < SKILL_RATIO:
+            folder = root / 'skills' / f'skill-{item_id}'
+            folder.mkdir(parents=True, exist_ok=True)
+            for skill_platform in SKILL_PLATFORMS:
+                (folder / f'SKILL_{skill_platform}.md').write_text(_text(rng, 600), encoding='utf-8')
+            item.update({
+                'Type': 'skill',
+                'SkillFolder': f'skills/skill-{item_id}',
+                'Platforms': SKILL_PLATFORMS,
+                'Description': _text(rng, 24).strip(),
+            })
+        else:
+            content_file = f'prompts/Prompt_{item_id}.txt'
+            (root / content_file).write_text(_text(rng, 300), encoding='utf-8')
+            item.update({'Type': 'prompt', 'PromptContentFile': content_file})
+        items.append(item)
+    items_json = root / 'prompts.json'
+    items_json.write_text(json.dumps(items, indent=2), encoding='utf-8')
+    return items_json
+
+
+def _best(fn, repeat):
+    """Return the best wall time of ``repeat`` runs of ``fn``."""
+    best = None
+    for _ in range(repeat):
+        gc.collect()
+        start = time.perf_counter()
+        fn()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def _load_all(items_json, base_dir):
+    catalog = Catalog(str(items_json), str(base_dir))
+    for entry in catalog.get_items():
+        entry.content
+    return catalog
+
+
+@contextlib.contextmanager
+def _serving(catalog):
+    """Point the Flask app at ``catalog`` with empty page, search and view caches."""
+    import app as webapp
+
+    saved = webapp.catalog, webapp.pages, webapp.search_index, webapp.views
+    webapp.catalog, webapp.pages, webapp.search_index, webapp.views = (
+        catalog, PageCache(), SearchIndex(), CatalogViews()
+    )
+    try:
+        yield webapp
+    finally:
+        webapp.catalog, webapp.pages, webapp.search_index, webapp.views = saved
+
+
+def run_benchmarks(items_json, repeat=DEFAULT_REPEAT) -> dict:
+    """
+    Time the hot paths against one library.
+
+    Times are the best of ``repeat`` runs, in milliseconds; renders are
+    uncached (the page cache is emptied before each one).
+    """
+    items_json = Path(items_json)
+    base_dir = items_json.parent
+    results = {}
+
+    results['load_metadata_ms'] = _best(lambda: Catalog(str(items_json), str(base_dir)).get_items(), repeat) * 1000
+    results['load_items_ms'] = _best(lambda: _load_all(items_json, base_dir), repeat) * 1000
+
+    catalog = _load_all(items_json, base_dir)
+    results['search_index_ms'] = _best(lambda: SearchIndex().sync(catalog), repeat) * 1000
+
+    with _serving(catalog) as webapp:
+        client = webapp.app.test_client()
+
+        def render(url):
+            webapp.pages.clear()
+            response = client.get(url)
+            assert response.status_code == 200, url
+            return response
+
+        results['index_render_ms'] = _best(lambda: render('/'), repeat) * 1000
+        results['index_bytes'] = len(render('/').data)
+        results['index_filtered_render_ms'] = _best(
+            lambda: render('/?type=prompt&category=Analytics&sort=updated&page=2'), repeat
+        ) * 1000
+
+        ids = [entry.id for entry in catalog.get_items()]
+        sample = ids[::max(1, len(ids) // DETAIL_SAMPLES)][:DETAIL_SAMPLES]
+        results['detail_render_ms'] = _best(
+            lambda: [render(f'/prompt/{item_id}') for item_id in sample], repeat
+        ) * 1000 / len(sample)
+
+        webapp.search_index.sync(catalog)
+        results['search_query_ms'] = _best(
+            lambda: [webapp.search_index.search(query) for query in SEARCH_QUERIES], repeat
+        ) * 1000 / len(SEARCH_QUERIES)
+
+    del catalog
+    gc.collect()
+    tracemalloc.start()
+    try:
+        catalog = _load_all(items_json, base_dir)
+        SearchIndex().sync(catalog)
+        current, _ = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    results['memory_mb'] = current / 1e6
+    return {name: round(value, 4) for name, value in results.items()}
+
+
+def run_suite(sizes=DEFAULT_SIZES, repeat=DEFAULT_REPEAT, work_dir=None, seed=0) -> dict:
+    """
+    Generate each library size and benchmark it.
+
+    Libraries are generated under ``work_dir`` (a temporary directory by
+    default) and reused when already present there.
+
+    Returns:
+        dict: {'meta': {...}, 'results': {size: {metric: value}}}
+    """
+    temp_dir = None
+    if work_dir is None:
+        work_dir = temp_dir = tempfile.mkdtemp(prefix='kai-bench-')
+    try:
+        results = {}
+        for size in sizes:
+            library = Path(work_dir) / f'library-{size}-{seed}'
+            items_json = library / 'prompts.json'
+            if not items_json.exists():
+                print(f"Generating {size:,} entries in {library}...")
+                generate_library(library, size, seed)
+            print(f"Benchmarking {size:,} entries...")
+            results[str(size)] = run_benchmarks(items_json, repeat)
+    finally:
+        if temp_dir is not None:
+            shutil.rmtree(temp_dir, ignore_errors=True)
+    return {
+        'meta': {
+            'created': datetime.now(timezone.utc).isoformat(),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'repeat': repeat,
+            'seed': seed,
+        },
+        'results': results,
+    }
+
+
+def check_regressions(current: dict, baseline: dict, threshold=DEFAULT_THRESHOLD) -> list:
+    """
+    Compare results with a baseline.
+
+    Every metric is lower-is-better. Sizes or metrics missing from either
+    side are ignored.
+
+    Returns:
+        list: One message per metric more than ``threshold`` above baseline.
+    """
+    regressions = []
+    for size, metrics in current['results'].items():
+        base = baseline.get('results', {}).get(size, {})
+        for name, value in metrics.items():
+            if name in base and base[name] > 0 and value > base[name] * (1 + threshold):
+                regressions.append(
+                    f"{size} entries {name}: {value:g} vs baseline {base[name]:g} "
+                    f"(+{(value / base[name] - 1) * 100:.0f}%)"
+                )
+    return regressions
+
+
+def print_results(current: dict, baseline: dict = None):
+    """Print a table of the results, with the change against the baseline."""
+    for size, metrics in current['results'].items():
+        print(f"\n{int(size):,} entries:")
+        base = (baseline or {}).get('results', {}).get(size, {})
+        for name, value in metrics.items():
+            change = ''
+            if base.get(name):
+                change = f"  ({(value / base[name] - 1) * 100:+.0f}% vs baseline)"
+            print(f"  {name:<20} {value:>12,.3f}{change}")
+
+
+def main():
+    """Main entry point for the benchmarks."""
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Benchmark catalog load, render and search at synthetic scale')
+    parser.add_argument(
+        '--sizes',
+        type=str,
+        default=','.join(str(size) for size in DEFAULT_SIZES),
+        help='Comma-separated library sizes to generate, e.g. 100,10000,100000'
+    )
+    parser.add_argument(
+        '--repeat',
+        type=int,
+        default=DEFAULT_REPEAT,
+        help='Runs per measurement; the best is kept'
+    )
+    parser.add_argument(
+        '--work-dir',
+        type=str,
+        default=None,
+        help='Keep generated libraries here and reuse them across runs'
+    )
+    parser.add_argument(
+        '--baseline',
+        type=str,
+        default=str(DEFAULT_BASELINE),
+        help='Baseline JSON file'
+    )
+    parser.add_argument(
+        '--save',
+        action='store_true',
+        help='Write the results as the new baseline'
+    )
+    parser.add_argument(
+        '--check',
+        action='store_true',
+        help='Fail if any metric regressed past --threshold against the baseline'
+    )
+    parser.add_argument(
+        '--threshold',
+        type=float,
+        default=DEFAULT_THRESHOLD,
+        help=f'Allowed slowdown as a fraction of the baseline (default: {DEFAULT_THRESHOLD})'
+    )
+    parser.add_argument(
+        '--output',
+        type=str,
+        default=None,
+        help='Also write the results to this JSON file'
+    )
+    args = parser.parse_args()
+
+    try:
+        sizes = [int(size) for size in args.sizes.split(',') if size.strip()]
+    except ValueError:
+        parser.error(f"invalid --sizes '{args.sizes}'")
+
+    baseline_path = Path(args.baseline)
+    baseline = json.loads(baseline_path.read_text()) if baseline_path.exists() else None
+
+    current = run_suite(sizes, args.repeat, args.work_dir)
+    print_results(current, baseline)
+
+    if args.output:
+        Path(args.output).write_text(json.dumps(current, indent=2) + '\n')
+    if args.save:
+        baseline_path.write_text(json.dumps(current, indent=2) + '\n')
+        print(f"\n✅ Baseline saved to {baseline_path}")
+
+    if args.check:
+        if baseline is None:
+            print(f"\n❌ No baseline at {baseline_path}; run with --save first")
+            sys.exit(1)
+        regressions = check_regressions(current, baseline, args.threshold)
+        if regressions:
+            print(f"\n❌ {len(regressions)} regression(s) over {args.threshold:.0%}:")
+            for message in regressions:
+                print(f"  {message}")
+            sys.exit(1)
+        print(f"\n✅ No regressions over {args.threshold:.0%}")
+
+
+if __name__ == '__main__':
+    main()
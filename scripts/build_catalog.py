@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""
+Kearney AI Skills - Catalog Bundle Builder
+
+Compiles app/prompts.json and every prompt and skill file it references
+into a single versioned bundle that the web app loads with one file open.
+Missing or unreadable content files fail the build.
+
+Serve the bundle by setting CATALOG_BUNDLE to its path before starting
+the app.
+"""
+
+import sys
+from pathlib import Path
+
+ROOT_DIR = Path(__file__).parent.parent
+APP_DIR = ROOT_DIR / 'app'
+
+# The bundle format lives with the app modules it is loaded by
+sys.path.insert(0, str(APP_DIR))
+
+from catalog import Catalog
+from catalog_bundle import BundleError, write_bundle
+
+DEFAULT_OUTPUT = APP_DIR / 'catalog.bundle'
+
+
+def build(items_json=APP_DIR / 'prompts.json', base_dir=ROOT_DIR, output=DEFAULT_OUTPUT,
+          allow_missing=False) -> dict:
+    """
+    Build the catalog bundle.
+
+    Returns:
+        dict: The bundle header (version, item metadata, ...).
+
+    Raises:
+        BundleError: If any referenced content file cannot be read and
+            ``allow_missing`` is False.
+    """
+    catalog = Catalog(str(items_json), str(base_dir))
+    return write_bundle(catalog, str(output), allow_errors=allow_missing)
+
+
+def main():
+    """Main entry point for the bundle builder."""
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Compile the prompt library into a single catalog bundle')
+    parser.add_argument(
+        '--items',
+        type=str,
+        default=str(APP_DIR / 'prompts.json'),
+        help='prompts.json to compile'
+    )
+    parser.add_argument(
+        '--base-dir',
+        type=str,
+        default=str(ROOT_DIR),
+        help='Directory that content file paths are relative to'
+    )
+    parser.add_argument(
+        '--output',
+        type=str,
+        default=str(DEFAULT_OUTPUT),
+        help='Bundle file to write'
+    )
+    parser.add_argument(
+        '--allow-missing',
+        action='store_true',
+        help='Build even if content files are missing, keeping an error message as their body'
+    )
+    args = parser.parse_args()
+
+    try:
+        header = build(args.items, args.base_dir, args.output, allow_missing=args.allow_missing)
+    except BundleError as e:
+        print("❌ Catalog build failed:")
+        for line in str(e).splitlines():
+            print(f"  {line}")
+        sys.exit(1)
+
+    size = Path(args.output).stat().st_size
+    print(f"✅ Built {args.output}")
+    print(f"   {len(header['items'])} items, {size:,} bytes, version {header['version'][:12]}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,414 @@
+#!/usr/bin/env python3
+"""
+Kearney AI Skills - Repository Conformance Scanner
+
+Walks the repository once, reads each file at most once and applies a
+registry of rules to it: naming, UI design (logo, header, footer, colors,
+fonts) and content-file references in prompts.json.
+
+Files are checked in a process pool, and per-file results are cached by
+file signature and content hash, so unchanged files are not read again on
+the next run.
+
+    python scripts/conformance.py
+    python scripts/conformance.py --rules no-commons-references --no-cache
+"""
+
+import fnmatch
+import hashlib
+import inspect
+import json
+import os
+import re
+import subprocess
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+ROOT_DIR = Path(__file__).parent.parent
+DEFAULT_CACHE_PATH = Path(__file__).parent / '.conformance_cache.json'
+CACHE_FORMAT = 1
+
+# Directories never descended into
+SKIP_DIRS = {'.git', '__pycache__'}
+
+# Below this many files to read, checking in-process beats starting a pool
+PARALLEL_THRESHOLD = 64
+
+
+class Rule:
+    """
+    A conformance check applied to every file matching ``paths``.
+
+    ``check(text, rel_path, root)`` returns a list of violation messages for
+    one file; files that are not UTF-8 text are skipped. A ``required`` rule
+    also fails when no file matches it. Rules whose outcome depends on other
+    files (``cacheable=False``) are re-run on every scan.
+    """
+
+    def __init__(self, name, check, paths=('*',), exclude=(), required=False, missing_message=None,
+                 cacheable=True):
+        self.name = name
+        self.check = check
+        self.paths = tuple(paths)
+        self.exclude = tuple(exclude)
+        self.required = required
+        self.missing_message = missing_message or f"no file matches {', '.join(self.paths)}"
+        self.cacheable = cacheable
+        try:
+            source = inspect.getsource(check)
+        except (OSError, TypeError):
+            source = name
+        # Cached results are discarded whenever a rule's code changes
+        self.version = hashlib.sha256(f'{self.paths}{self.exclude}{source}'.encode('utf-8')).hexdigest()[:16]
+
+    def applies(self, rel_path):
+        """True if the rule checks the file at this repository-relative POSIX path."""
+        return (
+            any(fnmatch.fnmatchcase(rel_path, pattern) for pattern in self.paths)
+            and not any(fnmatch.fnmatchcase(rel_path, pattern) for pattern in self.exclude)
+        )
+
+
+RULES = {}
+
+
+def register_rule(name, paths=('*',), exclude=(), required=False, missing_message=None, cacheable=True):
+    """Decorator registering a check function as a named rule."""
+    def decorator(check):
+        RULES[name] = Rule(name, check, paths, exclude, required, missing_message, cacheable)
+        return check
+    return decorator
+
+
+# --- Naming ---
+
+COMMONS_RE = re.compile(r'ai\s*commons|commons\s*team', re.IGNORECASE)
+BINARY_PATTERNS = ('*.pyc', '*.png', '*.jpg', '*.ico', '*.woff', '*.woff2')
+
+
+@register_rule('no-commons-references', exclude=('tests/*', '*/tests/*') + BINARY_PATTERNS)
+def no_commons_references(text, rel_path, root):
+    """The project was renamed from 'commons' to 'skills'."""
+    return [f"{rel_path} still contains a 'commons' reference"] if COMMONS_RE.search(text) else []
+
+
+# --- UI design ---
+
+TEMPLATES = ('app/templates/*.html',)
+STYLESHEET = ('app/static/style.css',)
+LOGO = 'app/static/kearney-logo.svg'
+KEARNEY_COLORS = {'#7823DC': 'Kearney purple', '#1E1E1E': 'Kearney black', '#E0D2FA': 'Kearney accent'}
+
+
+@register_rule('logo-svg', paths=(LOGO,), required=True, missing_message=f"Kearney logo not found at {LOGO}")
+def logo_svg(text, rel_path, root):
+    """The official logo must be a real SVG."""
+    errors = []
+    if '<svg' not in text:
+        errors.append("Logo file is not a valid SVG")
+    if 'viewBox' not in text:
+        errors.append("Logo SVG missing viewBox attribute")
+    return errors
+
+
+@register_rule('templates-use-logo', paths=TEMPLATES)
+def templates_use_logo(text, rel_path, root):
+    """Templates reference the logo image rather than font-based logos."""
+    if 'kearney-logo.svg' not in text:
+        return [f"{os.path.basename(rel_path)} does not reference kearney-logo.svg"]
+    return []
+
+
+@register_rule('no-text-logos', paths=TEMPLATES)
+def no_text_logos(text, rel_path, root):
+    """An element with the logo class must be an image."""
+    if ('class="logo"' in text or "class='logo'" in text) and not ('<img' in text and 'logo' in text):
+        return [f"{os.path.basename(rel_path)} appears to have a text-based logo instead of an image"]
+    return []
+
+
+@register_rule('template-header', paths=TEMPLATES)
+def template_header(text, rel_path, root):
+    """Every page uses the shared header structure."""
+    name = os.path.basename(rel_path)
+    errors = []
+    if 'site-header' not in text:
+        errors.append(f"{name} missing site-header class")
+    if 'header-nav' not in text:
+        errors.append(f"{name} missing header-nav")
+    return errors
+
+
+@register_rule('template-footer', paths=TEMPLATES)
+def template_footer(text, rel_path, root):
+    """Every page uses the shared footer with the copyright line."""
+    name = os.path.basename(rel_path)
+    errors = []
+    if 'site-footer' not in text:
+        errors.append(f"{name} missing site-footer class")
+    if not ('Kearney' in text and 'All rights reserved' in text):
+        errors.append(f"{name} missing copyright text")
+    return errors
+
+
+@register_rule('css-colors', paths=STYLESHEET, required=True)
+def css_colors(text, rel_path, root):
+    """The stylesheet uses the official Kearney palette."""
+    lowered = text.lower()
+    return [f"Missing {label} ({color})" for color, label in KEARNEY_COLORS.items() if color.lower() not in lowered]
+
+
+@register_rule('css-font', paths=STYLESHEET, required=True)
+def css_font(text, rel_path, root):
+    """The stylesheet uses the Inter font."""
+    return [] if 'Inter' in text else ["CSS does not reference Inter font"]
+
+
+# --- Content ---
+
+@register_rule('prompt-content-files', paths=('app/prompts.json',), required=True, cacheable=False)
+def prompt_content_files(text, rel_path, root):
+    """Every prompt and skill file referenced by prompts.json exists."""
+    try:
+        items = json.loads(text)
+    except ValueError as e:
+        return [f"{rel_path} is not valid JSON: {e}"]
+    errors = []
+    for item in items:
+        if item.get('Type', 'prompt') == 'skill':
+            folder = item.get('SkillFolder', '')
+            files = [f"{folder}/SKILL_{platform}.md" for platform in item.get('Platforms', [])]
+        else:
+            files = [item.get('PromptContentFile', '')]
+        for name in files:
+            if not name or not os.path.isfile(os.path.join(root, name)):
+                errors.append(f"item {item.get('id')}: missing content file {name or '(none)'}")
+    return errors
+
+
+# --- Engine ---
+
+class ScanResult:
+    """Violations by rule and counters of one scan."""
+
+    def __init__(self):
+        self.violations = {}
+        self.stats = {'files': 0, 'read': 0, 'cached': 0, 'bytes_read': 0}
+
+    def add(self, rule, rel_path, messages):
+        self.violations.setdefault(rule, [])
+        self.violations[rule] += [(rel_path, message) for message in messages]
+
+    def messages(self, rule):
+        """Violation messages of one rule."""
+        return [message for _, message in self.violations.get(rule, [])]
+
+    def paths(self, rule):
+        """Sorted paths of the files violating one rule."""
+        return sorted({path for path, _ in self.violations.get(rule, []) if path is not None})
+
+    @property
+    def ok(self):
+        return not any(self.violations.values())
+
+
+def _file_signature(path):
+    st = os.stat(path)
+    return [st.st_mtime_ns, st.st_size]
+
+
+def _check_file(task):
+    """
+    Read one file and run the pending rules on it (runs in a worker process).
+
+    When the content hash matches the cached one, cached results of
+    cacheable rules are reused instead of re-running them.
+    """
+    root, rel_path, rule_names, cached = task
+    with open(os.path.join(root, rel_path), 'rb') as f:
+        data = f.read()
+    digest = hashlib.sha256(data).hexdigest()
+    try:
+        text = data.decode('utf-8')
+    except UnicodeDecodeError:
+        text = None
+
+    reusable = cached['results'] if cached and cached.get('hash') == digest else {}
+    results = {}
+    for name in rule_names:
+        rule = RULES[name]
+        previous = reusable.get(name)
+        if rule.cacheable and previous and previous[0] == rule.version:
+            results[name] = previous
+        else:
+            messages = [] if text is None else list(rule.check(text, rel_path, root))
+            results[name] = [rule.version, messages]
+    return rel_path, digest, len(data), results
+
+
+def _load_cache(cache_path, root):
+    if cache_path is None:
+        return {}
+    try:
+        cache = json.loads(Path(cache_path).read_text())
+    except (OSError, ValueError):
+        return {}
+    if cache.get('format') != CACHE_FORMAT or cache.get('root') != root:
+        return {}
+    return cache.get('files', {})
+
+
+def _save_cache(cache_path, root, files):
+    tmp_path = f'{cache_path}.tmp'
+    with open(tmp_path, 'w') as f:
+        json.dump({'format': CACHE_FORMAT, 'root': root, 'files': files}, f, separators=(',', ':'))
+    os.replace(tmp_path, cache_path)
+
+
+def _git_ignored(root):
+    """
+    Return the paths under ``root`` that git ignores (relative, '/'-separated;
+    directories end with '/'), or an empty set outside a git checkout.
+    """
+    try:
+        listed = subprocess.run(
+            ['git', 'ls-files', '--others', '--ignored', '--exclude-standard', '--directory', '-z'],
+            cwd=root, capture_output=True, check=True,
+        ).stdout
+    except (OSError, subprocess.CalledProcessError):
+        return set()
+    return {path for path in listed.decode('utf-8', 'replace').split('\0') if path}
+
+
+def scan(root=ROOT_DIR, rules=None, jobs=None, cache_path=DEFAULT_CACHE_PATH) -> ScanResult:
+    """
+    Scan a repository.
+
+    Args:
+        root: Repository root.
+        rules: Names of the rules to apply (default: all registered rules).
+        jobs: Worker processes (default: one per CPU; 1 checks in-process).
+        cache_path: JSON cache of per-file results, or None to disable it.
+
+    Returns:
+        ScanResult: Violations of every selected rule.
+    """
+    root = os.path.abspath(root)
+    selected = [RULES[name] for name in (rules or RULES)]
+    cache_file = os.path.abspath(cache_path) if cache_path is not None else None
+    cache = _load_cache(cache_file, root)
+    result = ScanResult()
+    matched = {rule.name: 0 for rule in selected}
+    seen = set()
+    tasks = []
+
+    # Files git ignores (local reports, build output) are not part of the repository
+    ignored = _git_ignored(root)
+    for dirpath, dirnames, filenames in os.walk(root):
+        rel_dir = Path(dirpath).relative_to(root).as_posix()
+        prefix = '' if rel_dir == '.' else rel_dir + '/'
+        dirnames[:] = sorted(
+            name for name in dirnames if name not in SKIP_DIRS and f'{prefix}{name}/' not in ignored
+        )
+        for filename in sorted(filenames):
+            path = os.path.join(dirpath, filename)
+            if filename.startswith(DEFAULT_CACHE_PATH.name) or (cache_file and path.startswith(cache_file)):
+                continue
+            rel_path = prefix + filename
+            if rel_path in ignored:
+                continue
+            seen.add(rel_path)
+            applicable = [rule for rule in selected if rule.applies(rel_path)]
+            if not applicable:
+                continue
+            result.stats['files'] += 1
+            try:
+                signature = _file_signature(path)
+            except OSError:
+                continue
+            cached = cache.get(rel_path)
+            unchanged = cached is not None and cached.get('signature') == signature
+            pending = []
+            for rule in applicable:
+                matched[rule.name] += 1
+                previous = cached['results'].get(rule.name) if unchanged else None
+                if rule.cacheable and previous and previous[0] == rule.version:
+                    result.add(rule.name, rel_path, previous[1])
+                else:
+                    pending.append(rule.name)
+            if pending:
+                tasks.append((root, rel_path, pending, cached, signature))
+            else:
+                result.stats['cached'] += 1
+
+    jobs = jobs or os.cpu_count() or 1
+    work = [task[:4] for task in tasks]
+    if jobs > 1 and len(work) >= PARALLEL_THRESHOLD:
+        with ProcessPoolExecutor(max_workers=jobs) as pool:
+            outcomes = list(pool.map(_check_file, work, chunksize=16))
+    else:
+        outcomes = [_check_file(task) for task in work]
+
+    for (_, _, _, cached, signature), (rel_path, digest, size, results) in zip(tasks, outcomes):
+        result.stats['read'] += 1
+        result.stats['bytes_read'] += size
+        for name, (_, messages) in results.items():
+            result.add(name, rel_path, messages)
+        previous = cached['results'] if cached and cached.get('hash') == digest else {}
+        cache[rel_path] = {'signature': signature, 'hash': digest, 'results': {**previous, **results}}
+
+    for rule in selected:
+        result.violations.setdefault(rule.name, [])
+        if rule.required and not matched[rule.name]:
+            result.add(rule.name, None, [rule.missing_message])
+
+    if cache_file is not None:
+        _save_cache(cache_file, root, {path: entry for path, entry in cache.items() if path in seen})
+    return result
+
+
+def main():
+    """Main entry point for the conformance scanner."""
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Check the repository against the conformance rules')
+    parser.add_argument(
+        '--rules',
+        type=str,
+        default=None,
+        help=f"Comma-separated rules to run (default: all of {', '.join(RULES)})"
+    )
+    parser.add_argument(
+        '--jobs',
+        type=int,
+        default=None,
+        help='Worker processes (default: one per CPU)'
+    )
+    parser.add_argument(
+        '--no-cache',
+        action='store_true',
+        help='Check every file instead of reusing cached results'
+    )
+    args = parser.parse_args()
+
+    rules = [name.strip() for name in args.rules.split(',') if name.strip()] if args.rules else None
+    unknown = [name for name in rules or [] if name not in RULES]
+    if unknown:
+        parser.error(f"unknown rule(s): {', '.join(unknown)}")
+
+    result = scan(ROOT_DIR, rules, args.jobs, None if args.no_cache else DEFAULT_CACHE_PATH)
+    stats = result.stats
+    print(f"Scanned {stats['files']} files ({stats['read']} read, {stats['cached']} unchanged)")
+    for rule, violations in result.violations.items():
+        if violations:
+            print(f"\n❌ {rule}:")
+            for _, message in violations:
+                print(f"  {message}")
+    if not result.ok:
+        sys.exit(1)
+    print("\n✅ All conformance rules pass")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,379 @@
+#!/usr/bin/env python3
+"""
+Kearney AI Skills - Static Site Export
+
+Renders the whole library to files that any static web server can serve,
+with no Python in the request path:
+
+- the index pages (library order, and per type), every /prompt/<id> page
+  with all of its skill platform tabs, /guide and each item's content.txt
+- fingerprinted static assets (style.<hash>.css, ...) for immutable caching
+- search-index.json, which script.js uses to answer searches, filters and
+  sorts in the browser
+- .gz siblings of every compressible file, and .br when brotli is installed
+
+Pages are rendered through the app's own routes. The page ETags are kept
+in a manifest in the output directory, and a rebuild sends each page's
+previous ETag as If-None-Match, so only the pages whose sources in
+prompts/, skills/ or prompts.json changed are rendered and written again.
+
+    python scripts/export_site.py --output site
+"""
+
+import contextlib
+import gzip
+import hashlib
+import json
+import os
+import sys
+from pathlib import Path
+from urllib.parse import urlencode
+
+ROOT_DIR = Path(__file__).parent.parent
+APP_DIR = ROOT_DIR / 'app'
+
+# Pages are rendered by the app itself
+sys.path.insert(0, str(APP_DIR))
+
+from catalog import Catalog
+from catalog_views import DEFAULT_PER_PAGE, MAX_PER_PAGE, CatalogViews, ListingQuery
+from http_cache import MIN_COMPRESS_SIZE, make_etag
+from page_cache import PageCache
+from search import FACET_FIELDS, STOP_WORDS, TOKEN_RE, SearchIndex, document_terms, entry_document
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+DEFAULT_OUTPUT = ROOT_DIR / 'site'
+MANIFEST_NAME = '.export-manifest.json'
+SEARCH_INDEX_NAME = 'search-index.json'
+
+# Bump when the file layout or URL scheme changes, to force a full rebuild
+EXPORT_FORMAT = 1
+
+COMPRESSIBLE_SUFFIXES = {'.html', '.txt', '.css', '.js', '.json', '.svg'}
+
+
+class ExportError(Exception):
+    """A page could not be rendered."""
+
+
+def fingerprint(path) -> str:
+    """Return the fingerprinted name (``style.<hash>.css``) of a static file."""
+    path = Path(path)
+    digest = hashlib.sha256(path.read_bytes()).hexdigest()[:12]
+    return f'{path.stem}.{digest}{path.suffix}'
+
+
+def listing_path(type=None, page=1) -> str:
+    """Directory of a pre-rendered index page, relative to the site root."""
+    path = f'type/{type}/' if type else ''
+    if page > 1:
+        path += f'page/{page}/'
+    return path
+
+
+class SiteURLs:
+    """
+    ``url_for`` replacement used by the templates during the export.
+
+    Maps the app's endpoints onto the exported file layout. Index pages
+    with a search, a sort or filters other than the type are not
+    pre-rendered; they link to the site root with their query string,
+    which script.js answers from the search index.
+    """
+
+    def __init__(self, static_files, base_path=''):
+        self.static_files = static_files
+        self.base_path = base_path.rstrip('/')
+        self.search_index = f'{self.base_path}/{SEARCH_INDEX_NAME}'
+
+    def __call__(self, endpoint, **values):
+        if endpoint == 'static':
+            return f"{self.base_path}/static/{self.static_files[values['filename']]}"
+        if endpoint == 'index':
+            return self.base_path + self._listing_url(values)
+        if endpoint == 'prompt_detail':
+            return f"{self.base_path}/prompt/{values['prompt_id']}/"
+        if endpoint == 'item_content_text' and not values.get('platform'):
+            return f"{self.base_path}/api/items/{values['item_id']}/content.txt"
+        if endpoint == 'guide':
+            return f'{self.base_path}/guide/'
+        raise ExportError(f"'{endpoint}' {values} is not part of the static site")
+
+    @staticmethod
+    def _listing_url(values):
+        params = {key: value for key, value in values.items() if value not in (None, '')}
+        rest = {key: value for key, value in params.items() if key not in ('type', 'page')}
+        if rest:
+            return '/?' + urlencode(params)
+        return '/' + listing_path(params.get('type'), int(params.get('page', 1)))
+
+
+def build_search_index(catalog, urls) -> dict:
+    """
+    Build the browser search index.
+
+    Documents carry the metadata shown on the index cards and the fields
+    the listing filters and sorts on. ``terms`` maps each term to a flat
+    [document, weight, document, weight, ...] posting list, with the same
+    tokenizer and field weights as the app's search.
+    """
+    docs = []
+    terms = {}
+    for i, entry in enumerate(catalog.get_items()):
+        fields, facets = entry_document(entry)
+        last_modified = entry.last_modified
+        docs.append({
+            'id': entry.id,
+            **facets,
+            'Title': entry.get('Title'),
+            'UseCase': entry.get('UseCase'),
+            'Description': entry.get('Description'),
+            'Version': entry.get('Version'),
+            'updated': last_modified.timestamp() if last_modified is not None else 0,
+            'url': urls('prompt_detail', prompt_id=entry.id),
+            'content_url': urls('item_content_text', item_id=entry.id),
+        })
+        for term, weight in document_terms(fields).items():
+            terms.setdefault(term, []).extend((i, round(weight, 2)))
+    return {
+        'format': EXPORT_FORMAT,
+        'version': catalog.version,
+        'per_page': DEFAULT_PER_PAGE,
+        'max_per_page': MAX_PER_PAGE,
+        'token_pattern': TOKEN_RE.pattern,
+        'stop_words': sorted(STOP_WORDS),
+        'facets': FACET_FIELDS,
+        'docs': docs,
+        'terms': terms,
+    }
+
+
+def _compressed(data):
+    variants = {'.gz': gzip.compress(data, compresslevel=9, mtime=0)}
+    if brotli is not None:
+        variants['.br'] = brotli.compress(data, quality=11)
+    return variants
+
+
+def _write_file(output, relpath, data) -> int:
+    """
+    Write a file and its precompressed siblings; returns the bytes written.
+
+    Each file is written to a temporary name and renamed into place, so a
+    server reading the directory during a rebuild never sees partial files.
+    """
+    path = output / relpath
+    path.parent.mkdir(parents=True, exist_ok=True)
+    variants = {'': data}
+    if path.suffix in COMPRESSIBLE_SUFFIXES and len(data) >= MIN_COMPRESS_SIZE:
+        variants.update(_compressed(data))
+    for suffix in ('.gz', '.br'):
+        if suffix not in variants:
+            Path(f'{path}{suffix}').unlink(missing_ok=True)
+    for suffix, body in variants.items():
+        target = Path(f'{path}{suffix}')
+        tmp = target.with_name(f'.{target.name}.tmp')
+        tmp.write_bytes(body)
+        os.replace(tmp, target)
+    return sum(len(body) for body in variants.values())
+
+
+def _remove_file(output, relpath):
+    path = output / relpath
+    for suffix in ('', '.gz', '.br'):
+        Path(f'{path}{suffix}').unlink(missing_ok=True)
+    parent = path.parent
+    while parent != output and not any(parent.iterdir()):
+        parent.rmdir()
+        parent = parent.parent
+
+
+def _load_manifest(output, header):
+    """Return the page ETags of the previous export, if it was made with the same settings."""
+    try:
+        manifest = json.loads((output / MANIFEST_NAME).read_text(encoding='utf-8'))
+    except (OSError, ValueError):
+        return {}
+    if manifest.get('header') != header:
+        return {}
+    return manifest.get('files', {})
+
+
+@contextlib.contextmanager
+def _exporting(catalog, urls):
+    """Point the Flask app at ``catalog`` and render its links with ``urls``."""
+    import app as webapp
+
+    saved = webapp.catalog, webapp.pages, webapp.search_index, webapp.views
+    env_globals = webapp.app.jinja_env.globals
+    saved_url_for = env_globals['url_for']
+    # Pages are written out once, so the page cache only needs one slot
+    webapp.catalog, webapp.pages, webapp.search_index, webapp.views = (
+        catalog, PageCache(max_entries=1), SearchIndex(), CatalogViews()
+    )
+    env_globals.update(url_for=urls, search_index_url=urls.search_index)
+    try:
+        yield webapp
+    finally:
+        webapp.catalog, webapp.pages, webapp.search_index, webapp.views = saved
+        env_globals['url_for'] = saved_url_for
+        env_globals.pop('search_index_url', None)
+
+
+def _site_pages(webapp, catalog):
+    """Yield (url, output path) for every page of the site."""
+    yield '/guide', 'guide/index.html'
+    views = webapp.views
+    views.sync(catalog)
+    types = [None] + sorted(views.query(ListingQuery())['facets'].get('Type', {}))
+    for type in types:
+        filters = (('type', type),) if type else ()
+        pages = views.query(ListingQuery(filters=filters))['pages']
+        for page in range(1, pages + 1):
+            params = {'type': type, 'page': page if page > 1 else None}
+            query = urlencode({key: value for key, value in params.items() if value})
+            yield '/' + (f'?{query}' if query else ''), listing_path(type, page) + 'index.html'
+    for entry in catalog.get_items():
+        yield f'/prompt/{entry.id}', f'prompt/{entry.id}/index.html'
+        yield f'/api/items/{entry.id}/content.txt', f'api/items/{entry.id}/content.txt'
+
+
+def export(output=DEFAULT_OUTPUT, items_json=APP_DIR / 'prompts.json', base_dir=ROOT_DIR,
+           base_path='', full=False) -> dict:
+    """
+    Export the library as a static site.
+
+    Args:
+        output: Directory to write the site to.
+        base_path: URL path the site is served under, e.g. '/library'.
+        full: Render every page even if the previous export is current.
+
+    Returns:
+        dict: Counts of 'files' in the site, 'written', 'unchanged' and
+        'removed' files, and 'bytes' written (including compressed copies).
+
+    Raises:
+        ExportError: If a page does not render.
+    """
+    output = Path(output)
+    output.mkdir(parents=True, exist_ok=True)
+    header = {
+        'format': EXPORT_FORMAT,
+        'base_path': base_path.rstrip('/'),
+        'encodings': ['gzip', 'br'] if brotli is not None else ['gzip'],
+    }
+    previous = {} if full else _load_manifest(output, header)
+    files = {}
+    stats = {'files': 0, 'written': 0, 'unchanged': 0, 'removed': 0, 'bytes': 0}
+
+    def save(relpath, etag, data):
+        files[relpath] = etag
+        stats['written'] += 1
+        stats['bytes'] += _write_file(output, relpath, data)
+
+    def current(relpath, etag):
+        """True if the previous export wrote this file with the same ETag."""
+        if previous.get(relpath) == etag and (output / relpath).exists():
+            files[relpath] = etag
+            stats['unchanged'] += 1
+            return True
+        return False
+
+    static_dir = APP_DIR / 'static'
+    static_files = {}
+    for path in sorted(static_dir.rglob('*')):
+        if path.is_file():
+            name = path.relative_to(static_dir).as_posix()
+            static_files[name] = Path(name).with_name(fingerprint(path)).as_posix()
+            relpath = f'static/{static_files[name]}'
+            if not current(relpath, static_files[name]):
+                save(relpath, static_files[name], path.read_bytes())
+
+    urls = SiteURLs(static_files, base_path)
+    catalog = Catalog(str(items_json), str(base_dir))
+    with _exporting(catalog, urls) as webapp:
+        client = webapp.app.test_client()
+        for url, relpath in _site_pages(webapp, catalog):
+            headers = {}
+            if relpath in previous and (output / relpath).exists():
+                headers['If-None-Match'] = f'"{previous[relpath]}"'
+            response = client.get(url, headers=headers)
+            if response.status_code == 304:
+                files[relpath] = previous[relpath]
+                stats['unchanged'] += 1
+            elif response.status_code == 200:
+                save(relpath, response.get_etag()[0], response.get_data())
+            else:
+                raise ExportError(f"{url} returned {response.status_code}")
+
+        etag = make_etag(catalog.version, EXPORT_FORMAT)
+        if not current(SEARCH_INDEX_NAME, etag):
+            index = build_search_index(catalog, urls)
+            save(SEARCH_INDEX_NAME, etag, json.dumps(index, separators=(',', ':')).encode('utf-8'))
+
+    for relpath in set(previous) - set(files):
+        _remove_file(output, relpath)
+        stats['removed'] += 1
+
+    manifest = output / MANIFEST_NAME
+    tmp = manifest.with_name(f'.{manifest.name}.tmp')
+    tmp.write_text(json.dumps({'header': header, 'files': files}, indent=2, sort_keys=True), encoding='utf-8')
+    os.replace(tmp, manifest)
+    stats['files'] = len(files)
+    return stats
+
+
+def main():
+    """Main entry point for the static site export."""
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Export the library as a static site')
+    parser.add_argument(
+        '--output',
+        type=str,
+        default=str(DEFAULT_OUTPUT),
+        help='Directory to write the site to'
+    )
+    parser.add_argument(
+        '--items',
+        type=str,
+        default=str(APP_DIR / 'prompts.json'),
+        help='prompts.json to export'
+    )
+    parser.add_argument(
+        '--base-dir',
+        type=str,
+        default=str(ROOT_DIR),
+        help='Directory that content file paths are relative to'
+    )
+    parser.add_argument(
+        '--base-path',
+        type=str,
+        default='',
+        help="URL path the site is served under, e.g. '/library'"
+    )
+    parser.add_argument(
+        '--full',
+        action='store_true',
+        help='Render every page instead of only those whose sources changed'
+    )
+    args = parser.parse_args()
+
+    try:
+        stats = export(args.output, args.items, args.base_dir, args.base_path, full=args.full)
+    except ExportError as e:
+        print(f"❌ Export failed: {e}")
+        sys.exit(1)
+
+    print(f"✅ Exported {stats['files']} files to {args.output}: {stats['written']} written "
+          f"({stats['bytes'] / 1e6:.1f} MB), {stats['unchanged']} unchanged, {stats['removed']} removed")
+    if brotli is None:
+        print("   (brotli not installed; only .gz copies were written)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,199 @@
+#!/usr/bin/env python3
+"""
+Kearney AI Skills - HTTP Load Test
+
+Drives a running instance of the web app with concurrent keep-alive
+clients and reports throughput and latency percentiles per path. With
+--min-rps / --max-p99-ms it exits non-zero when the documented throughput
+targets are not met, so it can gate a deployment.
+
+    python scripts/load_test.py --url http://localhost:8000 --duration 30
+"""
+
+import http.client
+import sys
+import threading
+import time
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from urllib.parse import urlsplit
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from scripts.report_writer import PERCENTILES, percentile
+
+# A mix of the cached pages, the content API and search
+DEFAULT_PATHS = (
+    '/',
+    '/prompt/1',
+    '/api/items/1/content',
+    '/api/items/1/content.txt',
+    '/api/search?q=analysis',
+    '/healthz',
+)
+
+
+class LoadResult:
+    """Latencies and failures collected by the client threads."""
+
+    def __init__(self):
+        self.latencies = defaultdict(list)
+        self.errors = defaultdict(int)
+        self.bytes = 0
+        self.seconds = 0.0
+        self._lock = threading.Lock()
+
+    def record(self, path, latency_ms, size):
+        with self._lock:
+            self.latencies[path].append(latency_ms)
+            self.bytes += size
+
+    def fail(self, path):
+        with self._lock:
+            self.errors[path] += 1
+
+    @property
+    def requests(self) -> int:
+        return sum(len(values) for values in self.latencies.values())
+
+    @property
+    def rps(self) -> float:
+        return self.requests / self.seconds if self.seconds else 0.0
+
+    def latency_ms(self, pct, path=None) -> float:
+        """Latency percentile for one path, or across all paths."""
+        if path is not None:
+            return percentile(self.latencies[path], pct)
+        return percentile([v for values in self.latencies.values() for v in values], pct)
+
+
+def _client(host, port, paths, deadline, result, headers):
+    """Issue requests over one keep-alive connection until the deadline."""
+    conn = http.client.HTTPConnection(host, port, timeout=30)
+    i = 0
+    while time.monotonic() < deadline:
+        path = paths[i % len(paths)]
+        i += 1
+        start = time.perf_counter()
+        try:
+            conn.request('GET', path, headers=headers)
+            response = conn.getresponse()
+            body = response.read()
+        except (OSError, http.client.HTTPException):
+            result.fail(path)
+            conn.close()
+            conn = http.client.HTTPConnection(host, port, timeout=30)
+            continue
+        if response.status >= 400:
+            result.fail(path)
+        else:
+            result.record(path, (time.perf_counter() - start) * 1000, len(body))
+    conn.close()
+
+
+def run_load_test(url, paths=DEFAULT_PATHS, clients=16, duration=10.0, gzip=True) -> LoadResult:
+    """
+    Run ``clients`` concurrent connections against ``url`` for ``duration`` seconds.
+
+    Each client cycles through ``paths``, starting at a different offset so
+    every path is requested throughout the run.
+    """
+    parts = urlsplit(url)
+    host, port = parts.hostname, parts.port or 80
+    headers = {'Accept-Encoding': 'gzip'} if gzip else {}
+    result = LoadResult()
+    start = time.monotonic()
+    deadline = start + duration
+    with ThreadPoolExecutor(max_workers=clients) as pool:
+        for n in range(clients):
+            offset = n % len(paths)
+            pool.submit(_client, host, port, list(paths[offset:]) + list(paths[:offset]), deadline, result, headers)
+    result.seconds = time.monotonic() - start
+    return result
+
+
+def print_result(result: LoadResult):
+    """Print the per-path and overall throughput and latencies."""
+    print(f"\n{'Path':<32} {'Requests':>9} {'Errors':>7} " + ' '.join(f"{f'p{p} ms':>9}" for p in PERCENTILES))
+    for path in sorted(set(result.latencies) | set(result.errors)):
+        values = ' '.join(f"{result.latency_ms(p, path) or 0:>9.1f}" for p in PERCENTILES)
+        print(f"{path:<32} {len(result.latencies[path]):>9} {result.errors[path]:>7} {values}")
+    print(f"\nRequests: {result.requests:,} in {result.seconds:.1f}s ({result.rps:,.0f} req/s), "
+          f"{sum(result.errors.values())} errors, {result.bytes / 1e6:.1f} MB")
+    print('Latency: ' + ', '.join(f"p{p} {result.latency_ms(p) or 0:.1f} ms" for p in PERCENTILES))
+
+
+def main():
+    """Main entry point for the load test."""
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Load test a running skills library instance')
+    parser.add_argument(
+        '--url',
+        type=str,
+        default='http://localhost:8000',
+        help='Base URL of the running app'
+    )
+    parser.add_argument(
+        '--paths',
+        type=str,
+        default=','.join(DEFAULT_PATHS),
+        help='Comma-separated paths to request in rotation'
+    )
+    parser.add_argument(
+        '--clients',
+        type=int,
+        default=16,
+        help='Concurrent keep-alive connections'
+    )
+    parser.add_argument(
+        '--duration',
+        type=float,
+        default=10.0,
+        help='Seconds to run'
+    )
+    parser.add_argument(
+        '--no-gzip',
+        action='store_true',
+        help='Do not send Accept-Encoding: gzip'
+    )
+    parser.add_argument(
+        '--min-rps',
+        type=float,
+        default=None,
+        help='Fail if overall throughput is below this many requests/second'
+    )
+    parser.add_argument(
+        '--max-p99-ms',
+        type=float,
+        default=None,
+        help='Fail if the overall p99 latency exceeds this many milliseconds'
+    )
+    args = parser.parse_args()
+
+    paths = [path.strip() for path in args.paths.split(',') if path.strip()]
+    print(f"Load testing {args.url} with {args.clients} clients for {args.duration:g}s...")
+    result = run_load_test(args.url, paths, args.clients, args.duration, gzip=not args.no_gzip)
+    print_result(result)
+
+    failures = []
+    if result.requests == 0:
+        failures.append('no successful requests')
+    if sum(result.errors.values()):
+        failures.append(f"{sum(result.errors.values())} failed requests")
+    if args.min_rps is not None and result.rps < args.min_rps:
+        failures.append(f"throughput {result.rps:,.0f} req/s below target {args.min_rps:,.0f}")
+    p99 = result.latency_ms(99)
+    if args.max_p99_ms is not None and p99 is not None and p99 > args.max_p99_ms:
+        failures.append(f"p99 {p99:.1f} ms above target {args.max_p99_ms:g} ms")
+
+    if failures:
+        print("\n❌ Load test failed: " + '; '.join(failures))
+        sys.exit(1)
+    print("\n✅ Load test passed")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,188 @@
+"""
+Kearney AI Skills - Validation Pre-flight Planner
+
+Estimates the tokens, cost and duration of a validation run before any API
+call is made, so oversized runs can be rejected or trimmed to a
+``--max-cost`` / ``--max-total-tokens`` budget up front.
+"""
+
+import math
+import re
+from collections import defaultdict
+
+from scripts.providers import estimate_cost, get_rate_limiter
+
+# Offline tokenizer approximation: words are split into ~5 character
+# pieces, digits into groups of three, and every punctuation mark or run of
+# newlines is a token of its own. Close to BPE counts for English prose and
+# markdown without needing a provider tokenizer.
+TOKEN_RE = re.compile(r"[A-Za-z]+|\d{1,3}|\n+|[^\sA-Za-z\d]")
+CHARS_PER_WORD_PIECE = 5
+
+# Latency model used to project duration: fixed overhead per call plus
+# output generation speed. Calls are assumed to use their full max_tokens.
+BASE_SECONDS_PER_CALL = 1.0
+OUTPUT_TOKENS_PER_SECOND = 60.0
+
+
+def count_tokens(text: str) -> int:
+    """Approximate the number of tokens in a text."""
+    count = 0
+    for piece in TOKEN_RE.findall(text or ''):
+        if piece[0].isalpha():
+            count += 1 + (len(piece) - 1) // CHARS_PER_WORD_PIECE
+        else:
+            count += 1
+    return count
+
+
+class Plan:
+    """
+    Projected API usage of a validation run.
+
+    Token and cost figures are upper bounds: every call is assumed to use
+    its full output budget. Calls already satisfied by the response cache
+    or a resumed report are counted as skipped and cost nothing.
+    """
+
+    def __init__(self):
+        self.rows = []
+        self.calls = 0
+        self.skipped = 0
+        self.input_tokens = 0
+        self.output_tokens = 0
+        self.cost_usd = 0.0
+        self.unpriced_models = set()
+        self.by_prompt = defaultdict(lambda: {'system_tokens': 0, 'calls': 0, 'tokens': 0, 'cost_usd': 0.0})
+        self.by_provider = defaultdict(lambda: {'calls': 0, 'tokens': 0, 'seconds': 0.0})
+
+    @property
+    def total_tokens(self) -> int:
+        return self.input_tokens + self.output_tokens
+
+    def add_row(self, calls: list, prompt_name: str, system_tokens: int):
+        """
+        Add one matrix row.
+
+        Args:
+            calls: (provider, model, input_tokens, max_output_tokens) for each
+                call the row will actually make.
+        """
+        row_tokens, row_cost = 0, 0.0
+        for provider, model, input_tokens, output_tokens in calls:
+            cost = estimate_cost(model, input_tokens, output_tokens)
+            if cost is None:
+                self.unpriced_models.add(model)
+                cost = 0.0
+            row_tokens += input_tokens + output_tokens
+            row_cost += cost
+            self.input_tokens += input_tokens
+            self.output_tokens += output_tokens
+
+            stats = self.by_provider[provider]
+            stats['calls'] += 1
+            stats['tokens'] += input_tokens + output_tokens
+            stats['seconds'] += BASE_SECONDS_PER_CALL + output_tokens / OUTPUT_TOKENS_PER_SECOND
+
+        prompt = self.by_prompt[prompt_name]
+        prompt['system_tokens'] = system_tokens
+        prompt['calls'] += len(calls)
+        prompt['tokens'] += row_tokens
+        prompt['cost_usd'] += row_cost
+        self.calls += len(calls)
+        self.cost_usd += row_cost
+        self.rows.append((row_tokens, row_cost))
+
+    def over_budget(self, max_cost=None, max_total_tokens=None) -> bool:
+        """True if the plan exceeds either budget."""
+        return (
+            (max_cost is not None and self.cost_usd > max_cost)
+            or (max_total_tokens is not None and self.total_tokens > max_total_tokens)
+        )
+
+    def rows_within(self, max_cost=None, max_total_tokens=None) -> int:
+        """Return how many leading rows fit within the budgets."""
+        tokens, cost = 0, 0.0
+        for kept, (row_tokens, row_cost) in enumerate(self.rows):
+            tokens += row_tokens
+            cost += row_cost
+            if ((max_cost is not None and cost > max_cost)
+                    or (max_total_tokens is not None and tokens > max_total_tokens)):
+                return kept
+        return len(self.rows)
+
+    def duration_seconds(self, concurrency: int, provider_concurrency: dict, default_provider_concurrency: int) -> dict:
+        """
+        Project the wall-clock duration per provider and overall.
+
+        Each provider is bounded by its concurrency limit and by its
+        requests/min and tokens/min buckets (after the initial burst); the
+        run is bounded by the slowest provider and by the global limit.
+
+        Returns:
+            dict: {provider: seconds, ..., 'total': seconds}
+        """
+        durations = {}
+        total_seconds = 0.0
+        for provider, stats in self.by_provider.items():
+            workers = max(1, min(concurrency, provider_concurrency.get(provider, default_provider_concurrency)))
+            bounds = [stats['seconds'] / workers]
+            limiter = get_rate_limiter(provider)
+            for bucket, amount in ((limiter.requests, stats['calls']), (limiter.tokens, stats['tokens'])):
+                if bucket is not None:
+                    bounds.append(max(0, amount - bucket.capacity) / bucket.rate)
+            durations[provider] = max(bounds)
+            total_seconds += stats['seconds']
+        durations['total'] = max([total_seconds / max(1, concurrency)] + list(durations.values()))
+        return durations
+
+
+def build_plan(prompt_files: list, tests: list, targets: list, budgets: list, is_done=None) -> Plan:
+    """
+    Estimate every call of the prompts x tests x budgets x targets matrix.
+
+    Args:
+        is_done: Optional predicate (prompt, test, budget, target) -> bool for
+            calls that will not be made (cached or already in the report).
+    """
+    plan = Plan()
+    query_tokens = {test['id']: count_tokens(test['query']) for test in tests}
+    for prompt in prompt_files:
+        system_tokens = count_tokens(prompt['content'])
+        for test in tests:
+            for budget in budgets:
+                calls = []
+                for target in targets:
+                    if is_done is not None and is_done(prompt, test, budget, target):
+                        plan.skipped += 1
+                        continue
+                    calls.append((target.provider, target.model, system_tokens + query_tokens[test['id']], budget))
+                plan.add_row(calls, prompt['filename'], system_tokens)
+    return plan
+
+
+def format_duration(seconds: float) -> str:
+    """Format seconds as e.g. '1h 02m', '3m 20s' or '12s'."""
+    seconds = int(math.ceil(seconds))
+    if seconds >= 3600:
+        return f'{seconds // 3600}h {seconds % 3600 // 60:02d}m'
+    if seconds >= 60:
+        return f'{seconds // 60}m {seconds % 60:02d}s'
+    return f'{seconds}s'
+
+
+def print_plan(plan: Plan, durations: dict):
+    """Print the pre-flight estimate."""
+    print(f"\nPre-flight estimate ({len(plan.rows)} rows, {plan.calls} API calls, {plan.skipped} cached/resumed):")
+    for name, stats in plan.by_prompt.items():
+        print(f"  {name}: ~{stats['system_tokens']:,} tokens/system prompt, {stats['calls']} calls, "
+              f"~{stats['tokens']:,} tokens, ${stats['cost_usd']:.4f}")
+    print(f"  Input tokens: ~{plan.input_tokens:,}")
+    print(f"  Output tokens (max): {plan.output_tokens:,}")
+    print(f"  Cost (max): ${plan.cost_usd:.4f}")
+    if plan.unpriced_models:
+        print(f"  No pricing for: {', '.join(sorted(plan.unpriced_models))} (counted as $0)")
+    for provider, seconds in durations.items():
+        if provider != 'total':
+            print(f"  Duration {provider}: ~{format_duration(seconds)}")
+    print(f"  Duration (projected): ~{format_duration(durations['total'])}")
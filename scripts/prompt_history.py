@@ -0,0 +1,195 @@
+#!/usr/bin/env python3
+"""
+Kearney AI Skills - Prompt and Skill Version History
+
+Records the current body of every prompt and skill in the content store
+(store/) and appends a History record to its prompts.json entry whenever
+its content or Version changed. Each body is stored as a delta against the
+entry's previous version of the same file, so the store grows with the
+size of edits rather than with the number of versions, and a version bump
+no longer needs a new copy of the file.
+
+    python scripts/prompt_history.py record           # after editing content
+    python scripts/prompt_history.py show 1 --version 1.0
+    python scripts/prompt_history.py diff 1 1.0 2.0
+    python scripts/prompt_history.py verify
+"""
+
+import json
+import re
+import sys
+from datetime import datetime, timezone
+from pathlib import Path
+
+ROOT_DIR = Path(__file__).parent.parent
+APP_DIR = ROOT_DIR / 'app'
+
+# The store format lives with the app modules that serve it
+sys.path.insert(0, str(APP_DIR))
+
+from catalog import Catalog
+from content_store import ContentStore, StoreError, find_version, history_file
+
+DEFAULT_ITEMS = APP_DIR / 'prompts.json'
+DEFAULT_STORE = ROOT_DIR / 'store'
+
+# Short lists of strings ("Platforms") stay on one line, as written by hand
+_INLINE_LIST_RE = re.compile(r'\[\n\s+("[^"\n]*"(?:,\n\s+"[^"\n]*")*)\n\s+\]')
+
+
+def dump_items(items) -> str:
+    """Serialize prompts.json in its hand-written layout."""
+    text = json.dumps(items, indent=2, ensure_ascii=False)
+    return _INLINE_LIST_RE.sub(lambda m: '[' + re.sub(r',\n\s+', ', ', m.group(1)) + ']', text) + '\n'
+
+
+def record(items_json=DEFAULT_ITEMS, base_dir=ROOT_DIR, store_dir=DEFAULT_STORE, date=None) -> list:
+    """
+    Store the current content of every entry and record new versions.
+
+    A History record is appended when an entry's file hashes or Version
+    differ from its latest record. Files that cannot be read are left out;
+    an entry without any readable file gets no record.
+
+    Returns:
+        list: (id, Version) of every version recorded.
+    """
+    items_json = Path(items_json)
+    store = ContentStore(str(store_dir))
+    catalog = Catalog(str(items_json), str(base_dir))
+    date = date or datetime.now(timezone.utc).date().isoformat()
+    items = json.loads(items_json.read_text(encoding='utf-8'))
+
+    recorded = []
+    for raw in items:
+        entry = catalog.get(raw.get('id'))
+        history = raw.get('History', [])
+        previous = history[-1].get('Files', {}) if history else {}
+        paths = sorted(entry.current_files())
+        files = {}
+        for path in paths:
+            try:
+                text = (Path(base_dir) / path).read_text(encoding='utf-8')
+            except OSError:
+                continue
+            base = previous.get(path)
+            if base is None and len(paths) == 1 and len(previous) == 1:
+                # A prompt moved to a new file (e.g. _v2.txt to _v3.txt)
+                base = next(iter(previous.values()))
+            files[path] = store.put(text, base=base)
+        if not files:
+            continue
+        if history and history[-1].get('Files') == files and history[-1].get('Version') == raw.get('Version'):
+            continue
+        raw['History'] = history + [{'Version': raw.get('Version'), 'Date': date, 'Files': files}]
+        recorded.append((raw.get('id'), raw.get('Version')))
+
+    if recorded:
+        items_json.write_text(dump_items(items), encoding='utf-8')
+    return recorded
+
+
+def verify(items_json=DEFAULT_ITEMS, store_dir=DEFAULT_STORE) -> list:
+    """
+    Check that every body referenced by a History record reads back intact.
+
+    Returns:
+        list: One message per missing or corrupt body.
+    """
+    store = ContentStore(str(store_dir))
+    problems = []
+    for item in json.loads(Path(items_json).read_text(encoding='utf-8')):
+        for entry in item.get('History', []):
+            for path, blob_hash in entry.get('Files', {}).items():
+                error = store.verify(blob_hash)
+                if error:
+                    problems.append(f"item {item.get('id')} version {entry.get('Version')} {path}: {error}")
+    return problems
+
+
+def _find_item(items_json, item_id):
+    for item in json.loads(Path(items_json).read_text(encoding='utf-8')):
+        if item.get('id') == item_id:
+            return item
+    raise SystemExit(f"❌ Item {item_id} not found")
+
+
+def _blob(item, version, platform):
+    history = item.get('History', [])
+    record = find_version(history, version) if version else (history[-1] if history else None)
+    if record is None:
+        raise SystemExit(f"❌ Item {item.get('id')} has no version {version}")
+    path = history_file(item, platform)
+    if path not in record.get('Files', {}):
+        raise SystemExit(f"❌ Version {record.get('Version')} has no file for platform {platform}")
+    return path, record.get('Version'), record['Files'][path]
+
+
+def main():
+    """Main entry point for the history tool."""
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Record and inspect prompt and skill version history')
+    parser.add_argument(
+        '--items',
+        type=str,
+        default=str(DEFAULT_ITEMS),
+        help='prompts.json holding the History records'
+    )
+    parser.add_argument(
+        '--store',
+        type=str,
+        default=str(DEFAULT_STORE),
+        help='Content store directory'
+    )
+    commands = parser.add_subparsers(dest='command', required=True)
+    commands.add_parser('record', help='Store current content and record changed versions')
+    show = commands.add_parser('show', help='Print the body of an item at a version')
+    show.add_argument('id', type=int)
+    show.add_argument('--version', type=str, default=None, help='Version to show (default: latest)')
+    show.add_argument('--platform', type=str, default=None, help='Skill platform (default: first)')
+    diff = commands.add_parser('diff', help='Show a unified diff between two versions of an item')
+    diff.add_argument('id', type=int)
+    diff.add_argument('old', type=str)
+    diff.add_argument('new', type=str, nargs='?', default=None, help='Default: latest version')
+    diff.add_argument('--platform', type=str, default=None, help='Skill platform (default: first)')
+    commands.add_parser('verify', help='Check every recorded body reads back intact')
+    commands.add_parser('stats', help='Show the number of versions and the store size')
+    args = parser.parse_args()
+
+    store = ContentStore(args.store)
+    try:
+        if args.command == 'record':
+            recorded = record(args.items, ROOT_DIR, args.store)
+            for item_id, version in recorded:
+                print(f"  recorded item {item_id} version {version}")
+            print(f"✅ {len(recorded)} new version(s) recorded")
+        elif args.command == 'show':
+            _, _, blob_hash = _blob(_find_item(args.items, args.id), args.version, args.platform)
+            sys.stdout.write(store.get(blob_hash))
+        elif args.command == 'diff':
+            item = _find_item(args.items, args.id)
+            path, old, old_hash = _blob(item, args.old, args.platform)
+            _, new, new_hash = _blob(item, args.new, args.platform)
+            sys.stdout.write(store.diff(old_hash, new_hash, f'{path}@{old}', f'{path}@{new}'))
+        elif args.command == 'verify':
+            problems = verify(args.items, args.store)
+            for message in problems:
+                print(f"  {message}")
+            if problems:
+                print(f"❌ {len(problems)} problem(s) in the content store")
+                sys.exit(1)
+            print("✅ Every recorded version reads back intact")
+        elif args.command == 'stats':
+            items = json.loads(Path(args.items).read_text(encoding='utf-8'))
+            versions = sum(len(item.get('History', [])) for item in items)
+            count, size = store.disk_usage()
+            print(f"{versions} versions of {sum(1 for item in items if item.get('History'))} items; "
+                  f"{count} blobs, {size / 1024:.1f} KiB on disk")
+    except StoreError as e:
+        print(f"❌ {e}")
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
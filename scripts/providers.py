@@ -0,0 +1,729 @@
+"""
+Kearney AI Skills - Provider Client Layer
+
+Long-lived, pooled API clients plus the request plumbing shared by every
+provider call: per-provider token-bucket rate limiting (requests/min and
+tokens/min) and exponential backoff with jitter on throttling and server
+errors, honoring ``retry-after``.
+
+Each provider is an adapter behind a common ``call`` interface, looked up
+by name in a registry, so new providers and a deterministic offline mock
+can be swapped in without touching the validation engine.
+"""
+
+import hashlib
+import json
+import os
+import random
+import threading
+import time
+from typing import NamedTuple
+
+# Default rate limits per provider. Override with --requests-per-minute and
+# --tokens-per-minute to match your account tier.
+DEFAULT_RATE_LIMITS = {
+    'anthropic': {'requests_per_minute': 50, 'tokens_per_minute': 40000},
+    'openai': {'requests_per_minute': 500, 'tokens_per_minute': 30000},
+}
+
+# Retry policy for throttled or failed calls
+MAX_RETRIES = 5
+BASE_DELAY_SECONDS = 1.0
+MAX_DELAY_SECONDS = 60.0
+RETRYABLE_STATUS_CODES = {408, 409, 429}
+
+# Rough characters-per-token ratio used to reserve tokens before a call
+CHARS_PER_TOKEN = 4
+
+# Characters of each response kept for the report
+RESPONSE_PREVIEW_CHARS = 500
+
+# List prices in USD per million tokens as (input, output, cache read,
+# cache write), used for the cost columns of the report. Unknown models are
+# reported without a cost.
+MODEL_PRICING = {
+    'claude-sonnet-4-20250514': (3.00, 15.00, 0.30, 3.75),
+    'claude-opus-4-20250514': (15.00, 75.00, 1.50, 18.75),
+    'claude-3-5-haiku-20241022': (0.80, 4.00, 0.08, 1.00),
+    'gpt-4o': (2.50, 10.00, 1.25, 2.50),
+    'gpt-4o-mini': (0.15, 0.60, 0.075, 0.15),
+    'mock-small': (0.0, 0.0, 0.0, 0.0),
+    'mock-large': (0.0, 0.0, 0.0, 0.0),
+}
+
+# Discount applied to every token of a call made through a batch API
+BATCH_PRICE_FACTOR = 0.5
+
+# Seconds between status checks of a submitted batch
+BATCH_POLL_SECONDS = 30.0
+
+
+class TokenBucket:
+    """
+    Thread-safe token bucket refilled continuously at ``rate_per_minute``.
+
+    ``acquire`` blocks until enough tokens are available. Requests larger
+    than the bucket capacity are allowed once the bucket is full, so a
+    single oversized call cannot deadlock.
+    """
+
+    def __init__(self, rate_per_minute, capacity=None, clock=time.monotonic, sleep=time.sleep):
+        self.rate = rate_per_minute / 60.0
+        self.capacity = capacity if capacity is not None else rate_per_minute
+        self._clock = clock
+        self._sleep = sleep
+        self._tokens = float(self.capacity)
+        self._updated = clock()
+        self._lock = threading.Lock()
+
+    def _refill(self):
+        now = self._clock()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def acquire(self, amount=1):
+        """Block until ``amount`` tokens can be taken from the bucket."""
+        needed = min(amount, self.capacity)
+        while True:
+            with self._lock:
+                self._refill()
+                if self._tokens >= needed:
+                    self._tokens -= amount
+                    return
+                wait = (needed - self._tokens) / self.rate
+            self._sleep(wait)
+
+    def adjust(self, amount):
+        """Return (positive) or charge (negative) tokens after the fact."""
+        with self._lock:
+            self._refill()
+            self._tokens = min(self.capacity, self._tokens + amount)
+
+
+class RateLimiter:
+    """Requests-per-minute and tokens-per-minute limits for one provider."""
+
+    def __init__(self, requests_per_minute=None, tokens_per_minute=None, **bucket_kwargs):
+        self.requests = TokenBucket(requests_per_minute, **bucket_kwargs) if requests_per_minute else None
+        self.tokens = TokenBucket(tokens_per_minute, **bucket_kwargs) if tokens_per_minute else None
+
+    def acquire(self, estimated_tokens=0):
+        """Wait for one request slot and ``estimated_tokens`` tokens."""
+        if self.requests:
+            self.requests.acquire(1)
+        if self.tokens and estimated_tokens:
+            self.tokens.acquire(estimated_tokens)
+
+    def settle(self, estimated_tokens, actual_tokens):
+        """Correct the token bucket once the real usage is known."""
+        if self.tokens and actual_tokens:
+            self.tokens.adjust(estimated_tokens - actual_tokens)
+
+    def refund(self, estimated_tokens):
+        """Return the tokens reserved for a call that failed."""
+        if self.tokens and estimated_tokens:
+            self.tokens.adjust(estimated_tokens)
+
+
+def estimate_tokens(*texts):
+    """Cheap offline token estimate used to reserve tokens/min capacity."""
+    return sum(len(text or '') for text in texts) // CHARS_PER_TOKEN + 1
+
+
+def _status_code(exc):
+    """Extract an HTTP status code from SDK or urllib exceptions."""
+    for attr in ('status_code', 'code', 'status'):
+        value = getattr(exc, attr, None)
+        if isinstance(value, int):
+            return value
+    return None
+
+
+def _retry_after(exc):
+    """Return the server-requested delay in seconds, if any."""
+    headers = getattr(exc, 'headers', None)
+    if headers is None:
+        response = getattr(exc, 'response', None)
+        headers = getattr(response, 'headers', None)
+    if not headers:
+        return None
+    for name in ('retry-after-ms', 'retry-after'):
+        value = headers.get(name)
+        if value is None:
+            continue
+        try:
+            seconds = float(value)
+        except ValueError:
+            continue
+        return seconds / 1000 if name == 'retry-after-ms' else seconds
+    return None
+
+
+def is_retryable(exc):
+    """True for throttling, server errors and connection failures."""
+    status = _status_code(exc)
+    if status is not None:
+        return status in RETRYABLE_STATUS_CODES or status >= 500
+    name = type(exc).__name__
+    return isinstance(exc, (ConnectionError, TimeoutError)) or 'Connection' in name or 'Timeout' in name
+
+
+def backoff_delay(attempt, base_delay=BASE_DELAY_SECONDS, max_delay=MAX_DELAY_SECONDS):
+    """Exponential backoff with full jitter for the given 0-based attempt."""
+    return random.uniform(0, min(max_delay, base_delay * (2 ** attempt)))
+
+
+def call_with_retry(fn, max_retries=MAX_RETRIES, base_delay=BASE_DELAY_SECONDS,
+                    max_delay=MAX_DELAY_SECONDS, sleep=time.sleep):
+    """
+    Call ``fn`` and retry retryable failures with backoff.
+
+    The server's ``retry-after`` takes precedence over the computed delay.
+    Non-retryable errors, and the last retryable one, are re-raised.
+
+    Returns:
+        tuple: (result of fn, number of retries performed)
+    """
+    attempt = 0
+    while True:
+        try:
+            return fn(), attempt
+        except Exception as e:
+            if attempt >= max_retries or not is_retryable(e):
+                raise
+            delay = _retry_after(e)
+            if delay is None:
+                delay = backoff_delay(attempt, base_delay, max_delay)
+            sleep(min(delay, max_delay))
+            attempt += 1
+
+
+_clients = {}
+_limiters = {}
+_registry_lock = threading.Lock()
+
+
+def _create_client(provider):
+    """Construct a provider SDK client. SDK retries are disabled in favor of ours."""
+    if provider == 'anthropic':
+        import anthropic
+        return anthropic.Anthropic(api_key=os.getenv('ANTHROPIC_API_KEY'), max_retries=0)
+    if provider == 'openai':
+        from openai import OpenAI
+        return OpenAI(api_key=os.getenv('OPENAI_API_KEY'), max_retries=0)
+    raise ValueError(f"Unknown provider: {provider}")
+
+
+def get_client(provider):
+    """
+    Return the shared client for a provider, creating it on first use.
+
+    Clients hold the HTTP connection pool and TLS sessions, so one instance
+    is reused for every call in the process. ``ANTHROPIC_BASE_URL`` and
+    ``OPENAI_BASE_URL`` point the SDKs at a local stub server for testing.
+    Raises ImportError if the provider SDK is not installed.
+    """
+    client = _clients.get(provider)
+    if client is None:
+        with _registry_lock:
+            client = _clients.get(provider)
+            if client is None:
+                client = _clients[provider] = _create_client(provider)
+    return client
+
+
+def configure_rate_limits(limits):
+    """
+    Set rate limits per provider.
+
+    Args:
+        limits: {provider: {'requests_per_minute': N, 'tokens_per_minute': N}}
+            merged over DEFAULT_RATE_LIMITS.
+    """
+    with _registry_lock:
+        for provider, values in limits.items():
+            merged = dict(DEFAULT_RATE_LIMITS.get(provider, {}))
+            merged.update(values)
+            _limiters[provider] = RateLimiter(**merged)
+
+
+def get_rate_limiter(provider):
+    """Return the shared rate limiter for a provider."""
+    limiter = _limiters.get(provider)
+    if limiter is None:
+        with _registry_lock:
+            limiter = _limiters.get(provider)
+            if limiter is None:
+                limiter = _limiters[provider] = RateLimiter(**DEFAULT_RATE_LIMITS.get(provider, {}))
+    return limiter
+
+
+def limited_call(provider, fn, estimated_tokens, usage_tokens=None):
+    """
+    Run ``fn`` under the provider's rate limits with retries.
+
+    Each attempt reserves a request slot and ``estimated_tokens``. A failed
+    attempt refunds its tokens; once the call succeeds,
+    ``usage_tokens(result)`` (if given) corrects the tokens/min bucket to
+    the real usage.
+
+    Returns:
+        tuple: (result of fn, number of retries performed)
+    """
+    limiter = get_rate_limiter(provider)
+
+    def attempt():
+        limiter.acquire(estimated_tokens)
+        try:
+            return fn()
+        except Exception:
+            limiter.refund(estimated_tokens)
+            raise
+
+    result, retries = call_with_retry(attempt)
+    if usage_tokens is not None:
+        limiter.settle(estimated_tokens, usage_tokens(result))
+    return result, retries
+
+
+def estimate_cost(model, input_tokens, output_tokens, cache_read_tokens=0, cache_write_tokens=0, batch=False):
+    """
+    Return the USD cost of a call from MODEL_PRICING, or None if unknown.
+
+    ``input_tokens`` is the total prompt size; the part read from or written
+    to the provider's prompt cache is billed at the cache prices.
+    """
+    pricing = MODEL_PRICING.get(model)
+    if pricing is None:
+        return None
+    input_price, output_price, read_price, write_price = pricing
+    uncached = max(0, input_tokens - cache_read_tokens - cache_write_tokens)
+    cost = (uncached * input_price + output_tokens * output_price
+            + cache_read_tokens * read_price + cache_write_tokens * write_price) / 1_000_000
+    return round(cost * (BATCH_PRICE_FACTOR if batch else 1.0), 6)
+
+
+def make_usage(input_tokens=0, output_tokens=0, cache_read_tokens=0, cache_write_tokens=0) -> dict:
+    """Token usage of one call. ``input_tokens`` includes the cached tokens."""
+    return {
+        'input_tokens': input_tokens,
+        'output_tokens': output_tokens,
+        'cache_read_tokens': cache_read_tokens,
+        'cache_write_tokens': cache_write_tokens,
+    }
+
+
+def failed_result(error: str) -> dict:
+    """Build the result dict for a failed provider call."""
+    return {
+        'response': None,
+        'tokens_used': 0,
+        **make_usage(),
+        'latency_ms': 0,
+        'ttft_ms': None,
+        'tokens_per_sec': None,
+        'retries': 0,
+        'error': error
+    }
+
+
+def timed_result(response, usage, start, first_token, end, retries) -> dict:
+    """
+    Build the result dict for a successful call from monotonic timestamps.
+
+    ``first_token`` is None for non-streaming calls; throughput is then
+    measured over the whole call instead of the generation phase. Batch
+    results have no timestamps and report no latency.
+    """
+    output_tokens = usage['output_tokens']
+    timing = {'latency_ms': None, 'ttft_ms': None, 'tokens_per_sec': None}
+    if start is not None:
+        generation_seconds = end - (first_token if first_token is not None else start)
+        timing = {
+            'latency_ms': round((end - start) * 1000, 2),
+            'ttft_ms': round((first_token - start) * 1000, 2) if first_token is not None else None,
+            'tokens_per_sec': round(output_tokens / generation_seconds, 2) if generation_seconds > 0 else None,
+        }
+    return {
+        'response': response,
+        'tokens_used': usage['input_tokens'] + output_tokens,
+        **usage,
+        **timing,
+        'retries': retries,
+        'error': None
+    }
+
+
+def _append_preview(preview: str, text: str) -> str:
+    """Extend a response preview without keeping more than the report needs."""
+    if text and len(preview) < RESPONSE_PREVIEW_CHARS:
+        preview += text[:RESPONSE_PREVIEW_CHARS - len(preview)]
+    return preview
+
+
+class BatchRequest(NamedTuple):
+    """One call submitted through a provider's batch API."""
+    custom_id: str
+    system_prompt: str
+    user_query: str
+    model: str
+    max_tokens: int
+
+
+class ProviderAdapter:
+    """
+    Common interface for a model provider.
+
+    Subclasses implement ``_create`` for one call attempt; ``call`` adds the
+    shared rate limiting, retries and error handling. Results are dicts with
+    'response', 'tokens_used', 'input_tokens', 'output_tokens',
+    'cache_read_tokens', 'cache_write_tokens', 'latency_ms', 'ttft_ms',
+    'tokens_per_sec', 'retries' and 'error' fields.
+
+    Adapters with a batch API override ``_run_batch``; the default runs the
+    requests one by one.
+    """
+
+    name = None
+    default_model = None
+    api_key_env = None
+    package = None
+
+    def call(self, system_prompt: str, user_query: str, model: str = None,
+             max_tokens: int = 1024, stream: bool = False, prompt_caching: bool = False) -> dict:
+        """Call the provider once (with retries) and return a result dict."""
+        model = model or self.default_model
+        try:
+            timed, retries = limited_call(
+                self.name,
+                lambda: self._create(system_prompt, user_query, model, max_tokens, stream, prompt_caching),
+                estimate_tokens(system_prompt, user_query) + max_tokens,
+                usage_tokens=lambda t: t[1]['input_tokens'] + t[1]['output_tokens'],
+            )
+            return timed_result(*timed, retries)
+        except ImportError:
+            return failed_result(f'{self.package or self.name} package not installed')
+        except Exception as e:
+            return failed_result(str(e))
+
+    def call_batch(self, requests: list, prompt_caching: bool = False) -> dict:
+        """
+        Run many calls through the provider's batch API.
+
+        Returns:
+            dict: {custom_id: result dict}. A failed batch fails every request.
+        """
+        try:
+            results = self._run_batch(requests, prompt_caching)
+        except ImportError:
+            error = f'{self.package or self.name} package not installed'
+            results = {request.custom_id: failed_result(error) for request in requests}
+        except Exception as e:
+            results = {request.custom_id: failed_result(str(e)) for request in requests}
+        for result in results.values():
+            result['batch'] = True
+        return results
+
+    def _run_batch(self, requests, prompt_caching):
+        return {
+            request.custom_id: self.call(
+                request.system_prompt, request.user_query, request.model, request.max_tokens,
+                prompt_caching=prompt_caching,
+            )
+            for request in requests
+        }
+
+    def _create(self, system_prompt, user_query, model, max_tokens, stream, prompt_caching):
+        """
+        Make one API call.
+
+        Returns:
+            tuple: (response preview, usage dict from ``make_usage``, start,
+            first-token time or None, end) using ``time.perf_counter``.
+        """
+        raise NotImplementedError
+
+    def has_credentials(self) -> bool:
+        """True if the provider's API key is configured (or none is needed)."""
+        if not self.api_key_env:
+            return True
+        key = os.getenv(self.api_key_env)
+        return bool(key) and key != 'your-key-here'
+
+
+def _poll(fetch, done, sleep=time.sleep):
+    """Call ``fetch`` until ``done(result)``, waiting BATCH_POLL_SECONDS between checks."""
+    while True:
+        result, _ = call_with_retry(fetch)
+        if done(result):
+            return result
+        sleep(BATCH_POLL_SECONDS)
+
+
+class AnthropicAdapter(ProviderAdapter):
+    """
+    Anthropic Messages API. Streaming consumes server-sent events.
+
+    With prompt caching the system prompt is sent as a text block marked
+    ``cache_control: ephemeral``, so repeated calls with the same system
+    prompt read it from the cache.
+    """
+
+    name = 'anthropic'
+    default_model = 'claude-sonnet-4-20250514'
+    api_key_env = 'ANTHROPIC_API_KEY'
+    package = 'anthropic'
+
+    @staticmethod
+    def _params(system_prompt, user_query, model, max_tokens, prompt_caching):
+        system = system_prompt
+        if prompt_caching:
+            system = [{"type": "text", "text": system_prompt, "cache_control": {"type": "ephemeral"}}]
+        return {
+            'model': model,
+            'max_tokens': max_tokens,
+            'system': system,
+            'messages': [
+                {"role": "user", "content": user_query}
+            ]
+        }
+
+    @staticmethod
+    def _usage(usage, output_tokens=None):
+        cache_read = getattr(usage, 'cache_read_input_tokens', None) or 0
+        cache_write = getattr(usage, 'cache_creation_input_tokens', None) or 0
+        return make_usage(
+            usage.input_tokens + cache_read + cache_write,
+            usage.output_tokens if output_tokens is None else output_tokens,
+            cache_read,
+            cache_write,
+        )
+
+    def _create(self, system_prompt, user_query, model, max_tokens, stream, prompt_caching):
+        client = get_client(self.name)
+        request = self._params(system_prompt, user_query, model, max_tokens, prompt_caching)
+        start = time.perf_counter()
+        if not stream:
+            message = client.messages.create(**request)
+            return message.content[0].text, self._usage(message.usage), start, None, time.perf_counter()
+
+        preview, first_token = '', None
+        usage = make_usage()
+        for event in client.messages.create(stream=True, **request):
+            if event.type == 'message_start':
+                usage = self._usage(event.message.usage, output_tokens=0)
+            elif event.type == 'content_block_delta' and event.delta.type == 'text_delta':
+                if first_token is None:
+                    first_token = time.perf_counter()
+                preview = _append_preview(preview, event.delta.text)
+            elif event.type == 'message_delta':
+                usage['output_tokens'] = event.usage.output_tokens
+        return preview, usage, start, first_token, time.perf_counter()
+
+    def _run_batch(self, requests, prompt_caching):
+        client = get_client(self.name)
+        batch, _ = call_with_retry(lambda: client.messages.batches.create(requests=[
+            {
+                'custom_id': request.custom_id,
+                'params': self._params(request.system_prompt, request.user_query, request.model,
+                                       request.max_tokens, prompt_caching),
+            }
+            for request in requests
+        ]))
+        _poll(lambda: client.messages.batches.retrieve(batch.id), lambda b: b.processing_status == 'ended')
+
+        results = {}
+        for item in client.messages.batches.results(batch.id):
+            if item.result.type == 'succeeded':
+                message = item.result.message
+                results[item.custom_id] = timed_result(
+                    message.content[0].text, self._usage(message.usage), None, None, None, 0
+                )
+            else:
+                error = getattr(item.result, 'error', None)
+                results[item.custom_id] = failed_result(str(error) if error else item.result.type)
+        return results
+
+
+class OpenAIAdapter(ProviderAdapter):
+    """
+    OpenAI Chat Completions API. Streaming consumes chunks with usage.
+
+    OpenAI caches long prompt prefixes automatically; the cached part is
+    reported from ``usage.prompt_tokens_details``.
+    """
+
+    name = 'openai'
+    default_model = 'gpt-4o'
+    api_key_env = 'OPENAI_API_KEY'
+    package = 'openai'
+
+    @staticmethod
+    def _params(system_prompt, user_query, model, max_tokens):
+        return {
+            'model': model,
+            'max_tokens': max_tokens,
+            'messages': [
+                {"role": "system", "content": system_prompt},
+                {"role": "user", "content": user_query}
+            ]
+        }
+
+    @staticmethod
+    def _usage(usage):
+        if not usage:
+            return make_usage()
+        details = getattr(usage, 'prompt_tokens_details', None)
+        if isinstance(details, dict):
+            cached = details.get('cached_tokens')
+        else:
+            cached = getattr(details, 'cached_tokens', None)
+        return make_usage(usage.prompt_tokens, usage.completion_tokens, cached or 0)
+
+    def _create(self, system_prompt, user_query, model, max_tokens, stream, prompt_caching):
+        client = get_client(self.name)
+        request = self._params(system_prompt, user_query, model, max_tokens)
+        start = time.perf_counter()
+        if not stream:
+            response = client.chat.completions.create(**request)
+            return (response.choices[0].message.content, self._usage(response.usage),
+                    start, None, time.perf_counter())
+
+        preview, first_token = '', None
+        usage = make_usage()
+        chunks = client.chat.completions.create(
+            stream=True, stream_options={'include_usage': True}, **request
+        )
+        for chunk in chunks:
+            if chunk.choices and chunk.choices[0].delta.content:
+                if first_token is None:
+                    first_token = time.perf_counter()
+                preview = _append_preview(preview, chunk.choices[0].delta.content)
+            if chunk.usage:
+                usage = self._usage(chunk.usage)
+        return preview, usage, start, first_token, time.perf_counter()
+
+    def _run_batch(self, requests, prompt_caching):
+        client = get_client(self.name)
+        lines = [
+            json.dumps({
+                'custom_id': request.custom_id,
+                'method': 'POST',
+                'url': '/v1/chat/completions',
+                'body': self._params(request.system_prompt, request.user_query, request.model, request.max_tokens),
+            })
+            for request in requests
+        ]
+        upload, _ = call_with_retry(lambda: client.files.create(
+            file=('batch.jsonl', '\n'.join(lines).encode('utf-8')), purpose='batch'
+        ))
+        batch, _ = call_with_retry(lambda: client.batches.create(
+            input_file_id=upload.id, endpoint='/v1/chat/completions', completion_window='24h'
+        ))
+        batch = _poll(
+            lambda: client.batches.retrieve(batch.id),
+            lambda b: b.status in ('completed', 'failed', 'expired', 'cancelled'),
+        )
+        if not batch.output_file_id:
+            raise RuntimeError(f'batch {batch.id} {batch.status}')
+
+        results = {}
+        for line in client.files.content(batch.output_file_id).text.splitlines():
+            item = json.loads(line)
+            response = item.get('response') or {}
+            if item.get('error') or response.get('status_code') != 200:
+                results[item['custom_id']] = failed_result(str(item.get('error') or response.get('body')))
+                continue
+            body = response['body']
+            usage = body.get('usage') or {}
+            details = usage.get('prompt_tokens_details') or {}
+            results[item['custom_id']] = timed_result(
+                body['choices'][0]['message']['content'],
+                make_usage(usage.get('prompt_tokens', 0), usage.get('completion_tokens', 0),
+                           details.get('cached_tokens') or 0),
+                None, None, None, 0,
+            )
+        for request in requests:
+            results.setdefault(request.custom_id, failed_result('missing from batch output'))
+        return results
+
+
+class MockAdapter(ProviderAdapter):
+    """
+    Deterministic local provider for offline runs and tests.
+
+    The response, token counts and simulated timings are derived from a hash
+    of (model, system prompt, query, max_tokens), so repeated runs produce
+    identical reports. Timings are simulated rather than slept unless
+    ``latency_scale`` is set, which sleeps that fraction of the simulated
+    latency to exercise the concurrency limits. With prompt caching, the
+    first call per (model, system prompt) writes the cache once it completes
+    and later calls read it, which shortens their simulated time-to-first-token.
+    """
+
+    name = 'mock'
+    default_model = 'mock-small'
+
+    # Simulated latency model: fixed overhead plus per-token costs, in ms
+    BASE_LATENCY_MS = 200.0
+    INPUT_MS_PER_TOKEN = 0.02
+    OUTPUT_MS_PER_TOKEN = {'mock-small': 5.0, 'mock-large': 20.0}
+
+    def __init__(self, latency_scale=0.0, error_rate=0.0):
+        self.latency_scale = latency_scale
+        self.error_rate = error_rate
+        self._prompt_cache = set()
+        self._lock = threading.Lock()
+
+    def _create(self, system_prompt, user_query, model, max_tokens, stream, prompt_caching):
+        digest = hashlib.sha256(
+            '\0'.join([model, system_prompt, user_query, str(max_tokens)]).encode('utf-8')
+        ).digest()
+        seed = int.from_bytes(digest[:8], 'big')
+        if self.error_rate and (seed % 10_000) / 10_000 < self.error_rate:
+            raise RuntimeError(f'mock error for {model}')
+
+        input_tokens = estimate_tokens(system_prompt, user_query)
+        cache_read = cache_write = 0
+        if prompt_caching:
+            prefix = (model, hashlib.sha256(system_prompt.encode('utf-8')).hexdigest())
+            with self._lock:
+                cached = prefix in self._prompt_cache
+            if cached:
+                cache_read = estimate_tokens(system_prompt)
+            else:
+                cache_write = estimate_tokens(system_prompt)
+        output_tokens = max(1, min(max_tokens, 32 + seed % 512))
+        ttft_ms = self.BASE_LATENCY_MS + (input_tokens - cache_read) * self.INPUT_MS_PER_TOKEN
+        latency_ms = ttft_ms + output_tokens * self.OUTPUT_MS_PER_TOKEN.get(model, 10.0)
+        if self.latency_scale:
+            time.sleep(latency_ms * self.latency_scale / 1000)
+        if cache_write:
+            with self._lock:
+                self._prompt_cache.add(prefix)
+
+        response = f'[{model}] {digest.hex()} ' + user_query
+        usage = make_usage(input_tokens, output_tokens, cache_read, cache_write)
+        first_token = ttft_ms / 1000 if stream else None
+        return response[:RESPONSE_PREVIEW_CHARS], usage, 0.0, first_token, latency_ms / 1000
+
+
+PROVIDER_ADAPTERS = {}
+
+
+def register_provider(adapter):
+    """Register a provider adapter under its ``name``, replacing any previous one."""
+    PROVIDER_ADAPTERS[adapter.name] = adapter
+    return adapter
+
+
+def get_provider(name):
+    """Return the registered adapter for a provider name."""
+    try:
+        return PROVIDER_ADAPTERS[name]
+    except KeyError:
+        raise ValueError(f"Unknown provider: {name}") from None
+
+
+for _adapter in (AnthropicAdapter(), OpenAIAdapter(), MockAdapter()):
+    register_provider(_adapter)
@@ -0,0 +1,460 @@
+"""
+Kearney AI Skills - Validation Report Writer
+
+Streams validation rows to CSV and JSONL as soon as they complete, so an
+interrupted run keeps everything finished so far, and reads existing
+reports back for ``--resume``.
+"""
+
+import csv
+import json
+import math
+import os
+from collections import Counter, defaultdict
+from pathlib import Path
+
+# Columns whose CSV string values are converted back to numbers/booleans
+INT_SUFFIXES = ('_tokens', '_retries')
+BOOL_SUFFIXES = ('_cached',)
+FLOAT_SUFFIXES = ('_latency_ms', '_ttft_ms', '_tokens_per_sec', '_cost_usd')
+
+# Per-call metrics aggregated into percentiles for the latency report
+LATENCY_METRICS = ('latency_ms', 'ttft_ms', 'tokens_per_sec')
+PERCENTILES = (50, 95, 99)
+
+
+def jsonl_path_for(csv_path) -> Path:
+    """Return the JSONL report path that accompanies a CSV report."""
+    return Path(csv_path).with_suffix('.jsonl')
+
+
+def latency_path_for(csv_path) -> Path:
+    """Return the latency percentile report path that accompanies a CSV report."""
+    csv_path = Path(csv_path)
+    return csv_path.with_name(f'{csv_path.stem}_latency.csv')
+
+
+def benchmark_path_for(csv_path) -> Path:
+    """Return the benchmark table path that accompanies a CSV report."""
+    csv_path = Path(csv_path)
+    return csv_path.with_name(f'{csv_path.stem}_benchmark.csv')
+
+
+def percentile(values: list, pct: float) -> float:
+    """Linearly interpolated percentile of a list of numbers."""
+    ordered = sorted(values)
+    if not ordered:
+        return None
+    rank = (len(ordered) - 1) * pct / 100
+    low = int(rank)
+    high = min(low + 1, len(ordered) - 1)
+    return ordered[low] + (ordered[high] - ordered[low]) * (rank - low)
+
+
+class QuantileSketch:
+    """
+    Fixed-size percentile estimator for a stream of non-negative values.
+
+    The first ``exact_limit`` values are kept as they are, so small runs
+    report exact percentiles. Beyond that they are folded into logarithmic
+    buckets ``GROWTH`` apart, which bounds memory by the range of the values
+    rather than their number at a relative error under 1%.
+    """
+
+    GROWTH = 1.02
+
+    def __init__(self, exact_limit=1024):
+        self.exact_limit = exact_limit
+        self.count = 0
+        self.min = None
+        self.max = None
+        self._values = []
+        self._buckets = None
+
+    def __len__(self):
+        return self.count
+
+    def _bucket(self, value):
+        return math.floor(math.log(value, self.GROWTH)) if value > 0 else None
+
+    def _add_to_bucket(self, value):
+        bucket = self._bucket(value)
+        self._buckets[bucket] = self._buckets.get(bucket, 0) + 1
+
+    def add(self, value):
+        self.count += 1
+        self.min = value if self.min is None else min(self.min, value)
+        self.max = value if self.max is None else max(self.max, value)
+        if self._buckets is None:
+            self._values.append(value)
+            if len(self._values) <= self.exact_limit:
+                return
+            self._buckets = {}
+            for kept in self._values:
+                self._add_to_bucket(kept)
+            self._values = None
+        else:
+            self._add_to_bucket(value)
+
+    def percentile(self, pct: float) -> float:
+        """Percentile of the values added, as ``percentile`` would compute it."""
+        if self._buckets is None:
+            return percentile(self._values, pct)
+        rank = (self.count - 1) * pct / 100
+        seen = 0
+        # Values <= 0 share the None bucket and sort first
+        for bucket in sorted(self._buckets, key=lambda b: -math.inf if b is None else b):
+            seen += self._buckets[bucket]
+            if seen > rank:
+                value = 0.0 if bucket is None else self.GROWTH ** (bucket + 0.5)
+                return min(max(value, self.min), self.max)
+        return self.max
+
+
+def row_key(row: dict) -> tuple:
+    """Identify a report row by (prompt_file, test_id, max_tokens)."""
+    return (row['prompt_file'], row['test_id'], row.get('max_tokens'))
+
+
+def _coerce_csv_row(row: dict) -> dict:
+    """Convert CSV string values back to the types written by the suite."""
+    coerced = {}
+    for name, value in row.items():
+        if value == '':
+            value = None
+        elif name.endswith(INT_SUFFIXES):
+            value = int(float(value))
+        elif name.endswith(FLOAT_SUFFIXES):
+            value = float(value)
+        elif name.endswith(BOOL_SUFFIXES):
+            value = value == 'True'
+        coerced[name] = value
+    return coerced
+
+
+def iter_report(csv_path):
+    """
+    Yield the rows of an existing report, oldest first.
+
+    Reads the JSONL sibling when present (it keeps value types) and falls
+    back to the CSV. Yields nothing if neither file exists.
+    """
+    jsonl_path = jsonl_path_for(csv_path)
+    if jsonl_path.exists():
+        with open(jsonl_path, 'r', encoding='utf-8') as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    yield json.loads(line)
+                except json.JSONDecodeError:
+                    # A run killed mid-write can leave a truncated last line
+                    continue
+    elif Path(csv_path).exists():
+        with open(csv_path, 'r', newline='', encoding='utf-8') as f:
+            for row in csv.DictReader(f):
+                yield _coerce_csv_row(row)
+
+
+def load_latest_rows(csv_path) -> dict:
+    """Return the most recent row for each (prompt_file, test_id, max_tokens)."""
+    return {row_key(row): row for row in iter_report(csv_path)}
+
+
+def _ensure_jsonl(csv_path):
+    """Write the JSONL sibling of a CSV-only report, so rows can be read back by offset."""
+    jsonl_path = jsonl_path_for(csv_path)
+    if jsonl_path.exists() or not Path(csv_path).exists():
+        return
+    tmp = jsonl_path.with_name(jsonl_path.name + '.tmp')
+    with open(tmp, 'w', encoding='utf-8') as f:
+        for row in iter_report(csv_path):
+            f.write(json.dumps(row, default=str) + '\n')
+    os.replace(tmp, jsonl_path)
+
+
+def _latest_offsets(csv_path, on_row=None) -> dict:
+    """
+    Return the JSONL offset of the most recent row for each matrix cell.
+
+    Rows are streamed, and ``on_row(key, row)`` (if given) sees each one,
+    so only the offsets are kept in memory.
+    """
+    _ensure_jsonl(csv_path)
+    offsets = {}
+    jsonl_path = jsonl_path_for(csv_path)
+    if not jsonl_path.exists():
+        return offsets
+    with open(jsonl_path, 'rb') as f:
+        while True:
+            offset = f.tell()
+            line = f.readline()
+            if not line:
+                break
+            try:
+                row = json.loads(line)
+            except json.JSONDecodeError:
+                # Blank, or truncated by a run killed mid-write
+                continue
+            key = row_key(row)
+            offsets[key] = offset
+            if on_row is not None:
+                on_row(key, row)
+    return offsets
+
+
+def _read_row(jsonl_file, offset) -> dict:
+    jsonl_file.seek(offset)
+    return json.loads(jsonl_file.readline())
+
+
+class CompletedRows:
+    """
+    What an existing report already holds, for ``--resume``.
+
+    Only the targets that succeeded in the latest row of each matrix cell
+    and that row's JSONL offset are kept in memory; a row is read back when
+    its columns are carried over into the resumed run.
+
+    Args:
+        csv_path: The report.
+        succeeded: Function returning the target labels a row succeeded for.
+    """
+
+    def __init__(self, csv_path, succeeded):
+        self.jsonl_path = jsonl_path_for(csv_path)
+        self._succeeded = {}
+        intern = {}
+
+        def record(key, row):
+            labels = frozenset(succeeded(row))
+            self._succeeded[key] = intern.setdefault(labels, labels)
+
+        self._offsets = _latest_offsets(csv_path, record)
+
+    def __len__(self):
+        return len(self._offsets)
+
+    def succeeded(self, key) -> frozenset:
+        """Labels of the targets that succeeded for a matrix cell."""
+        return self._succeeded.get(key, frozenset())
+
+    def row(self, key) -> dict:
+        """Read back the latest row of a matrix cell, or None."""
+        offset = self._offsets.get(key)
+        if offset is None:
+            return None
+        with open(self.jsonl_path, 'rb') as f:
+            return _read_row(f, offset)
+
+
+class ReportWriter:
+    """
+    Append-only CSV + JSONL writer.
+
+    Every row is flushed as it is written. With ``append=True`` the files are
+    extended rather than truncated; later rows supersede earlier rows for the
+    same (prompt_file, test_id, max_tokens) until ``compact_report`` is called.
+
+    Raises:
+        ValueError: If appending to a CSV whose header has other columns.
+    """
+
+    def __init__(self, csv_path, fieldnames, append=False):
+        self.csv_path = Path(csv_path)
+        self.jsonl_path = jsonl_path_for(csv_path)
+        self.fieldnames = fieldnames
+        self.rows_written = 0
+
+        write_header = not (append and self.csv_path.exists() and self.csv_path.stat().st_size)
+        if not write_header:
+            with open(self.csv_path, 'r', newline='', encoding='utf-8') as f:
+                header = next(csv.reader(f), [])
+            if header != list(fieldnames):
+                raise ValueError(
+                    f"{self.csv_path} has different columns than this run "
+                    f"(e.g. other --models); cannot append to it"
+                )
+            _ensure_jsonl(self.csv_path)
+        mode = 'a' if append else 'w'
+        self._csv_file = open(self.csv_path, mode, newline='', encoding='utf-8')
+        self._jsonl_file = open(self.jsonl_path, mode, encoding='utf-8')
+        self._csv = csv.DictWriter(self._csv_file, fieldnames=fieldnames, extrasaction='ignore')
+        if write_header:
+            self._csv.writeheader()
+
+    def write(self, row: dict):
+        """Write one row to both files and flush them."""
+        self._csv.writerow(row)
+        self._jsonl_file.write(json.dumps(row, default=str) + '\n')
+        self._csv_file.flush()
+        self._jsonl_file.flush()
+        self.rows_written += 1
+
+    def close(self):
+        self._csv_file.close()
+        self._jsonl_file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def compact_report(csv_path, fieldnames, order=None):
+    """
+    Rewrite a report so it holds only the latest row per matrix cell.
+
+    Rows are ordered by ``order`` (a list of keys) first, then any remaining
+    keys in their original order. Only row offsets are held in memory; the
+    rows are copied from the JSONL report. Files are replaced atomically.
+    """
+    latest = _latest_offsets(csv_path)
+    keys = [key for key in (order or []) if key in latest]
+    seen = set(keys)
+    keys += [key for key in latest if key not in seen]
+
+    csv_path = Path(csv_path)
+    tmp_csv = csv_path.with_name(csv_path.name + '.tmp')
+    with open(jsonl_path_for(csv_path), 'rb') as source, ReportWriter(tmp_csv, fieldnames) as writer:
+        for key in keys:
+            writer.write(_read_row(source, latest[key]))
+    os.replace(tmp_csv, csv_path)
+    os.replace(jsonl_path_for(tmp_csv), jsonl_path_for(csv_path))
+
+
+class ReportSummary:
+    """
+    Running totals for the end-of-run summary, kept without storing rows.
+
+    Per-call latency metrics are collected per target and per
+    (prompt, target) so the p50/p95/p99 report can separate slow prompts
+    from slow providers. They go into QuantileSketches, so memory follows
+    the number of prompts and targets, not the number of calls. Cached responses are excluded from the latency
+    metrics but still count towards the token and cost totals of the
+    benchmark table, which compares targets per max_tokens budget.
+    """
+
+    def __init__(self, providers):
+        self.providers = list(providers)
+        self.total = 0
+        self.statuses = Counter()
+        self.provider_calls = 0
+        self.cache_hits = 0
+        self.samples = defaultdict(QuantileSketch)
+        self.benchmarks = {}
+
+    def _benchmark(self, provider, row):
+        key = (provider, row.get('max_tokens'))
+        bench = self.benchmarks.get(key)
+        if bench is None:
+            bench = self.benchmarks[key] = {
+                'model': row.get(f'{provider}_model'), 'calls': 0, 'errors': 0, 'cached': 0,
+                'input_tokens': 0, 'output_tokens': 0, 'cache_read_tokens': 0, 'cache_write_tokens': 0,
+                'cost_usd': 0.0, 'priced': True,
+                'samples': defaultdict(QuantileSketch),
+            }
+        return bench
+
+    def add(self, row: dict):
+        self.total += 1
+        self.statuses[row.get('status')] += 1
+        if row.get('status') == 'DRY_RUN':
+            return
+        for provider in self.providers:
+            self.provider_calls += 1
+            bench = self._benchmark(provider, row)
+            bench['calls'] += 1
+            if row.get(f'{provider}_error'):
+                bench['errors'] += 1
+                continue
+            bench['input_tokens'] += row.get(f'{provider}_input_tokens') or 0
+            bench['output_tokens'] += row.get(f'{provider}_output_tokens') or 0
+            bench['cache_read_tokens'] += row.get(f'{provider}_cache_read_tokens') or 0
+            bench['cache_write_tokens'] += row.get(f'{provider}_cache_write_tokens') or 0
+            cost = row.get(f'{provider}_cost_usd')
+            if cost is None:
+                bench['priced'] = False
+            else:
+                bench['cost_usd'] += cost
+            if row.get(f'{provider}_cached'):
+                self.cache_hits += 1
+                bench['cached'] += 1
+                continue
+            for metric in LATENCY_METRICS:
+                value = row.get(f'{provider}_{metric}')
+                if value is not None:
+                    self.samples[('provider', provider, provider, metric)].add(value)
+                    self.samples[('prompt', row['prompt_file'], provider, metric)].add(value)
+                    bench['samples'][metric].add(value)
+
+    def percentile_rows(self) -> list:
+        """Return one row per (scope, name, provider, metric) with percentiles."""
+        rows = []
+        for (scope, name, provider, metric), values in sorted(self.samples.items()):
+            row = {'scope': scope, 'name': name, 'provider': provider, 'metric': metric, 'count': len(values)}
+            for pct in PERCENTILES:
+                row[f'p{pct}'] = round(values.percentile(pct), 2)
+            rows.append(row)
+        return rows
+
+    def write_latency_report(self, path):
+        """Write the percentile rows to a CSV file."""
+        fieldnames = ['scope', 'name', 'provider', 'metric', 'count'] + [f'p{pct}' for pct in PERCENTILES]
+        with open(path, 'w', newline='', encoding='utf-8') as f:
+            writer = csv.DictWriter(f, fieldnames=fieldnames)
+            writer.writeheader()
+            writer.writerows(self.percentile_rows())
+
+    def benchmark_rows(self) -> list:
+        """Return one comparative row per (target, max_tokens)."""
+
+        def pct(values, p):
+            return round(values.percentile(p), 2) if values else None
+
+        rows = []
+        for (provider, max_tokens), bench in self.benchmarks.items():
+            samples = bench['samples']
+            succeeded = bench['calls'] - bench['errors']
+            total_cost = round(bench['cost_usd'], 6) if bench['priced'] and succeeded else None
+            rows.append({
+                'label': provider,
+                'model': bench['model'],
+                'max_tokens': max_tokens,
+                'calls': bench['calls'],
+                'errors': bench['errors'],
+                'cached': bench['cached'],
+                'p50_latency_ms': pct(samples['latency_ms'], 50),
+                'p95_latency_ms': pct(samples['latency_ms'], 95),
+                'p50_ttft_ms': pct(samples['ttft_ms'], 50),
+                'p50_tokens_per_sec': pct(samples['tokens_per_sec'], 50),
+                'avg_input_tokens': round(bench['input_tokens'] / succeeded, 1) if succeeded else 0,
+                'avg_output_tokens': round(bench['output_tokens'] / succeeded, 1) if succeeded else 0,
+                'total_tokens': bench['input_tokens'] + bench['output_tokens'],
+                'cache_read_tokens': bench['cache_read_tokens'],
+                'cache_write_tokens': bench['cache_write_tokens'],
+                'total_cost_usd': total_cost,
+                'cost_per_call_usd': round(total_cost / succeeded, 6) if total_cost is not None else None,
+            })
+        rows.sort(key=lambda r: (r['label'], r['max_tokens'] or 0))
+        return rows
+
+    def prompt_cache_rows(self) -> list:
+        """Return input tokens read from / written to the provider prompt cache per target."""
+        totals = {}
+        for (provider, _), bench in self.benchmarks.items():
+            counts = totals.setdefault(provider, Counter())
+            for name in ('input_tokens', 'cache_read_tokens', 'cache_write_tokens'):
+                counts[name] += bench[name]
+        return [{'label': provider, **counts} for provider, counts in sorted(totals.items())]
+
+    def write_benchmark_report(self, path):
+        """Write the benchmark table to a CSV file."""
+        rows = self.benchmark_rows()
+        fieldnames = list(rows[0]) if rows else ['label']
+        with open(path, 'w', newline='', encoding='utf-8') as f:
+            writer = csv.DictWriter(f, fieldnames=fieldnames)
+            writer.writeheader()
+            writer.writerows(rows)
@@ -0,0 +1,92 @@
+"""
+Kearney AI Skills - Validation Response Cache
+
+Content-addressed SQLite cache of provider responses. Entries are keyed by
+a hash of (provider, model, system prompt content, test query, max_tokens),
+so re-running the suite only calls the APIs for prompts or tests that
+actually changed.
+"""
+
+import hashlib
+import json
+import sqlite3
+import sys
+import threading
+from datetime import datetime
+from pathlib import Path
+
+ROOT_DIR = Path(__file__).parent.parent
+APP_DIR = ROOT_DIR / 'app'
+
+# Prompt bodies are hashed exactly as the catalog (``file_hashes``) and the
+# content store hash them, so cached responses match recorded versions
+sys.path.insert(0, str(APP_DIR))
+
+from catalog import content_hash
+
+
+def make_key(provider: str, model: str, system_prompt: str, user_query: str, max_tokens: int) -> str:
+    """Build the cache key for one provider call."""
+    payload = json.dumps([provider, model, content_hash(system_prompt), user_query, max_tokens])
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+class ResponseCache:
+    """
+    Thread-safe on-disk cache of successful provider results.
+
+    Only results without an error are stored, so failed calls are always
+    retried on the next run.
+    """
+
+    def __init__(self, path):
+        self.path = str(path)
+        self.stats = {'hits': 0, 'misses': 0, 'writes': 0}
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.execute(
+            'CREATE TABLE IF NOT EXISTS responses ('
+            ' key TEXT PRIMARY KEY,'
+            ' provider TEXT NOT NULL,'
+            ' model TEXT NOT NULL,'
+            ' created_at TEXT NOT NULL,'
+            ' result TEXT NOT NULL)'
+        )
+        self._conn.commit()
+
+    def get(self, key: str):
+        """Return the cached result dict for a key, or None."""
+        with self._lock:
+            row = self._conn.execute('SELECT result FROM responses WHERE key = ?', (key,)).fetchone()
+            if row is None:
+                self.stats['misses'] += 1
+                return None
+            self.stats['hits'] += 1
+        return json.loads(row[0])
+
+    def contains(self, key: str) -> bool:
+        """True if a result is cached for a key. Does not count as a hit or miss."""
+        with self._lock:
+            return self._conn.execute('SELECT 1 FROM responses WHERE key = ?', (key,)).fetchone() is not None
+
+    def put(self, key: str, provider: str, model: str, result: dict):
+        """Store a successful result. Results with an error are ignored."""
+        if result.get('error'):
+            return
+        with self._lock:
+            self._conn.execute(
+                'INSERT OR REPLACE INTO responses (key, provider, model, created_at, result) '
+                'VALUES (?, ?, ?, ?, ?)',
+                (key, provider, model, datetime.now().isoformat(), json.dumps(result)),
+            )
+            self._conn.commit()
+            self.stats['writes'] += 1
+
+    def __len__(self):
+        with self._lock:
+            return self._conn.execute('SELECT COUNT(*) FROM responses').fetchone()[0]
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
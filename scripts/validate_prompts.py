@@ -4,15 +4,19 @@ Kearney AI Skills - Prompt Validation Suite
 
 This script validates prompts by running standardized test queries against
 both Anthropic and OpenAI APIs, generating a comprehensive validation report.
+With --models and --max-tokens it sweeps a matrix of models and output
+budgets and adds a comparative latency/cost/token benchmark table.
 """
 
-import os
 import sys
-import csv
-import json
-import glob
+import re
+import threading
+from collections import Counter
+from itertools import islice
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
 from datetime import datetime
 from pathlib import Path
+from typing import NamedTuple
 
 # Add parent directory to path for imports
 sys.path.insert(0, str(Path(__file__).parent.parent))
@@ -22,13 +26,29 @@ from dotenv import load_dotenv
 # Load environment variables from .env file
 load_dotenv(Path(__file__).parent.parent / '.env')
 
+from scripts.preflight import Plan, build_plan, count_tokens, print_plan
+from scripts.providers import (
+    PROVIDER_ADAPTERS, RESPONSE_PREVIEW_CHARS, BatchRequest, configure_rate_limits, estimate_cost,
+    get_provider,
+)
+from scripts.report_writer import (
+    CompletedRows, ReportSummary, ReportWriter, benchmark_path_for, compact_report, latency_path_for,
+)
+from scripts.response_cache import ResponseCache, make_key
+
 
 # Configuration
-ANTHROPIC_API_KEY = os.getenv('ANTHROPIC_API_KEY')
-OPENAI_API_KEY = os.getenv('OPENAI_API_KEY')
 PROMPTS_DIR = Path(__file__).parent.parent / 'prompts'
 OUTPUT_DIR = Path(__file__).parent.parent / 'scripts'
 
+# On-disk cache of provider responses, keyed by prompt content and query
+DEFAULT_CACHE_PATH = OUTPUT_DIR / '.validation_cache.sqlite3'
+
+# Concurrency limits for API calls: a global cap across all providers and a
+# default per-provider cap (override per provider with --provider-concurrency)
+DEFAULT_CONCURRENCY = 8
+DEFAULT_PROVIDER_CONCURRENCY = 4
+
 # Standard Test Queries for Validation
 TEST_QUERIES = [
     {
@@ -64,13 +84,13 @@ TEST_QUERIES = [
 ]
 
 
-def check_api_keys():
-    """Verify that API keys are configured."""
+def check_api_keys(providers=('anthropic', 'openai')):
+    """Verify that API keys are configured for the given providers."""
     missing_keys = []
-    if not ANTHROPIC_API_KEY or ANTHROPIC_API_KEY == 'your-key-here':
-        missing_keys.append('ANTHROPIC_API_KEY')
-    if not OPENAI_API_KEY or OPENAI_API_KEY == 'your-key-here':
-        missing_keys.append('OPENAI_API_KEY')
+    for provider in providers:
+        adapter = get_provider(provider)
+        if not adapter.has_credentials():
+            missing_keys.append(adapter.api_key_env)
 
     return missing_keys
 
@@ -78,7 +98,7 @@ def check_api_keys():
 def load_prompt_files():
     """Load all .txt files from the prompts directory."""
     prompt_files = []
-    for filepath in PROMPTS_DIR.glob('*.txt'):
+    for filepath in sorted(PROMPTS_DIR.glob('*.txt')):
         with open(filepath, 'r', encoding='utf-8') as f:
             content = f.read()
         prompt_files.append({
@@ -86,211 +106,520 @@ def load_prompt_files():
             'filepath': str(filepath),
             'content': content,
             'size_bytes': len(content.encode('utf-8')),
-            'line_count': len(content.splitlines())
+            'line_count': len(content.splitlines()),
+            'estimated_tokens': count_tokens(content)
         })
     return prompt_files
 
 
-def call_anthropic_api(system_prompt: str, user_query: str) -> dict:
-    """
-    Call Anthropic's Claude API with the given prompt and query.
+# Default output token budget per call (sweep several with --max-tokens)
+MAX_TOKENS = 1024
 
-    Returns a dict with 'response', 'tokens_used', 'latency_ms', and 'error' fields.
-    """
-    try:
-        import anthropic
+# Model used for each provider in the default two-provider comparison
+PROVIDER_MODELS = {
+    'anthropic': 'claude-sonnet-4-20250514',
+    'openai': 'gpt-4o',
+}
 
-        client = anthropic.Anthropic(api_key=ANTHROPIC_API_KEY)
 
-        start_time = datetime.now()
-        message = client.messages.create(
-            model="claude-sonnet-4-20250514",
-            max_tokens=1024,
-            system=system_prompt,
-            messages=[
-                {"role": "user", "content": user_query}
-            ]
-        )
-        latency_ms = (datetime.now() - start_time).total_seconds() * 1000
-
-        return {
-            'response': message.content[0].text,
-            'tokens_used': message.usage.input_tokens + message.usage.output_tokens,
-            'latency_ms': round(latency_ms, 2),
-            'error': None
-        }
-    except ImportError:
-        return {
-            'response': None,
-            'tokens_used': 0,
-            'latency_ms': 0,
-            'error': 'anthropic package not installed'
-        }
-    except Exception as e:
-        return {
-            'response': None,
-            'tokens_used': 0,
-            'latency_ms': 0,
-            'error': str(e)
-        }
-
-
-def call_openai_api(system_prompt: str, user_query: str) -> dict:
+class Target(NamedTuple):
+    """One provider/model combination, reported under ``label`` columns."""
+    label: str
+    provider: str
+    model: str
+
+
+def build_targets(specs: list) -> list:
     """
-    Call OpenAI's GPT API with the given prompt and query.
+    Build targets from PROVIDER[:MODEL] specs.
 
-    Returns a dict with 'response', 'tokens_used', 'latency_ms', and 'error' fields.
+    Providers that appear once are labelled by provider name, so the default
+    anthropic/openai report keeps its column names; providers benchmarked
+    with several models are labelled ``provider_model``.
+
+    Raises:
+        ValueError: For unknown providers or duplicate specs.
     """
-    try:
-        from openai import OpenAI
+    pairs = []
+    for spec in specs:
+        provider, _, model = spec.partition(':')
+        adapter = get_provider(provider)
+        model = model or PROVIDER_MODELS.get(provider) or adapter.default_model
+        if (provider, model) in pairs:
+            raise ValueError(f"Duplicate model: {provider}:{model}")
+        pairs.append((provider, model))
+
+    counts = Counter(provider for provider, _ in pairs)
+    targets = []
+    for provider, model in pairs:
+        label = provider if counts[provider] == 1 else re.sub(r'[^A-Za-z0-9]+', '_', f'{provider}_{model}')
+        targets.append(Target(label, provider, model))
+    return targets
+
+
+# Targets used when no --models are given
+DEFAULT_TARGETS = build_targets(list(PROVIDER_MODELS))
+
+
+# Per-target report columns, prefixed with the target label
+PROVIDER_COLUMNS = [
+    'model', 'response', 'tokens', 'input_tokens', 'cache_read_tokens', 'cache_write_tokens',
+    'output_tokens', 'cost_usd', 'latency_ms', 'ttft_ms', 'tokens_per_sec', 'retries', 'cached', 'error',
+]
 
-        client = OpenAI(api_key=OPENAI_API_KEY)
+# How many (prompt, test, max_tokens) rows may be in flight ahead of the
+# next row to be written, as a multiple of --concurrency. Bounds memory for
+# huge runs.
+ROW_WINDOW_FACTOR = 4
 
-        start_time = datetime.now()
-        response = client.chat.completions.create(
-            model="gpt-4o",
-            max_tokens=1024,
-            messages=[
-                {"role": "system", "content": system_prompt},
-                {"role": "user", "content": user_query}
-            ]
-        )
-        latency_ms = (datetime.now() - start_time).total_seconds() * 1000
-
-        return {
-            'response': response.choices[0].message.content,
-            'tokens_used': response.usage.total_tokens if response.usage else 0,
-            'latency_ms': round(latency_ms, 2),
-            'error': None
-        }
-    except ImportError:
-        return {
-            'response': None,
-            'tokens_used': 0,
-            'latency_ms': 0,
-            'error': 'openai package not installed'
-        }
-    except Exception as e:
-        return {
-            'response': None,
-            'tokens_used': 0,
-            'latency_ms': 0,
-            'error': str(e)
-        }
-
-
-def run_validation(prompt_files: list, dry_run: bool = False) -> list:
+
+def report_fieldnames(targets: list = DEFAULT_TARGETS) -> list:
+    """Return the CSV columns for the given targets."""
+    fieldnames = [
+        'timestamp', 'prompt_file', 'test_id', 'test_name', 'test_query',
+        'evaluation_criteria', 'max_tokens', 'status',
+    ]
+    for target in targets:
+        fieldnames += [f'{target.label}_{column}' for column in PROVIDER_COLUMNS]
+    return fieldnames
+
+
+def _provider_fields(target: Target, provider_result: dict) -> dict:
+    """Map a provider call result onto its report columns."""
+    label = target.label
+    response = provider_result['response']
+    input_tokens = provider_result.get('input_tokens', 0)
+    output_tokens = provider_result.get('output_tokens', 0)
+    cache_read = provider_result.get('cache_read_tokens', 0)
+    cache_write = provider_result.get('cache_write_tokens', 0)
+    cost = None
+    if not provider_result['error']:
+        cost = estimate_cost(target.model, input_tokens, output_tokens, cache_read, cache_write,
+                             batch=provider_result.get('batch', False))
+    return {
+        f'{label}_model': target.model,
+        f'{label}_response': response[:RESPONSE_PREVIEW_CHARS] if response else None,
+        f'{label}_tokens': provider_result['tokens_used'],
+        f'{label}_input_tokens': input_tokens,
+        f'{label}_cache_read_tokens': cache_read,
+        f'{label}_cache_write_tokens': cache_write,
+        f'{label}_output_tokens': output_tokens,
+        f'{label}_cost_usd': cost,
+        f'{label}_latency_ms': provider_result['latency_ms'],
+        f'{label}_ttft_ms': provider_result.get('ttft_ms'),
+        f'{label}_tokens_per_sec': provider_result.get('tokens_per_sec'),
+        f'{label}_retries': provider_result.get('retries', 0),
+        f'{label}_cached': provider_result.get('cached', False),
+        f'{label}_error': provider_result['error'],
+    }
+
+
+def _provider_succeeded(row: dict, label: str) -> bool:
+    """True if a previous report row holds a successful result for a target."""
+    return (
+        row.get('status') != 'DRY_RUN'
+        and not row.get(f'{label}_error')
+        and bool(row.get(f'{label}_response'))
+    )
+
+
+def load_completed(csv_path, targets: list) -> CompletedRows:
+    """Index the targets that already succeeded per row of a report, for --resume."""
+    labels = [target.label for target in targets]
+    return CompletedRows(csv_path, lambda row: [label for label in labels if _provider_succeeded(row, label)])
+
+
+def _resumed_columns(completed, key, targets) -> dict:
+    """Return {label: columns} carried over from a resumed report for one row."""
+    if completed is None:
+        return {}
+    done = [target.label for target in targets if target.label in completed.succeeded(key)]
+    if not done:
+        return {}
+    previous = completed.row(key)
+    return {label: {f'{label}_{c}': previous.get(f'{label}_{c}') for c in PROVIDER_COLUMNS} for label in done}
+
+
+def _row_status(row: dict, labels: list) -> str:
+    """Determine the overall status of a row from its target errors."""
+    failed = [label for label in labels if row.get(f'{label}_error')]
+    if not failed:
+        return 'SUCCESS'
+    if len(failed) == len(labels) and len(labels) > 1:
+        return 'BOTH_FAILED' if len(labels) == 2 else 'ALL_FAILED'
+    if len(failed) == 1:
+        return f'{failed[0].upper()}_FAILED'
+    return 'PARTIAL_FAILED'
+
+
+def _new_row(prompt: dict, test: dict, max_tokens: int) -> dict:
+    return {
+        'timestamp': datetime.now().isoformat(),
+        'prompt_file': prompt['filename'],
+        'test_id': test['id'],
+        'test_name': test['name'],
+        'test_query': test['query'],
+        'evaluation_criteria': test['evaluation_criteria'],
+        'max_tokens': max_tokens,
+    }
+
+
+def run_validation(
+    prompt_files: list,
+    dry_run: bool = False,
+    concurrency: int = DEFAULT_CONCURRENCY,
+    provider_concurrency: dict = None,
+    cache: ResponseCache = None,
+    refresh: bool = False,
+    stream: bool = False,
+    on_result=None,
+    completed: CompletedRows = None,
+    targets: list = None,
+    max_tokens: list = None,
+    max_rows: int = None,
+    prompt_caching: bool = False,
+    batch: bool = False,
+) -> list:
     """
     Run validation tests on all prompt files.
 
+    The run sweeps the matrix of prompts x TEST_QUERIES x ``max_tokens``,
+    with one row per cell and one set of columns per target. Every
+    (row, target) call is an independent job. Jobs run on one thread pool
+    per provider, sized by that provider's concurrency limit, and a global
+    semaphore caps the number of calls in flight. Rows are emitted in
+    matrix order as soon as they and every earlier row are complete, and
+    only a bounded window of rows is held in memory.
+
+    With ``prompt_caching``, jobs are grouped by (system prompt, target):
+    the first call of each group runs alone to write the provider's prompt
+    cache, and the rest of the group is released once it completes, so they
+    read the shared prefix from the cache. A warming call answered from the
+    response cache or failed writes nothing, so the group's next job runs
+    alone in its place. With ``batch``, every uncached
+    call is submitted through the provider batch APIs (one batch per
+    target) and rows are emitted once all batches finish.
+
     Args:
         prompt_files: List of prompt file dictionaries
         dry_run: If True, skip actual API calls
+        concurrency: Maximum API calls in flight across all providers
+        provider_concurrency: Optional {provider: limit} overrides of
+            DEFAULT_PROVIDER_CONCURRENCY
+        cache: Optional ResponseCache; unchanged calls are served from it
+            instead of calling the API
+        refresh: If True, ignore cached responses but still store new ones
+        stream: If True, use streaming calls to record time-to-first-token
+        on_result: Optional callback receiving each finished row. When
+            given, rows are not accumulated and an empty list is returned.
+        completed: Optional CompletedRows of a previous report (see
+            load_completed). Targets that already succeeded for a row are
+            not called again; their columns are carried over.
+        targets: Targets to call (default: DEFAULT_TARGETS)
+        max_tokens: Output token budgets to sweep (default: [MAX_TOKENS])
+        max_rows: Optional limit on the number of matrix rows run, used to
+            trim a plan to its budget
+        prompt_caching: If True, mark system prompts cacheable and warm the
+            cache with one call per group before the rest
+        batch: If True, use the provider batch APIs instead of single calls
 
     Returns:
-        List of validation results
+        List of validation results, one per matrix cell, in matrix order
     """
     results = []
-
-    for prompt in prompt_files:
-        print(f"\n{'='*60}")
-        print(f"Validating: {prompt['filename']}")
-        print(f"  Lines: {prompt['line_count']}, Size: {prompt['size_bytes']} bytes")
-        print(f"{'='*60}")
-
-        for test in TEST_QUERIES:
-            print(f"\n  Running Test {test['id']}: {test['name']}...")
-
-            result = {
-                'timestamp': datetime.now().isoformat(),
-                'prompt_file': prompt['filename'],
-                'test_id': test['id'],
-                'test_name': test['name'],
-                'test_query': test['query'],
-                'evaluation_criteria': test['evaluation_criteria']
-            }
-
-            if dry_run:
-                # Simulate results for dry run
-                result.update({
-                    'anthropic_response': '[DRY RUN - No API call made]',
-                    'anthropic_tokens': 0,
-                    'anthropic_latency_ms': 0,
-                    'anthropic_error': None,
-                    'openai_response': '[DRY RUN - No API call made]',
-                    'openai_tokens': 0,
-                    'openai_latency_ms': 0,
-                    'openai_error': None,
-                    'status': 'DRY_RUN'
-                })
+    emit = on_result or results.append
+    targets = list(targets or DEFAULT_TARGETS)
+    labels = [target.label for target in targets]
+    budgets = list(max_tokens or [MAX_TOKENS])
+    cells = ((prompt, test, budget) for prompt in prompt_files for test in TEST_QUERIES for budget in budgets)
+    if max_rows is not None:
+        cells = islice(cells, max_rows)
+
+    def finish(row, note=''):
+        row['status'] = _row_status(row, labels)
+        print(f"  {row['prompt_file']} {row['test_id']} ({row['test_name']}) "
+              f"max_tokens={row['max_tokens']}: {row['status']}{note}")
+
+    if dry_run:
+        for prompt, test, budget in cells:
+            row = _new_row(prompt, test, budget)
+            # Simulate results for dry run
+            for target in targets:
+                row.update(_provider_fields(target, {
+                    'response': '[DRY RUN - No API call made]',
+                    'tokens_used': 0,
+                    'latency_ms': 0,
+                    'error': None,
+                }))
+                row[f'{target.label}_cost_usd'] = None
+            row['status'] = 'DRY_RUN'
+            print(f"  {row['prompt_file']} {row['test_id']} ({row['test_name']}) max_tokens={budget}: DRY_RUN")
+            emit(row)
+        return results
+
+    if batch:
+        return _run_batches(cells, targets, labels, emit, results, completed, cache, refresh, prompt_caching, finish)
+
+    limits = dict(provider_concurrency or {})
+    in_flight = threading.BoundedSemaphore(max(1, concurrency))
+    window = max(1, concurrency) * ROW_WINDOW_FACTOR
+
+    def run_job(target, system_prompt, query, budget):
+        key = None
+        if cache is not None:
+            key = make_key(target.provider, target.model, system_prompt, query, budget)
+            cached = None if refresh else cache.get(key)
+            if cached is not None:
+                cached['cached'] = True
+                return cached
+        adapter = get_provider(target.provider)
+        with in_flight:
+            provider_result = adapter.call(
+                system_prompt, query, model=target.model, max_tokens=budget, stream=stream,
+                prompt_caching=prompt_caching,
+            )
+        if key is not None:
+            cache.put(key, target.provider, target.model, provider_result)
+        return provider_result
+
+    rows = {}
+    pending = {}
+    futures = {}
+    next_emit = 0
+    # Prompt-cache groups whose warming call is in flight -> deferred jobs
+    warming = {}
+    warmed = set()
+
+    def submit(index, target, prompt, test, budget):
+        group = None
+        if prompt_caching:
+            group = (prompt['filename'], target.label)
+            if group in warming:
+                warming[group].append((index, target, prompt, test, budget))
+                return
+            if group in warmed:
+                group = None
             else:
-                # Call Anthropic API
-                anthropic_result = call_anthropic_api(prompt['content'], test['query'])
-                result.update({
-                    'anthropic_response': anthropic_result['response'][:500] if anthropic_result['response'] else None,
-                    'anthropic_tokens': anthropic_result['tokens_used'],
-                    'anthropic_latency_ms': anthropic_result['latency_ms'],
-                    'anthropic_error': anthropic_result['error']
-                })
-
-                # Call OpenAI API
-                openai_result = call_openai_api(prompt['content'], test['query'])
-                result.update({
-                    'openai_response': openai_result['response'][:500] if openai_result['response'] else None,
-                    'openai_tokens': openai_result['tokens_used'],
-                    'openai_latency_ms': openai_result['latency_ms'],
-                    'openai_error': openai_result['error']
-                })
-
-                # Determine overall status
-                if anthropic_result['error'] and openai_result['error']:
-                    result['status'] = 'BOTH_FAILED'
-                elif anthropic_result['error']:
-                    result['status'] = 'ANTHROPIC_FAILED'
-                elif openai_result['error']:
-                    result['status'] = 'OPENAI_FAILED'
-                else:
-                    result['status'] = 'SUCCESS'
-
-            results.append(result)
-            print(f"    Status: {result['status']}")
+                warming[group] = []
+        future = executors[target.provider].submit(run_job, target, prompt['content'], test['query'], budget)
+        futures[future] = (index, target, group)
+
+    def flush():
+        nonlocal next_emit
+        while next_emit in rows and pending[next_emit] == 0:
+            del pending[next_emit]
+            emit(rows.pop(next_emit))
+            next_emit += 1
+
+    def collect(timeout=None):
+        done, _ = wait(futures, timeout=timeout, return_when=FIRST_COMPLETED)
+        for future in done:
+            index, target, group = futures.pop(future)
+            result = future.result()
+            row = rows[index]
+            row.update(_provider_fields(target, result))
+            pending[index] -= 1
+            if pending[index] == 0:
+                finish(row)
+            if group is not None:
+                # Only a successful provider call wrote the prompt cache;
+                # otherwise the next deferred job warms the group instead
+                if not result.get('cached') and not result['error']:
+                    warmed.add(group)
+                for job in warming.pop(group):
+                    submit(*job)
+        flush()
+
+    executors = {
+        provider: ThreadPoolExecutor(
+            max_workers=max(1, limits.get(provider, DEFAULT_PROVIDER_CONCURRENCY)),
+            thread_name_prefix=f'validate-{provider}',
+        )
+        for provider in dict.fromkeys(target.provider for target in targets)
+    }
+    try:
+        for index, (prompt, test, budget) in enumerate(cells):
+            row = _new_row(prompt, test, budget)
+            resumed = _resumed_columns(completed, (prompt['filename'], test['id'], budget), targets)
+            rows[index] = row
+            pending[index] = 0
+            for target in targets:
+                if target.label in resumed:
+                    row.update(resumed[target.label])
+                    continue
+                submit(index, target, prompt, test, budget)
+                pending[index] += 1
+            if pending[index] == 0:
+                finish(row, ' (resumed)')
+            flush()
+            while futures and index - next_emit >= window:
+                collect()
+
+        while futures:
+            collect()
+    finally:
+        for executor in executors.values():
+            executor.shutdown(wait=True, cancel_futures=True)
 
     return results
 
 
-def generate_report(results: list, output_path: Path):
-    """Generate a CSV validation report."""
-    if not results:
-        print("No results to report.")
-        return
+def _run_batches(cells, targets, labels, emit, results, completed, cache, refresh, prompt_caching, finish):
+    """Batch-API variant of run_validation: one batch per target, rows emitted at the end."""
+    rows = []
+    requests = {target: [] for target in targets}
+    jobs = {}
+    for index, (prompt, test, budget) in enumerate(cells):
+        row = _new_row(prompt, test, budget)
+        resumed = _resumed_columns(completed, (prompt['filename'], test['id'], budget), targets)
+        rows.append(row)
+        for target in targets:
+            if target.label in resumed:
+                row.update(resumed[target.label])
+                continue
+            key = None
+            if cache is not None:
+                key = make_key(target.provider, target.model, prompt['content'], test['query'], budget)
+                cached = None if refresh else cache.get(key)
+                if cached is not None:
+                    cached['cached'] = True
+                    row.update(_provider_fields(target, cached))
+                    continue
+            custom_id = f'row{index}-{target.label}'
+            requests[target].append(BatchRequest(custom_id, prompt['content'], test['query'], target.model, budget))
+            jobs[custom_id] = (index, target, key)
+
+    batches = {target: batch for target, batch in requests.items() if batch}
+    if batches:
+        print(f"  Submitting {len(batches)} batch(es) with {len(jobs)} request(s)...")
+        with ThreadPoolExecutor(max_workers=len(batches), thread_name_prefix='validate-batch') as pool:
+            futures = [
+                pool.submit(get_provider(target.provider).call_batch, batch, prompt_caching)
+                for target, batch in batches.items()
+            ]
+            for future in futures:
+                for custom_id, provider_result in future.result().items():
+                    index, target, key = jobs[custom_id]
+                    if key is not None:
+                        cache.put(key, target.provider, target.model, provider_result)
+                    rows[index].update(_provider_fields(target, provider_result))
+
+    for row in rows:
+        finish(row)
+        emit(row)
+    return results
 
-    fieldnames = [
-        'timestamp', 'prompt_file', 'test_id', 'test_name', 'test_query',
-        'evaluation_criteria', 'status',
-        'anthropic_response', 'anthropic_tokens', 'anthropic_latency_ms', 'anthropic_error',
-        'openai_response', 'openai_tokens', 'openai_latency_ms', 'openai_error'
-    ]
 
-    with open(output_path, 'w', newline='', encoding='utf-8') as f:
-        writer = csv.DictWriter(f, fieldnames=fieldnames)
-        writer.writeheader()
-        writer.writerows(results)
+def plan_validation(
+    prompt_files: list,
+    targets: list = None,
+    max_tokens: list = None,
+    cache: ResponseCache = None,
+    refresh: bool = False,
+    completed: CompletedRows = None,
+) -> Plan:
+    """
+    Estimate the API usage of a run without calling any provider.
+
+    Calls that run_validation would serve from the cache or carry over from
+    a resumed report are counted as skipped.
+    """
+    def is_done(prompt, test, budget, target):
+        if completed is not None and target.label in completed.succeeded((prompt['filename'], test['id'], budget)):
+            return True
+        if cache is None or refresh:
+            return False
+        return cache.contains(make_key(target.provider, target.model, prompt['content'], test['query'], budget))
 
+    return build_plan(prompt_files, TEST_QUERIES, list(targets or DEFAULT_TARGETS),
+                      list(max_tokens or [MAX_TOKENS]), is_done=is_done)
+
+
+# Statuses always listed in the summary, in this order
+SUMMARY_STATUSES = ['SUCCESS', 'DRY_RUN', 'ANTHROPIC_FAILED', 'OPENAI_FAILED', 'BOTH_FAILED']
+
+
+def print_summary(summary: ReportSummary, output_path: Path):
+    """Print the end-of-run summary and write the latency and benchmark reports."""
     print(f"\n{'='*60}")
     print(f"Validation report generated: {output_path}")
-    print(f"Total tests run: {len(results)}")
+    print(f"Total tests run: {summary.total}")
 
     # Summary statistics
-    statuses = [r['status'] for r in results]
     print(f"\nSummary:")
-    print(f"  SUCCESS: {statuses.count('SUCCESS')}")
-    print(f"  DRY_RUN: {statuses.count('DRY_RUN')}")
-    print(f"  ANTHROPIC_FAILED: {statuses.count('ANTHROPIC_FAILED')}")
-    print(f"  OPENAI_FAILED: {statuses.count('OPENAI_FAILED')}")
-    print(f"  BOTH_FAILED: {statuses.count('BOTH_FAILED')}")
+    statuses = SUMMARY_STATUSES + sorted(s for s in summary.statuses if s not in SUMMARY_STATUSES)
+    for status in statuses:
+        print(f"  {status}: {summary.statuses[status]}")
+
+    if summary.provider_calls:
+        hits = summary.cache_hits
+        calls = summary.provider_calls
+        print(f"\nResponse cache: {hits}/{calls} calls served from cache ({hits / calls:.0%})")
+
+    prompt_cache = summary.prompt_cache_rows()
+    if any(row['cache_read_tokens'] or row['cache_write_tokens'] for row in prompt_cache):
+        print("\nPrompt cache (input tokens read from cache / written / total):")
+        for row in prompt_cache:
+            share = row['cache_read_tokens'] / row['input_tokens'] if row['input_tokens'] else 0
+            print(f"  {row['label']}: {row['cache_read_tokens']:,} / {row['cache_write_tokens']:,} / "
+                  f"{row['input_tokens']:,} ({share:.0%} cached)")
+
+    percentile_rows = [r for r in summary.percentile_rows() if r['scope'] == 'provider']
+    if percentile_rows:
+        latency_path = latency_path_for(output_path)
+        summary.write_latency_report(latency_path)
+        print(f"\nLatency percentiles (p50 / p95 / p99), full breakdown in {latency_path}:")
+        for row in percentile_rows:
+            print(f"  {row['provider']} {row['metric']}: {row['p50']} / {row['p95']} / {row['p99']} (n={row['count']})")
+
+    benchmark_rows = summary.benchmark_rows()
+    if benchmark_rows:
+        benchmark_path = benchmark_path_for(output_path)
+        summary.write_benchmark_report(benchmark_path)
+        print(f"\nBenchmark ({benchmark_path}):")
+        print(f"  {'target':<32} {'max_tok':>7} {'calls':>6} {'err':>4} {'p50 ms':>9} {'p95 ms':>9} "
+              f"{'tok/s':>7} {'avg out':>8} {'cost $':>10}")
+        for row in benchmark_rows:
+            cost = '-' if row['total_cost_usd'] is None else f"{row['total_cost_usd']:.4f}"
+            print(f"  {row['label']:<32} {row['max_tokens'] or '-':>7} {row['calls']:>6} {row['errors']:>4} "
+                  f"{row['p50_latency_ms'] or '-':>9} {row['p95_latency_ms'] or '-':>9} "
+                  f"{row['p50_tokens_per_sec'] or '-':>7} {row['avg_output_tokens']:>8} {cost:>10}")
     print(f"{'='*60}")
 
 
+def generate_report(results: list, output_path: Path, targets: list = DEFAULT_TARGETS):
+    """Generate a CSV (and JSONL) validation report from a list of results."""
+    if not results:
+        print("No results to report.")
+        return
+
+    summary = ReportSummary([target.label for target in targets])
+    with ReportWriter(output_path, report_fieldnames(targets)) as writer:
+        for result in results:
+            writer.write(result)
+            summary.add(result)
+    print_summary(summary, output_path)
+
+
+def parse_provider_values(parser, option: str, values: list) -> dict:
+    """Parse repeated PROVIDER=N command line values into a dict."""
+    parsed = {}
+    for item in values:
+        provider, _, value = item.partition('=')
+        if provider not in PROVIDER_ADAPTERS or not value.isdigit():
+            parser.error(f"invalid {option} '{item}' (expected one of {', '.join(PROVIDER_ADAPTERS)}=N)")
+        parsed[provider] = int(value)
+    return parsed
+
+
+def parse_list(parser, option: str, value: str, convert=str) -> list:
+    """Parse a comma-separated command line value."""
+    try:
+        return [convert(item.strip()) for item in value.split(',') if item.strip()]
+    except ValueError:
+        parser.error(f"invalid {option} '{value}'")
+
+
 def main():
     """Main entry point for the validation script."""
     import argparse
@@ -298,6 +627,21 @@ def main():
     parser = argparse.ArgumentParser(
         description='Validate AI prompts against Anthropic and OpenAI APIs'
     )
+    parser.add_argument(
+        '--models',
+        type=str,
+        default=None,
+        metavar='PROVIDER[:MODEL],...',
+        help=f"Comma-separated models to benchmark, e.g. anthropic,openai:gpt-4o-mini,mock "
+             f"(providers: {', '.join(PROVIDER_ADAPTERS)}; default: {','.join(PROVIDER_MODELS)})"
+    )
+    parser.add_argument(
+        '--max-tokens',
+        type=str,
+        default=str(MAX_TOKENS),
+        metavar='N,...',
+        help=f'Comma-separated output token budgets to sweep (default: {MAX_TOKENS})'
+    )
     parser.add_argument(
         '--dry-run',
         action='store_true',
@@ -309,8 +653,119 @@ def main():
         default='validation_report.csv',
         help='Output filename for the validation report'
     )
+    parser.add_argument(
+        '--plan',
+        action='store_true',
+        help='Print the pre-flight token, cost and duration estimate and exit'
+    )
+    parser.add_argument(
+        '--max-cost',
+        type=float,
+        default=None,
+        metavar='USD',
+        help='Cost budget for the run; exceeding it aborts (or trims, see --trim)'
+    )
+    parser.add_argument(
+        '--max-total-tokens',
+        type=int,
+        default=None,
+        metavar='N',
+        help='Total input + output token budget for the run; exceeding it aborts (or trims)'
+    )
+    parser.add_argument(
+        '--trim',
+        action='store_true',
+        help='Run only the leading prompt/test rows that fit the budget instead of aborting'
+    )
+    parser.add_argument(
+        '--resume',
+        action='store_true',
+        help='Append to an existing report, skipping prompt/test/provider calls that already succeeded'
+    )
+    parser.add_argument(
+        '--stream',
+        action='store_true',
+        help='Use streaming API calls to record time-to-first-token and throughput'
+    )
+    parser.add_argument(
+        '--prompt-caching',
+        action='store_true',
+        help='Mark system prompts cacheable and warm the provider prompt cache per prompt '
+             '(cache writes cost more than the pre-flight plan estimates)'
+    )
+    parser.add_argument(
+        '--batch',
+        action='store_true',
+        help='Submit calls through the provider batch APIs (cheaper, results can take up to 24h)'
+    )
+    parser.add_argument(
+        '--no-cache',
+        action='store_true',
+        help='Disable the response cache entirely'
+    )
+    parser.add_argument(
+        '--refresh',
+        action='store_true',
+        help='Ignore cached responses and call the APIs again (results are re-cached)'
+    )
+    parser.add_argument(
+        '--cache-path',
+        type=str,
+        default=str(DEFAULT_CACHE_PATH),
+        help='SQLite file for the response cache'
+    )
+    parser.add_argument(
+        '--concurrency',
+        type=int,
+        default=DEFAULT_CONCURRENCY,
+        help=f'Maximum API calls in flight across all providers (default: {DEFAULT_CONCURRENCY})'
+    )
+    parser.add_argument(
+        '--provider-concurrency',
+        action='append',
+        default=[],
+        metavar='PROVIDER=N',
+        help=f'Per-provider concurrency limit, e.g. anthropic=2 (default: {DEFAULT_PROVIDER_CONCURRENCY})'
+    )
+    parser.add_argument(
+        '--requests-per-minute',
+        action='append',
+        default=[],
+        metavar='PROVIDER=N',
+        help='Per-provider request rate limit, e.g. anthropic=50'
+    )
+    parser.add_argument(
+        '--tokens-per-minute',
+        action='append',
+        default=[],
+        metavar='PROVIDER=N',
+        help='Per-provider token rate limit, e.g. openai=30000'
+    )
 
     args = parser.parse_args()
+    if args.plan and args.dry_run:
+        # A dry run makes no calls, so there is nothing to plan
+        parser.error("--plan cannot be combined with --dry-run")
+
+    targets = DEFAULT_TARGETS
+    if args.models:
+        try:
+            targets = build_targets(parse_list(parser, '--models', args.models))
+        except ValueError as e:
+            parser.error(str(e))
+    budgets = parse_list(parser, '--max-tokens', args.max_tokens, int)
+    if not budgets or min(budgets) < 1:
+        parser.error(f"invalid --max-tokens '{args.max_tokens}'")
+
+    provider_concurrency = parse_provider_values(parser, '--provider-concurrency', args.provider_concurrency)
+    rate_limits = {}
+    for option, key, values in (
+        ('--requests-per-minute', 'requests_per_minute', args.requests_per_minute),
+        ('--tokens-per-minute', 'tokens_per_minute', args.tokens_per_minute),
+    ):
+        for provider, value in parse_provider_values(parser, option, values).items():
+            rate_limits.setdefault(provider, {})[key] = value
+    configure_rate_limits(rate_limits)
 
     print("=" * 60)
     print("Kearney AI Skills - Prompt Validation Suite")
@@ -318,10 +773,13 @@ def main():
     print(f"Timestamp: {datetime.now().isoformat()}")
     print(f"Prompts Directory: {PROMPTS_DIR}")
     print(f"Dry Run Mode: {args.dry_run}")
+    print(f"Concurrency: {args.concurrency}")
+    print(f"Models: {', '.join(f'{t.provider}:{t.model}' for t in targets)}")
+    print(f"Max tokens: {', '.join(map(str, budgets))}")
 
     # Check API keys
     if not args.dry_run:
-        missing_keys = check_api_keys()
+        missing_keys = check_api_keys(dict.fromkeys(t.provider for t in targets))
         if missing_keys:
             print(f"\n⚠️  Warning: Missing API keys: {', '.join(missing_keys)}")
             print("   Set these in your .env file or run with --dry-run")
@@ -335,14 +793,73 @@ def main():
 
     print(f"\nFound {len(prompt_files)} prompt file(s):")
     for p in prompt_files:
-        print(f"  - {p['filename']} ({p['line_count']} lines)")
+        print(f"  - {p['filename']} ({p['line_count']} lines, ~{p['estimated_tokens']:,} tokens)")
 
-    # Run validation
-    results = run_validation(prompt_files, dry_run=args.dry_run)
-
-    # Generate report
+    # Run validation, streaming each row to the report as it completes
     output_path = OUTPUT_DIR / args.output
-    generate_report(results, output_path)
+    completed = load_completed(output_path, targets) if args.resume else None
+    if args.resume:
+        print(f"\nResuming from {output_path} ({len(completed)} existing row(s))")
+
+    cache = None if args.no_cache or args.dry_run else ResponseCache(args.cache_path)
+
+    # Estimate the run before any call goes out
+    max_rows = None
+    if not args.dry_run:
+        plan = plan_validation(prompt_files, targets, budgets, cache=cache, refresh=args.refresh, completed=completed)
+        print_plan(plan, plan.duration_seconds(args.concurrency, provider_concurrency, DEFAULT_PROVIDER_CONCURRENCY))
+        if plan.over_budget(args.max_cost, args.max_total_tokens):
+            if not args.trim:
+                print(f"\n❌ Plan exceeds the budget (max cost ${plan.cost_usd:.4f}, "
+                      f"{plan.total_tokens:,} tokens); use --trim to run a subset")
+                sys.exit(2)
+            max_rows = plan.rows_within(args.max_cost, args.max_total_tokens)
+            print(f"\n✂️  Trimmed to the first {max_rows} of {len(plan.rows)} rows to fit the budget")
+        if args.plan:
+            if cache is not None:
+                cache.close()
+            return
+
+    fieldnames = report_fieldnames(targets)
+    summary = ReportSummary([target.label for target in targets])
+    try:
+        writer = ReportWriter(output_path, fieldnames, append=args.resume)
+    except ValueError as e:
+        print(f"\n❌ {e}")
+        sys.exit(1)
+
+    def on_result(row):
+        writer.write(row)
+        summary.add(row)
+
+    try:
+        run_validation(
+            prompt_files,
+            dry_run=args.dry_run,
+            concurrency=args.concurrency,
+            provider_concurrency=provider_concurrency,
+            cache=cache,
+            refresh=args.refresh,
+            stream=args.stream,
+            on_result=on_result,
+            completed=completed,
+            targets=targets,
+            max_tokens=budgets,
+            max_rows=max_rows,
+            prompt_caching=args.prompt_caching,
+            batch=args.batch,
+        )
+    finally:
+        writer.close()
+        if cache is not None:
+            cache.close()
+
+    if args.resume:
+        # Drop the rows superseded by this run
+        order = [(p['filename'], t['id'], b) for p in prompt_files for t in TEST_QUERIES for b in budgets]
+        compact_report(output_path, fieldnames, order=order)
+
+    print_summary(summary, output_path)
 
     print("\n✅ Validation complete!")
 
@@ -0,0 +1,231 @@
+"""
+Test the Flask routes against the real prompt library.
+"""
+import gzip
+import json
+import sys
+import zlib
+from pathlib import Path
+
+from werkzeug.http import http_date
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "app"))
+
+import app as webapp
+
+
+def get_client():
+    return webapp.app.test_client()
+
+
+def test_index_renders_metadata_only():
+    """The index page should not embed prompt bodies."""
+    response = get_client().get("/")
+    html = response.get_data(as_text=True)
+
+    assert response.status_code == 200
+    assert "Kearney Visual Standards" in html
+    assert "prompt-content-" not in html
+    assert "/api/items/1/content" in html
+
+
+def test_index_paginates_filters_and_sorts_on_the_server():
+    """Only the requested page is rendered, and each query is cached separately."""
+    client = get_client()
+
+    skills = client.get("/?type=skill").get_data(as_text=True)
+    assert skills.count('class="skill-card"') == 3
+    assert 'data-type="prompt"' not in skills
+
+    first = client.get("/?sort=title&per_page=5")
+    second = client.get("/?sort=title&per_page=5&page=2")
+    assert first.get_data(as_text=True).count('class="skill-card"') == 5
+    assert "Page 2 of 3" in second.get_data(as_text=True)
+    assert first.headers["ETag"] != second.headers["ETag"]
+    assert client.get("/?per_page=5&sort=title", headers={"If-None-Match": first.headers["ETag"]}).status_code == 304
+
+    found = client.get("/?q=hypothesis").get_data(as_text=True)
+    assert "Hypothesis Tree Builder" in found
+    assert "Kearney Visual Standards" not in found
+
+
+def test_item_content_api():
+    """The content endpoint should serve prompt and skill bodies on demand."""
+    client = get_client()
+
+    prompt = client.get("/api/items/1/content").get_json()
+    assert prompt["content"] == webapp.catalog.get(1)["PromptContent"]
+
+    skill = client.get("/api/items/11/content?platform=generic").get_json()
+    assert skill["platform"] == "generic"
+    assert skill["content"] == webapp.catalog.get(11)["SkillVersions"]["generic"]
+
+    assert client.get("/api/items/11/content?platform=nope").status_code == 404
+    assert client.get("/api/items/999/content").status_code == 404
+
+
+def test_detail_page_renders_content():
+    """The detail page still renders the full body for copying."""
+    response = get_client().get("/prompt/11")
+
+    assert response.status_code == 200
+    assert 'id="skill-content-generic"' in response.get_data(as_text=True)
+    assert get_client().get("/prompt/999").status_code == 404
+
+
+def test_pages_honor_conditional_requests():
+    """Repeat visits with a matching ETag or date should get a 304."""
+    client = get_client()
+    for url in ["/", "/prompt/1", "/guide", "/api/items/11/content"]:
+        first = client.get(url)
+        etag = first.headers["ETag"]
+
+        assert first.status_code == 200
+        assert client.get(url, headers={"If-None-Match": etag}).status_code == 304
+
+    last_modified = client.get("/").headers["Last-Modified"]
+    assert client.get("/", headers={"If-Modified-Since": last_modified}).status_code == 304
+
+    # Listings sorted or searched on content follow the newest content file
+    newest = http_date(max([entry.last_modified for entry in webapp.catalog.get_items()]
+                           + [webapp.catalog.last_modified]))
+    assert client.get("/?sort=updated").headers["Last-Modified"] == newest
+    assert client.get("/?q=tree").headers["Last-Modified"] == newest
+
+
+def test_responses_are_served_precompressed():
+    """Pages and static assets should be gzipped from the compression cache."""
+    client = get_client()
+    for url in ["/", "/static/style.css", "/static/script.js"]:
+        plain = client.get(url)
+        first = client.get(url, headers={"Accept-Encoding": "gzip"})
+        second = client.get(url, headers={"Accept-Encoding": "gzip"})
+
+        assert first.headers["Content-Encoding"] == "gzip"
+        assert "Accept-Encoding" in first.headers["Vary"]
+        assert gzip.decompress(first.data) == plain.data
+        assert second.data == first.data
+
+
+def test_search_api():
+    """The search endpoint ranks, filters and paginates catalog entries."""
+    client = get_client()
+
+    found = client.get("/api/search?q=hypothesis").get_json()
+    assert found["results"][0]["title"] == "Hypothesis Tree Builder"
+
+    skills = client.get("/api/search?type=skill&per_page=2").get_json()
+    assert skills["total"] == 3
+    assert len(skills["results"]) == 2
+    assert all(r["type"] == "skill" for r in skills["results"])
+
+
+def test_text_content_is_precompressed_from_bundle(tmp_path, monkeypatch):
+    """With a bundle, the text endpoint serves the gzip body built ahead of time."""
+    from catalog import Catalog
+    from catalog_bundle import BundleCatalog, write_bundle
+
+    source = Catalog(str(Path(webapp.APP_DIR) / "prompts.json"), webapp.BASE_DIR)
+    write_bundle(source, tmp_path / "catalog.bundle", allow_errors=True)
+    monkeypatch.setattr(webapp, "catalog", BundleCatalog(str(tmp_path / "catalog.bundle")))
+    client = get_client()
+
+    plain = client.get("/api/items/1/content.txt")
+    packed = client.get("/api/items/1/content.txt", headers={"Accept-Encoding": "gzip"})
+
+    assert plain.get_data(as_text=True) == source.get(1)["PromptContent"]
+    assert packed.headers["Content-Encoding"] == "gzip"
+    assert gzip.decompress(packed.data) == plain.data
+    assert packed.data == webapp.catalog.get(1).gzip_body()
+    assert client.get("/api/items/1/content.txt", headers={"If-None-Match": packed.headers["ETag"]}).status_code == 304
+
+
+def test_health_endpoints_report_catalog_version(tmp_path, monkeypatch):
+    """Source and bundle catalogs of the same library report the same version."""
+    from catalog import Catalog
+    from catalog_bundle import BundleCatalog, write_bundle
+
+    source = Catalog(str(Path(webapp.APP_DIR) / "prompts.json"), webapp.BASE_DIR)
+    monkeypatch.setattr(webapp, "catalog", source)
+    client = get_client()
+
+    assert client.get("/healthz").get_json()["catalog_version"] is None
+    ready = client.get("/readyz")
+    assert ready.status_code == 200
+    assert ready.get_json()["status"] == "ready"
+    version = ready.get_json()["catalog_version"]
+    assert client.get("/healthz").get_json()["catalog_version"] == version
+
+    write_bundle(source, tmp_path / "catalog.bundle", allow_errors=True)
+    monkeypatch.setattr(webapp, "catalog", BundleCatalog(str(tmp_path / "catalog.bundle")))
+    assert client.get("/readyz").get_json()["catalog_version"] == version
+
+    monkeypatch.setattr(webapp, "catalog", BundleCatalog(str(tmp_path / "missing.bundle")))
+    assert client.get("/readyz").status_code == 503
+
+
+def test_metrics_endpoint_reports_routes_and_catalog():
+    """Requests show up in the Prometheus histograms next to the catalog counters."""
+    client = get_client()
+    client.get("/prompt/1")
+    client.get("/api/items/1/content")
+
+    response = client.get("/metrics")
+    assert response.status_code == 200
+    assert response.content_type.startswith("text/plain")
+    body = response.get_data(as_text=True)
+    assert 'http_request_duration_seconds_count{method="GET",route="/prompt/<int:prompt_id>",status="200"}' in body
+    assert 'http_response_size_bytes_bucket{route="/api/items/<int:item_id>/content",le="+Inf"}' in body
+    assert "# TYPE catalog_bytes_read_total counter" in body
+    assert "page_cache_hits_total" in body
+
+
+def test_version_history_api(tmp_path, monkeypatch):
+    """Recorded versions are listed, served by hash and diffed from the content store."""
+    from catalog import Catalog
+    from content_store import ContentStore
+
+    sys.path.insert(0, str(Path(__file__).parent.parent))
+    from scripts import prompt_history
+
+    client = get_client()
+    history = client.get("/api/items/1/history").get_json()
+    assert [v["current"] for v in history["versions"]][-1] is True
+    latest = history["versions"][-1]["version"]
+    assert client.get(f"/api/items/1/versions/{latest}/content.txt").get_data(as_text=True) == \
+        webapp.catalog.get(1)["PromptContent"]
+    assert client.get("/api/items/11/versions/1.0/content.txt?platform=generic").get_data(as_text=True) == \
+        webapp.catalog.get(11)["SkillVersions"]["generic"]
+    assert client.get("/api/items/1/versions/0.1/content.txt").status_code == 404
+
+    (tmp_path / "prompts").mkdir()
+    content = tmp_path / "prompts" / "Example.txt"
+    items_json = tmp_path / "prompts.json"
+    content.write_text("Intro\nStep one\n")
+    items_json.write_text('[{"id": 1, "Title": "Example", "PromptContentFile": "prompts/Example.txt", "Version": 1.0}]')
+    prompt_history.record(items_json, tmp_path, tmp_path / "store")
+    content.write_text("Intro\nStep one, revised\n")
+    items = json.loads(items_json.read_text())
+    items[0]["Version"] = 2.0
+    items_json.write_text(json.dumps(items))
+    prompt_history.record(items_json, tmp_path, tmp_path / "store")
+    monkeypatch.setattr(webapp, "catalog", Catalog(str(items_json), str(tmp_path)))
+    monkeypatch.setattr(webapp, "store", ContentStore(str(tmp_path / "store")))
+
+    assert client.get("/api/items/1/versions/1.0/content.txt").get_data(as_text=True) == "Intro\nStep one\n"
+    diff = client.get("/api/items/1/diff?from=1.0")
+    assert "-Step one\n+Step one, revised\n" in diff.get_data(as_text=True)
+    assert client.get("/api/items/1/diff?from=1.0", headers={"If-None-Match": diff.headers["ETag"]}).status_code == 304
+    assert client.get("/api/items/1/diff").status_code == 400
+
+    old_hash = json.loads(items_json.read_text())[0]["History"][0]["Files"]["prompts/Example.txt"]
+    blob = Path(webapp.store._path(old_hash))
+    blob.write_bytes(blob.read_bytes()[:-4])
+    for data in (None, zlib.compress(b"garbage header\nbody")):
+        if data is not None:
+            blob.write_bytes(data)
+        monkeypatch.setattr(webapp, "store", ContentStore(str(tmp_path / "store")))
+        for url in ("/api/items/1/versions/1.0/content.txt", "/api/items/1/diff?from=1.0"):
+            corrupt = client.get(url)
+            assert corrupt.status_code == 500
+            assert "Corrupt blob" in corrupt.get_json()["error"]
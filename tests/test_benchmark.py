@@ -0,0 +1,39 @@
+"""
+Test the synthetic library generator and benchmark regression check.
+"""
+import json
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from scripts import benchmark
+
+
+def test_benchmarks_run_against_generated_library(tmp_path):
+    """A generated library loads cleanly and every hot path is measured."""
+    items_json = benchmark.generate_library(tmp_path, 30, seed=1)
+    items = json.loads(items_json.read_text())
+    assert len(items) == 30
+    assert {item["Type"] for item in items} == {"prompt", "skill"}
+
+    results = benchmark.run_benchmarks(items_json, repeat=1)
+    assert set(results) == {
+        "load_metadata_ms", "load_items_ms", "search_index_ms", "index_render_ms",
+        "index_bytes", "index_filtered_render_ms", "detail_render_ms", "search_query_ms", "memory_mb",
+    }
+    assert all(value > 0 for value in results.values())
+
+
+def test_check_regressions_flags_slowdowns_over_threshold():
+    """Only metrics slower than baseline by more than the threshold are reported."""
+    baseline = {"results": {"100": {"load_items_ms": 10.0, "index_render_ms": 4.0, "memory_mb": 1.0}}}
+    current = {"results": {
+        "100": {"load_items_ms": 12.0, "index_render_ms": 6.0, "memory_mb": 0.5, "search_query_ms": 9.0},
+        "10000": {"load_items_ms": 999.0},
+    }}
+
+    regressions = benchmark.check_regressions(current, baseline, threshold=0.25)
+
+    assert len(regressions) == 1
+    assert regressions[0].startswith("100 entries index_render_ms: 6 vs baseline 4")
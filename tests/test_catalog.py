@@ -0,0 +1,156 @@
+"""
+Test the in-process catalog cache used by the Flask app.
+"""
+import gzip
+import json
+import os
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "app"))
+
+from catalog import Catalog
+from catalog_bundle import BundleCatalog, BundleError, write_bundle
+from catalog_watcher import CatalogWatcher
+from search import SearchIndex
+
+
+def make_library(root):
+    """Create a small prompts.json + prompts/ + skills/ layout under root."""
+    (root / "prompts").mkdir()
+    (root / "prompts" / "First.txt").write_text("first prompt")
+    (root / "skills" / "demo").mkdir(parents=True)
+    (root / "skills" / "demo" / "SKILL_generic.md").write_text("generic skill")
+    (root / "skills" / "demo" / "SKILL_claude-code.md").write_text("claude skill")
+
+    items = [
+        {"id": 1, "Title": "First", "Type": "prompt", "PromptContentFile": "prompts/First.txt"},
+        {"id": 2, "Title": "Demo", "Type": "skill", "SkillFolder": "skills/demo",
+         "Platforms": ["claude-code", "generic"]},
+    ]
+    items_json = root / "prompts.json"
+    items_json.write_text(json.dumps(items))
+    return items_json
+
+
+def touch(path, content):
+    """Rewrite a file and bump its mtime so the change is always visible."""
+    path.write_text(content)
+    st = os.stat(path)
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000_000))
+
+
+def test_catalog_loads_once_and_counts_hits(tmp_path):
+    """Repeat reads should be served from memory without touching the files."""
+    catalog = Catalog(make_library(tmp_path), tmp_path, check_interval=0)
+
+    items = catalog.get_items()
+    assert [i["PromptContent"] for i in items] == ["first prompt", "claude skill"]
+    assert items[1]["SkillVersions"]["generic"] == "generic skill"
+    files_read = catalog.stats["files_read"]
+
+    assert catalog.get_items() is items
+    assert catalog.stats["misses"] == 1
+    assert catalog.stats["hits"] == 1
+    assert catalog.stats["files_read"] == files_read
+
+
+def test_catalog_reloads_only_changed_entries(tmp_path):
+    """Editing one content file should re-read only that entry."""
+    catalog = Catalog(make_library(tmp_path), tmp_path, check_interval=0)
+    before = catalog.get_items()
+    assert before[0]["PromptContent"] == "first prompt"
+    generation = catalog.generation
+
+    touch(tmp_path / "prompts" / "First.txt", "edited prompt")
+    after = catalog.get_items()
+
+    assert after[0]["PromptContent"] == "edited prompt"
+    assert after[1] is before[1]
+    assert catalog.stats["reloads"] == 1
+    assert catalog.stats["entries_reloaded"] == 3
+    assert catalog.generation == generation + 1
+
+
+def test_catalog_reports_missing_files(tmp_path):
+    """Missing content files keep the existing error placeholder."""
+    items_json = make_library(tmp_path)
+    (tmp_path / "prompts" / "First.txt").unlink()
+    catalog = Catalog(items_json, tmp_path, check_interval=0)
+
+    assert catalog.get_items()[0]["PromptContent"].startswith("[Error: Content file not found")
+
+
+def test_catalog_indexes_by_id_and_loads_content_lazily(tmp_path):
+    """Looking up one entry should read only that entry's files."""
+    catalog = Catalog(make_library(tmp_path), tmp_path, check_interval=0)
+
+    entry = catalog.get(2)
+    assert entry["Title"] == "Demo"
+    assert not entry.is_loaded
+    assert catalog.stats["files_read"] == 1
+
+    assert entry["SkillVersions"] == {"claude-code": "claude skill", "generic": "generic skill"}
+    assert catalog.stats["files_read"] == 3
+    assert not catalog.get(1).is_loaded
+    assert catalog.get(99) is None
+
+
+def test_bundle_matches_source_catalog(tmp_path):
+    """A compiled bundle serves the same entries, versions and search terms."""
+    items_json = make_library(tmp_path)
+    source = Catalog(items_json, tmp_path, check_interval=0)
+    header = write_bundle(source, tmp_path / "catalog.bundle")
+    bundle = BundleCatalog(tmp_path / "catalog.bundle", check_interval=0)
+
+    assert len(header["items"]) == 2
+    for entry in source.get_items():
+        compiled = bundle.get(entry.id)
+        assert dict(compiled) == dict(entry)
+        assert compiled.version == entry.version
+        assert compiled.file_hashes == entry.file_hashes
+    assert gzip.decompress(bundle.get(2).gzip_body("generic")) == b"generic skill"
+    assert bundle.get_stats()["files_read"] == 1
+
+    index = SearchIndex()
+    index.sync(bundle)
+    assert [r["id"] for r in index.search("claude")["results"]] == [2]
+
+    (tmp_path / "prompts" / "First.txt").unlink()
+    with pytest.raises(BundleError, match="First.txt"):
+        write_bundle(Catalog(items_json, tmp_path), tmp_path / "broken.bundle")
+    assert not (tmp_path / "broken.bundle").exists()
+
+
+def test_watcher_applies_incremental_changes(tmp_path):
+    """A watched skill edit re-reads one file and bumps only that entry."""
+    items_json = make_library(tmp_path)
+    catalog = Catalog(items_json, tmp_path, check_interval=0)
+    watcher = CatalogWatcher(catalog, [tmp_path / "prompts", tmp_path / "skills", items_json])
+    watcher.poll()
+    before = catalog.snapshot()
+    versions = [entry.version for entry in before.items]
+    catalog.watched = True
+
+    touch(tmp_path / "skills" / "demo" / "SKILL_generic.md", "edited skill")
+    files_read = catalog.stats["files_read"]
+    assert catalog.get(2)["SkillVersions"]["generic"] == "generic skill"
+    assert catalog.stats["files_read"] == files_read
+
+    assert watcher.poll() == {str(tmp_path / "skills" / "demo" / "SKILL_generic.md")}
+    after = catalog.snapshot()
+    assert catalog.stats["files_read"] == files_read + 1
+    assert after.items[0] is before.items[0]
+    assert after.items[1]["SkillVersions"] == {"claude-code": "claude skill", "generic": "edited skill"}
+    assert after.items[1].version != versions[1]
+    assert after.generation == before.generation + 1
+    assert before.items[1]["SkillVersions"]["generic"] == "generic skill"
+
+    items = json.loads(items_json.read_text())
+    items.append({"id": 3, "Title": "Third", "Type": "prompt", "PromptContentFile": "prompts/First.txt"})
+    touch(items_json, json.dumps(items))
+    watcher.poll()
+    assert catalog.get(3)["PromptContent"] == "first prompt"
+    assert catalog.get(1) is before.items[0]
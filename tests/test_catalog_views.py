@@ -0,0 +1,115 @@
+"""
+Test the sorted views and facet counts behind the paginated index page.
+"""
+import json
+import os
+import sys
+from pathlib import Path
+
+from werkzeug.datastructures import MultiDict
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "app"))
+
+from catalog import Catalog
+from catalog_views import CatalogViews, ListingQuery
+
+
+def make_catalog(root):
+    """A catalog of five prompts with varied titles, versions and categories."""
+    (root / "prompts").mkdir()
+    items = []
+    for item_id, (title, version, category, item_type) in enumerate([
+        ("Delta", 1.0, "Strategy", "prompt"),
+        ("alpha", 3.0, "Analytics", "prompt"),
+        ("Charlie", 2.0, "Strategy", "skill"),
+        ("Bravo", 3.0, "Strategy", "prompt"),
+        ("Echo", 1.5, "Analytics", "skill"),
+    ], start=1):
+        (root / "prompts" / f"{item_id}.txt").write_text(title)
+        items.append({"id": item_id, "Title": title, "Version": version, "Category": category,
+                      "Type": item_type, "PromptContentFile": f"prompts/{item_id}.txt"})
+    (root / "prompts.json").write_text(json.dumps(items))
+    return Catalog(root / "prompts.json", root, check_interval=0)
+
+
+def listing(views, **args):
+    return views.query(ListingQuery.from_args(MultiDict(args)))
+
+
+def test_views_sort_filter_and_paginate(tmp_path):
+    """Sorts are stable, filters intersect and pages slice the sorted view."""
+    views = CatalogViews()
+    views.sync(make_catalog(tmp_path))
+
+    assert [e["Title"] for e in listing(views, sort="title")["items"]] == ["alpha", "Bravo", "Charlie", "Delta", "Echo"]
+    assert [e.id for e in listing(views, sort="version")["items"]] == [2, 4, 3, 5, 1]
+
+    page = listing(views, category="Strategy", type="prompt", sort="title", per_page="1", page="2")
+    assert (page["total"], page["page"], page["pages"]) == (2, 2, 2)
+    assert [e["Title"] for e in page["items"]] == ["Delta"]
+
+    # Past the last page clamps to it; bad values fall back to defaults
+    assert listing(views, page="99", per_page="2")["page"] == 3
+    assert ListingQuery.from_args(MultiDict({"sort": "bogus", "page": "x"}))[2:4] == ("default", 1)
+
+
+def test_updated_order_follows_content_edits(tmp_path):
+    """Editing a file the listing never read still re-sorts 'Recently updated'."""
+    catalog = make_catalog(tmp_path)
+    for item_id in range(1, 6):
+        os.utime(tmp_path / "prompts" / f"{item_id}.txt", (1_000_000 + item_id,) * 2)
+    # prompts.json is the newest file, as after recording a version
+    os.utime(tmp_path / "prompts.json", (3_000_000,) * 2)
+    views = CatalogViews()
+    views.sync(catalog)
+
+    before = listing(views, sort="updated")
+    # Items 3 and 5 are skills without platforms, so only prompts.json dates them
+    assert [e.id for e in before["items"]] == [3, 5, 4, 2, 1]
+
+    os.utime(tmp_path / "prompts" / "2.txt", (2_000_000,) * 2)
+    views.sync(catalog)
+    after = listing(views, sort="updated")
+    assert [e.id for e in after["items"]] == [3, 5, 2, 4, 1]
+    assert after["order"] != before["order"]
+
+
+def test_updated_order_uses_history_not_prompts_json(tmp_path):
+    """Rewriting prompts.json does not make every entry tie; History dates count."""
+    catalog = make_catalog(tmp_path)
+    for item_id in range(1, 6):
+        os.utime(tmp_path / "prompts" / f"{item_id}.txt", (1_000_000 + item_id,) * 2)
+    items = json.loads((tmp_path / "prompts.json").read_text())
+    items[0]["History"] = [{"Version": 1.0, "Date": "2001-01-01", "Files": {}}]
+    (tmp_path / "prompts.json").write_text(json.dumps(items))
+    views = CatalogViews()
+    views.sync(catalog)
+
+    assert [e.id for e in listing(views, sort="updated")["items"]] == [3, 5, 1, 4, 2]
+
+
+def test_facet_counts_ignore_their_own_filter(tmp_path):
+    """Each facet is counted with the other filters applied, so choices stay visible."""
+    views = CatalogViews()
+    views.sync(make_catalog(tmp_path))
+
+    facets = listing(views, category="Strategy")["facets"]
+    assert facets["Category"] == {"Strategy": 3, "Analytics": 2}
+    assert facets["Type"] == {"prompt": 2, "skill": 1}
+
+    matches = {5: 0, 3: 1}
+    found = views.query(ListingQuery.from_args(MultiDict({"q": "x"})), matches)
+    assert [e.id for e in found["items"]] == [5, 3]
+    assert found["facets"]["Category"] == {"Strategy": 1, "Analytics": 1}
+
+    # Ids from a search index synced to a newer snapshot are ignored
+    stale = views.query(ListingQuery.from_args(MultiDict({"q": "x", "sort": "title"})), {99: 0, 5: 1})
+    assert ([e.id for e in stale["items"]], stale["total"]) == ([5], 1)
+
+
+def test_listing_params_drop_defaults_and_reset_page():
+    query = ListingQuery.from_args(MultiDict({"type": "skill", "sort": "title", "page": "3"}))
+
+    assert query.params(page=4) == {"type": "skill", "sort": "title", "page": 4}
+    assert query.params(type=None) == {"sort": "title"}
+    assert query.cache_key() == "page=3&sort=title&type=skill"
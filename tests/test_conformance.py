@@ -0,0 +1,89 @@
+"""
+Test the conformance scanner engine: rules, caching and parallel checks.
+"""
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from scripts import conformance
+from scripts.conformance import scan
+
+
+def make_repo(root):
+    """A tiny repository with one bad template and a dangling content reference."""
+    (root / "app" / "templates").mkdir(parents=True)
+    (root / "app" / "templates" / "good.html").write_text(
+        '<header class="site-header"><nav class="header-nav"></nav></header>')
+    (root / "app" / "templates" / "bad.html").write_text("<h1>Kearney AI Commons</h1>")
+    (root / "prompts").mkdir()
+    (root / "prompts" / "One.txt").write_text("one")
+    (root / "app" / "prompts.json").write_text(json.dumps([
+        {"id": 1, "PromptContentFile": "prompts/One.txt"},
+        {"id": 2, "PromptContentFile": "prompts/Two.txt"},
+    ]))
+
+
+def test_scan_applies_rules_and_reports_missing_required_files(tmp_path):
+    make_repo(tmp_path)
+
+    result = scan(tmp_path, cache_path=None)
+
+    assert result.paths("no-commons-references") == ["app/templates/bad.html"]
+    assert result.messages("template-header") == ["bad.html missing site-header class", "bad.html missing header-nav"]
+    assert result.messages("prompt-content-files") == ["item 2: missing content file prompts/Two.txt"]
+    assert result.messages("logo-svg") == ["Kearney logo not found at app/static/kearney-logo.svg"]
+    assert not result.ok
+
+
+def test_scan_skips_unchanged_files(tmp_path):
+    """Unchanged files are not read again; touched files with the same content reuse results."""
+    make_repo(tmp_path / "repo")
+    cache_path = tmp_path / "cache.json"
+    rules = ["no-commons-references", "template-header"]
+
+    first = scan(tmp_path / "repo", rules, cache_path=cache_path)
+    second = scan(tmp_path / "repo", rules, cache_path=cache_path)
+    assert first.stats["read"] == 4
+    assert (second.stats["read"], second.stats["cached"]) == (0, 4)
+    assert second.violations == first.violations
+
+    bad = tmp_path / "repo" / "app" / "templates" / "bad.html"
+    st = os.stat(bad)
+    os.utime(bad, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000_000))
+    calls = []
+    original = conformance.RULES["template-header"].check
+    conformance.RULES["template-header"].check = lambda *args: calls.append(args) or original(*args)
+    try:
+        third = scan(tmp_path / "repo", rules, cache_path=cache_path)
+    finally:
+        conformance.RULES["template-header"].check = original
+    assert third.stats["read"] == 1
+    assert calls == []
+    assert third.violations == first.violations
+
+
+def test_scan_checks_files_in_a_process_pool(tmp_path, monkeypatch):
+    make_repo(tmp_path)
+    monkeypatch.setattr(conformance, "PARALLEL_THRESHOLD", 1)
+
+    parallel = scan(tmp_path, jobs=2, cache_path=None)
+    serial = scan(tmp_path, jobs=1, cache_path=None)
+
+    assert parallel.violations == serial.violations
+
+
+def test_scan_skips_files_ignored_by_git(tmp_path):
+    make_repo(tmp_path)
+    (tmp_path / "local").mkdir()
+    (tmp_path / "local" / "notes.txt").write_text("AI Commons")
+    (tmp_path / "report.patch").write_text("AI Commons")
+    (tmp_path / ".gitignore").write_text("/local/\n/report.patch\n")
+    subprocess.run(["git", "init", "-q"], cwd=tmp_path, check=True)
+
+    result = scan(tmp_path, ["no-commons-references"], cache_path=None)
+
+    assert result.paths("no-commons-references") == ["app/templates/bad.html"]
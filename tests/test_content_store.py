@@ -0,0 +1,105 @@
+"""
+Test the content-addressed version store and the history tool.
+"""
+import json
+import sys
+import zlib
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+sys.path.insert(0, str(Path(__file__).parent.parent / "app"))
+
+import pytest
+
+from catalog import content_hash
+from content_store import ContentStore, StoreError, apply_delta, line_delta
+from scripts import prompt_history
+from scripts.response_cache import content_hash as response_cache_hash
+
+
+def body(edits=0):
+    lines = [f"Step {i}: analyse the client's market and pricing model.\n" for i in range(400)]
+    for i in range(edits):
+        lines[i * 37 % len(lines)] = f"Step {i}: revised guidance.\n"
+    return "".join(lines)
+
+
+def test_line_delta_round_trips():
+    base, text = body(), body(edits=5) + "trailing line without newline"
+    assert apply_delta(base, line_delta(base, text)) == text
+    assert apply_delta(text, line_delta(text, "")) == ""
+
+
+def test_store_keys_match_catalog_and_validation_cache(tmp_path):
+    store = ContentStore(str(tmp_path))
+    text = body()
+    assert store.put(text) == content_hash(text)
+    assert response_cache_hash is content_hash
+
+
+def test_versions_are_stored_as_deltas(tmp_path):
+    """Storage grows with the edits, and every version reads back from disk."""
+    store = ContentStore(str(tmp_path))
+    hashes = [store.put(body())]
+    _, full_size = store.disk_usage()
+    for edits in range(1, 30):
+        hashes.append(store.put(body(edits), base=hashes[-1]))
+    count, size = store.disk_usage()
+    assert count == 30
+    assert size < full_size * 10
+    assert store.stats["full"] == 2
+
+    fresh = ContentStore(str(tmp_path))
+    assert [fresh.get(h) for h in hashes] == [body(edits) for edits in range(30)]
+    assert "+Step 28: revised guidance." in fresh.diff(hashes[28], hashes[29])
+
+
+def test_corrupt_blob_is_detected(tmp_path):
+    store = ContentStore(str(tmp_path))
+    blob_hash = store.put(body())
+    path = Path(store._path(blob_hash))
+    path.write_bytes(path.read_bytes()[:-4])
+    assert store.verify(blob_hash) is not None
+    with pytest.raises(StoreError):
+        ContentStore(str(tmp_path)).get("0" * 64)
+
+
+@pytest.mark.parametrize("data", [
+    b"not a header\nbody",
+    b'{"kind": "full"}\n\xff\xfe',
+    b'{"kind": "delta", "base": "00"}\nnot json',
+    b'{"chain": 1}\nbody',
+])
+def test_malformed_blob_raises_store_error(tmp_path, data):
+    """A blob that decompresses but does not parse is reported as corrupt."""
+    store = ContentStore(str(tmp_path))
+    blob_hash = store.put(body())
+    Path(store._path(blob_hash)).write_bytes(zlib.compress(data))
+    with pytest.raises(StoreError):
+        ContentStore(str(tmp_path)).get(blob_hash)
+
+
+def test_record_appends_history_only_for_changes(tmp_path):
+    (tmp_path / "prompts").mkdir()
+    content = tmp_path / "prompts" / "Example.txt"
+    content.write_text(body())
+    items_json = tmp_path / "prompts.json"
+    items_json.write_text(json.dumps([
+        {"id": 1, "Title": "Example", "PromptContentFile": "prompts/Example.txt", "Version": 1.0},
+        {"id": 2, "Title": "Missing", "PromptContentFile": "prompts/Missing.txt", "Version": 1.0},
+    ]))
+    store_dir = tmp_path / "store"
+
+    assert prompt_history.record(items_json, tmp_path, store_dir, date="2025-01-01") == [(1, 1.0)]
+    assert prompt_history.record(items_json, tmp_path, store_dir) == []
+
+    content.write_text(body(edits=3))
+    items = json.loads(items_json.read_text())
+    items[0]["Version"] = 2.0
+    items_json.write_text(json.dumps(items))
+    assert prompt_history.record(items_json, tmp_path, store_dir, date="2025-02-01") == [(1, 2.0)]
+
+    history = json.loads(items_json.read_text())[0]["History"]
+    assert [(h["Version"], h["Date"]) for h in history] == [(1.0, "2025-01-01"), (2.0, "2025-02-01")]
+    assert history[1]["Files"] == {"prompts/Example.txt": content_hash(body(edits=3))}
+    assert prompt_history.verify(items_json, store_dir) == []
@@ -0,0 +1,64 @@
+"""
+Test the static site export and its incremental rebuilds.
+"""
+import gzip
+import json
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from scripts import benchmark, export_site
+
+
+def test_export_writes_pages_assets_and_search_index(tmp_path):
+    """Every page is rendered with links into the exported layout."""
+    items_json = benchmark.generate_library(tmp_path / "library", 30, seed=2)
+    items = json.loads(items_json.read_text())
+    site = tmp_path / "site"
+
+    stats = export_site.export(site, items_json, items_json.parent)
+
+    assert stats["written"] == stats["files"]
+    for item in items:
+        assert (site / "prompt" / str(item["id"]) / "index.html").exists()
+        assert (site / "api" / "items" / str(item["id"]) / "content.txt").exists()
+    assert (site / "type" / "skill" / "index.html").exists()
+    assert (site / "guide" / "index.html").exists()
+
+    index = (site / "index.html").read_text()
+    css = [path.name for path in (site / "static").glob("style.*.css")]
+    assert len(css) == 1
+    assert f'href="/static/{css[0]}"' in index
+    assert 'href="/prompt/1/"' in index
+    assert 'data-search-index="/search-index.json"' in index
+    assert gzip.decompress((site / "index.html.gz").read_bytes()).decode() == index
+
+    search = json.loads((site / "search-index.json").read_text())
+    assert [doc["id"] for doc in search["docs"]] == [item["id"] for item in items]
+    assert search["terms"]
+
+
+def test_export_rebuilds_only_changed_pages(tmp_path):
+    """A rebuild renders just the pages whose sources changed and drops removed ones."""
+    items_json = benchmark.generate_library(tmp_path / "library", 30, seed=2)
+    site = tmp_path / "site"
+    export_site.export(site, items_json, items_json.parent)
+
+    unchanged = export_site.export(site, items_json, items_json.parent)
+    assert unchanged["written"] == 0
+
+    items = json.loads(items_json.read_text())
+    prompt = next(item for item in items if item["Type"] == "prompt")
+    content = items_json.parent / prompt["PromptContentFile"]
+    content.write_text(content.read_text() + "edited\n")
+    edited = export_site.export(site, items_json, items_json.parent)
+    # The detail page, its content.txt and the search index
+    assert edited["written"] == 3
+    assert "edited" in (site / "api" / "items" / str(prompt["id"]) / "content.txt").read_text()
+
+    removed_id = items[-1]["id"]
+    items_json.write_text(json.dumps(items[:-1]))
+    shrunk = export_site.export(site, items_json, items_json.parent)
+    assert shrunk["removed"] == 2
+    assert not (site / "prompt" / str(removed_id)).exists()
@@ -0,0 +1,38 @@
+"""
+Test the rendered page cache.
+"""
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "app"))
+
+from page_cache import PageCache
+
+
+def test_page_cache_hits_until_version_changes():
+    """A page is re-rendered only when its version changes."""
+    cache = PageCache()
+    renders = []
+
+    def render():
+        renders.append(1)
+        return f"page {len(renders)}"
+
+    assert cache.get_or_render("index", "v1", render) == b"page 1"
+    assert cache.get_or_render("index", "v1", render) == b"page 1"
+    assert cache.get_or_render("index", "v2", render) == b"page 2"
+    assert cache.stats == {"hits": 1, "misses": 2, "stale": 1, "evictions": 0}
+
+
+def test_page_cache_is_bounded():
+    """The least recently used page is evicted once the cache is full."""
+    cache = PageCache(max_entries=2)
+    cache.get_or_render("a", "v1", lambda: "a")
+    cache.get_or_render("b", "v1", lambda: "b")
+    cache.get_or_render("a", "v1", lambda: "a")
+    cache.get_or_render("c", "v1", lambda: "c")
+
+    assert cache.get_stats()["pages"] == 2
+    assert cache.stats["evictions"] == 1
+    assert cache.get_or_render("a", "v1", lambda: "new a") == b"a"
+    assert cache.get_or_render("b", "v1", lambda: "new b") == b"new b"
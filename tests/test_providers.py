@@ -0,0 +1,166 @@
+"""
+Test the provider client layer: rate limiting and retry/backoff.
+"""
+import json
+import sys
+import threading
+import urllib.request
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from pathlib import Path
+from urllib.error import HTTPError
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from scripts import providers
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+        self.sleeps = []
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+def test_token_bucket_waits_for_refill():
+    """A drained bucket blocks until enough tokens have been refilled."""
+    clock = FakeClock()
+    bucket = providers.TokenBucket(60, clock=clock, sleep=clock.sleep)
+
+    bucket.acquire(60)
+    bucket.acquire(30)
+
+    assert clock.sleeps == [pytest.approx(30.0)]
+
+
+def test_rate_limiter_settles_to_actual_usage():
+    """Over-reserved tokens are returned once real usage is known."""
+    clock = FakeClock()
+    limiter = providers.RateLimiter(tokens_per_minute=100, clock=clock, sleep=clock.sleep)
+
+    limiter.acquire(80)
+    limiter.settle(80, 20)
+    limiter.acquire(80)
+
+    assert clock.sleeps == []
+
+
+class Throttled(Exception):
+    status_code = 429
+    headers = {"retry-after": "0"}
+
+
+def test_failed_attempts_refund_their_token_reservation(monkeypatch):
+    """Only the successful attempt's real usage is left charged to the bucket."""
+    clock = FakeClock()
+    limiter = providers.RateLimiter(tokens_per_minute=1000, clock=clock, sleep=clock.sleep)
+    monkeypatch.setitem(providers._limiters, "stub", limiter)
+    attempts = []
+
+    def flaky():
+        attempts.append(1)
+        if len(attempts) < 3:
+            raise Throttled()
+        return "ok"
+
+    assert providers.limited_call("stub", flaky, 300, usage_tokens=lambda r: 100) == ("ok", 2)
+    assert limiter.tokens._tokens == pytest.approx(900)
+    assert clock.sleeps == []
+
+
+def stub_server(responses):
+    """Serve the given (status, headers, body) responses in order."""
+    requests = []
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_POST(self):
+            self.rfile.read(int(self.headers.get("Content-Length") or 0))
+            requests.append(self.path)
+            status, headers, body = responses[min(len(requests), len(responses)) - 1]
+            data = json.dumps(body).encode()
+            self.send_response(status)
+            for name, value in {"Content-Type": "application/json", "Content-Length": str(len(data)),
+                                **headers}.items():
+                self.send_header(name, value)
+            self.end_headers()
+            self.wfile.write(data)
+
+        def log_message(self, *args):
+            pass
+
+    server = HTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, requests
+
+
+def post(server):
+    url = f"http://127.0.0.1:{server.server_port}/v1/messages"
+    with urllib.request.urlopen(urllib.request.Request(url, data=b"{}", method="POST")) as r:
+        return json.load(r)
+
+
+def test_call_with_retry_honors_retry_after_against_stub_server():
+    """429 and 5xx responses are retried; retry-after overrides backoff."""
+    server, requests = stub_server([
+        (429, {"retry-after": "2"}, {"error": "rate_limited"}),
+        (503, {}, {"error": "overloaded"}),
+        (200, {}, {"ok": True}),
+    ])
+    sleeps = []
+    try:
+        result, retries = providers.call_with_retry(lambda: post(server), sleep=sleeps.append)
+    finally:
+        server.shutdown()
+
+    assert result == {"ok": True}
+    assert retries == 2
+    assert len(requests) == 3
+    assert sleeps[0] == 2.0
+    assert 0 <= sleeps[1] <= providers.BASE_DELAY_SECONDS * 2
+
+
+def test_call_with_retry_does_not_retry_client_errors():
+    server, requests = stub_server([(400, {}, {"error": "bad_request"})])
+    try:
+        with pytest.raises(HTTPError):
+            providers.call_with_retry(lambda: post(server), sleep=lambda s: None)
+    finally:
+        server.shutdown()
+
+    assert len(requests) == 1
+
+
+def test_sdk_client_retries_against_stub_server(monkeypatch):
+    """The pooled SDK client, pointed at the stub, goes through our retries and limits."""
+    pytest.importorskip("anthropic")
+    message = {
+        "id": "msg_stub", "type": "message", "role": "assistant", "model": "stub-model",
+        "content": [{"type": "text", "text": "hello"}], "stop_reason": "end_turn",
+        "stop_sequence": None, "usage": {"input_tokens": 10, "output_tokens": 5},
+    }
+    server, requests = stub_server([
+        (429, {"retry-after": "0"}, {"type": "error", "error": {"type": "rate_limit_error", "message": "slow down"}}),
+        (200, {}, message),
+    ])
+    clock = FakeClock()
+    limiter = providers.RateLimiter(tokens_per_minute=1000, clock=clock, sleep=clock.sleep)
+    monkeypatch.setenv("ANTHROPIC_BASE_URL", f"http://127.0.0.1:{server.server_port}")
+    monkeypatch.setenv("ANTHROPIC_API_KEY", "test-key")
+    monkeypatch.setattr(providers, "_clients", {})
+    monkeypatch.setitem(providers._limiters, "anthropic", limiter)
+    try:
+        result = providers.AnthropicAdapter().call("system", "query", model="stub-model", max_tokens=16)
+    finally:
+        server.shutdown()
+
+    assert result["error"] is None
+    assert (result["response"], result["retries"]) == ("hello", 1)
+    assert requests == ["/v1/messages", "/v1/messages"]
+    assert limiter.tokens._tokens == pytest.approx(1000 - 15)
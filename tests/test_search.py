@@ -0,0 +1,69 @@
+"""
+Test the full-text search index.
+"""
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "app"))
+
+from search import SearchIndex, tokenize
+
+
+def make_index():
+    index = SearchIndex()
+    index.add_document(1, {"Title": "Market Sizing", "content": "TAM SAM SOM market model"},
+                       {"Type": "prompt", "Category": "Strategy"})
+    index.add_document(2, {"Title": "Hypothesis Tree", "content": "structure a hypothesis tree"},
+                       {"Type": "skill", "Category": "Problem Solving"})
+    index.add_document(3, {"Title": "Issue Tree", "content": "decompose an issue into a tree"},
+                       {"Type": "skill", "Category": "Problem Solving"})
+    return index
+
+
+def test_tokenize_drops_stop_words_and_punctuation():
+    assert tokenize("How to size the TAM/SAM market?") == ["size", "tam", "sam", "market"]
+
+
+def test_search_ranks_with_bm25_and_prefixes():
+    """Title matches outrank body matches and prefixes expand to full terms."""
+    index = make_index()
+
+    assert [r["id"] for r in index.search("tree")["results"]] == [2, 3]
+    assert [r["id"] for r in index.search("hypo")["results"]] == [2]
+    assert index.search("market tree")["total"] == 0
+
+
+def test_search_filters_facets_and_paginates():
+    index = make_index()
+
+    found = index.search("", {"Type": "skill"}, page=2, per_page=1)
+    assert found["total"] == 2
+    assert [r["id"] for r in found["results"]] == [3]
+    assert found["facets"]["Category"] == {"Problem Solving": 2}
+
+
+def test_search_updates_incrementally():
+    """Re-adding or removing a document updates postings and facets."""
+    index = make_index()
+    index.add_document(1, {"Title": "Pricing Review"}, {"Type": "prompt"})
+    index.remove_document(3)
+
+    assert index.search("market")["total"] == 0
+    assert [r["id"] for r in index.search("pricing")["results"]] == [1]
+    # Prefixes see terms added and dropped since the last search
+    assert [r["id"] for r in index.search("pric")["results"]] == [1]
+    assert index.search("decomp")["total"] == 0
+    assert index.search("")["facets"]["Type"] == {"prompt": 1, "skill": 1}
+    assert len(index) == 2
+
+
+def test_ranking_is_cached_until_the_index_changes():
+    """Full rankings are reused per query and dropped when a document changes."""
+    index = make_index()
+
+    ranking = index.ranking("tree")
+    assert ranking == {2: 0, 3: 1}
+    assert index.ranking("Tree?") is ranking
+
+    index.add_document(1, {"Title": "Decision Tree"}, {"Type": "prompt"})
+    assert index.ranking("tree") == {1: 0, 2: 1, 3: 2}
@@ -0,0 +1,351 @@
+"""
+Test the prompt validation suite without calling real provider APIs.
+"""
+import random
+import sys
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from scripts import providers, validate_prompts
+
+
+class FakeAdapter(providers.ProviderAdapter):
+    """Adapter that forwards calls to a plain function."""
+
+    def __init__(self, name, fn):
+        self.name = name
+        self.fn = fn
+
+    def call(self, system_prompt, user_query, **kwargs):
+        return self.fn(system_prompt, user_query, **kwargs)
+
+
+def use_providers(monkeypatch, **fns):
+    """Replace registered provider adapters with function stubs."""
+    for name, fn in fns.items():
+        monkeypatch.setitem(providers.PROVIDER_ADAPTERS, name, FakeAdapter(name, fn))
+
+
+def make_prompts(count):
+    return [
+        {"filename": f"Prompt{i}.txt", "content": f"prompt {i}", "size_bytes": 8, "line_count": 1}
+        for i in range(count)
+    ]
+
+
+def fake_provider(name, peaks, errors=()):
+    """Build a provider stub that records its peak concurrency."""
+    active = [0]
+    lock = threading.Lock()
+
+    def call(system_prompt, user_query, **kwargs):
+        with lock:
+            active[0] += 1
+            peaks[name] = max(peaks.get(name, 0), active[0])
+        time.sleep(random.uniform(0, 0.005))
+        with lock:
+            active[0] -= 1
+        error = "boom" if system_prompt in errors else None
+        return {
+            "response": None if error else f"{name}: {system_prompt} / {user_query}",
+            "tokens_used": 0 if error else 10,
+            "latency_ms": 1.0,
+            "error": error,
+        }
+
+    return call
+
+
+def test_run_validation_is_concurrent_and_ordered(monkeypatch):
+    """Jobs run in parallel within limits and rows keep prompt/test order."""
+    peaks = {}
+    use_providers(
+        monkeypatch,
+        anthropic=fake_provider("anthropic", peaks),
+        openai=fake_provider("openai", peaks, errors={"prompt 1"}),
+    )
+
+    results = validate_prompts.run_validation(
+        make_prompts(4), concurrency=4, provider_concurrency={"anthropic": 2, "openai": 3}
+    )
+
+    expected = [(f"Prompt{i}.txt", t["id"]) for i in range(4) for t in validate_prompts.TEST_QUERIES]
+    assert [(r["prompt_file"], r["test_id"]) for r in results] == expected
+    assert peaks["anthropic"] <= 2
+    assert peaks["openai"] <= 3
+    assert {r["status"] for r in results if r["prompt_file"] == "Prompt1.txt"} == {"OPENAI_FAILED"}
+    assert {r["status"] for r in results if r["prompt_file"] != "Prompt1.txt"} == {"SUCCESS"}
+    assert results[0]["anthropic_response"] == "anthropic: prompt 0 / " + validate_prompts.TEST_QUERIES[0]["query"]
+
+
+def counting_provider(calls):
+    def call(system_prompt, user_query, **kwargs):
+        calls.append((system_prompt, user_query))
+        return {"response": "ok", "tokens_used": 5, "latency_ms": 1.0, "error": None}
+    return call
+
+
+def test_response_cache_skips_unchanged_prompts(monkeypatch, tmp_path):
+    """Only changed prompts hit the API on a re-run; --refresh forces all."""
+    calls = []
+    use_providers(monkeypatch, anthropic=counting_provider(calls))
+    targets = validate_prompts.build_targets(["anthropic"])
+    cache = validate_prompts.ResponseCache(tmp_path / "cache.sqlite3")
+    prompts = make_prompts(2)
+    tests = len(validate_prompts.TEST_QUERIES)
+
+    validate_prompts.run_validation(prompts, cache=cache, targets=targets)
+    assert len(calls) == 2 * tests
+
+    prompts[1]["content"] = "edited prompt"
+    results = validate_prompts.run_validation(prompts, cache=cache, targets=targets)
+    assert len(calls) == 3 * tests
+    assert [r["anthropic_cached"] for r in results] == [True] * tests + [False] * tests
+
+    validate_prompts.run_validation(prompts, cache=cache, refresh=True, targets=targets)
+    assert len(calls) == 5 * tests
+    cache.close()
+
+
+def test_results_stream_in_order_and_resume_skips_successes(monkeypatch, tmp_path):
+    """Rows are written as they finish and --resume only re-runs failures."""
+    from scripts.report_writer import ReportWriter, compact_report, load_latest_rows
+
+    calls = []
+    failing = {"prompt 1"}
+
+    def flaky(system_prompt, user_query, **kwargs):
+        calls.append(system_prompt)
+        error = "boom" if system_prompt in failing else None
+        return {"response": None if error else "ok", "tokens_used": 1, "latency_ms": 1.0, "error": error}
+
+    use_providers(monkeypatch, anthropic=flaky, openai=counting_provider([]))
+    report = tmp_path / "report.csv"
+    fieldnames = validate_prompts.report_fieldnames()
+    prompts = make_prompts(3)
+    tests = len(validate_prompts.TEST_QUERIES)
+
+    with ReportWriter(report, fieldnames) as writer:
+        assert validate_prompts.run_validation(prompts, concurrency=1, on_result=writer.write) == []
+    assert len(calls) == 3 * tests
+    assert report.with_suffix(".jsonl").read_text().count("\n") == 3 * tests
+
+    failing.clear()
+    completed = validate_prompts.load_completed(report, validate_prompts.DEFAULT_TARGETS)
+    assert len(completed) == 3 * tests
+    with ReportWriter(report, fieldnames, append=True) as writer:
+        validate_prompts.run_validation(prompts, on_result=writer.write, completed=completed)
+    assert calls[3 * tests:] == ["prompt 1"] * tests
+
+    order = [(p["filename"], t["id"], validate_prompts.MAX_TOKENS)
+             for p in prompts for t in validate_prompts.TEST_QUERIES]
+    compact_report(report, fieldnames, order=order)
+    rows = list(load_latest_rows(report).values())
+    assert [(r["prompt_file"], r["test_id"], r["max_tokens"]) for r in rows] == order
+    assert {r["status"] for r in rows} == {"SUCCESS"}
+    assert report.read_text().count("\n") == 3 * tests + 1
+
+    # Appending with other columns is refused; a CSV-only report still resumes
+    with pytest.raises(ValueError):
+        ReportWriter(report, validate_prompts.report_fieldnames(validate_prompts.build_targets(["mock"])), append=True)
+    report.with_suffix(".jsonl").unlink()
+    completed = validate_prompts.load_completed(report, validate_prompts.DEFAULT_TARGETS)
+    assert completed.succeeded(order[0]) == {"anthropic", "openai"}
+    assert completed.row(order[-1])["status"] == "SUCCESS"
+
+
+def test_streaming_call_records_ttft_and_token_split(monkeypatch):
+    """Streaming calls keep a bounded preview and split input/output tokens."""
+    from types import SimpleNamespace as NS
+
+    events = [
+        NS(type="message_start", message=NS(usage=NS(input_tokens=120))),
+        NS(type="content_block_delta", delta=NS(type="text_delta", text="x" * 400)),
+        NS(type="content_block_delta", delta=NS(type="text_delta", text="y" * 400)),
+        NS(type="message_delta", usage=NS(output_tokens=200)),
+    ]
+    client = NS(messages=NS(create=lambda stream=False, **request: iter(events)))
+    monkeypatch.setattr(providers, "get_client", lambda provider: client)
+
+    result = providers.get_provider("anthropic").call("system", "query", stream=True)
+
+    assert result["error"] is None
+    assert result["response"] == "x" * 400 + "y" * 100
+    assert (result["input_tokens"], result["output_tokens"], result["tokens_used"]) == (120, 200, 320)
+    assert 0 <= result["ttft_ms"] <= result["latency_ms"]
+
+
+def test_summary_reports_latency_percentiles():
+    """Percentiles are aggregated per provider and per prompt, skipping cache hits."""
+    from scripts.report_writer import ReportSummary, percentile
+
+    assert percentile([1, 2, 3, 4, 5], 50) == 3
+    assert percentile([10, 20], 95) == pytest.approx(19.5)
+
+    summary = ReportSummary(["anthropic"])
+    for i, latency in enumerate([100, 200, 300, 400]):
+        summary.add({"status": "SUCCESS", "prompt_file": f"P{i % 2}.txt", "anthropic_latency_ms": latency,
+                     "anthropic_cached": False, "anthropic_error": None})
+    summary.add({"status": "SUCCESS", "prompt_file": "P0.txt", "anthropic_latency_ms": 9999,
+                 "anthropic_cached": True, "anthropic_error": None})
+
+    rows = {(r["scope"], r["name"]): r for r in summary.percentile_rows()}
+    assert rows[("provider", "anthropic")]["count"] == 4
+    assert rows[("provider", "anthropic")]["p50"] == 250
+    assert rows[("prompt", "P0.txt")]["p99"] == pytest.approx(298)
+    assert summary.cache_hits == 1
+
+
+def test_quantile_sketch_stays_bounded_past_exact_limit():
+    """Past its exact limit the sketch keeps buckets, within 1% of the true percentiles."""
+    from scripts.report_writer import QuantileSketch, percentile
+
+    rng = random.Random(7)
+    values = [rng.lognormvariate(6, 1) for _ in range(20_000)]
+    sketch = QuantileSketch(exact_limit=100)
+    for value in values:
+        sketch.add(value)
+
+    assert len(sketch) == 20_000
+    assert len(sketch._buckets) < 1_000
+    for pct in (50, 95, 99):
+        assert sketch.percentile(pct) == pytest.approx(percentile(values, pct), rel=0.01)
+
+
+def test_mock_matrix_is_deterministic_and_benchmarked(tmp_path):
+    """The mock provider sweeps models x prompts x tests x max_tokens offline."""
+    from scripts.report_writer import ReportSummary
+
+    targets = validate_prompts.build_targets(["mock:mock-small", "mock:mock-large", "openai"])
+    assert [t.label for t in targets] == ["mock_mock_small", "mock_mock_large", "openai"]
+    mock_targets = targets[:2]
+    prompts = make_prompts(3)
+
+    first = validate_prompts.run_validation(prompts, targets=mock_targets, max_tokens=[64, 512], concurrency=16)
+    second = validate_prompts.run_validation(prompts, targets=mock_targets, max_tokens=[64, 512], stream=True)
+
+    assert len(first) == 3 * len(validate_prompts.TEST_QUERIES) * 2
+    assert [r["max_tokens"] for r in first[:4]] == [64, 512, 64, 512]
+    assert {r["status"] for r in first} == {"SUCCESS"}
+    strip = ("timestamp", "_ttft_ms", "_tokens_per_sec")
+    assert [{k: v for k, v in r.items() if not k.endswith(strip)} for r in first] == \
+        [{k: v for k, v in r.items() if not k.endswith(strip)} for r in second]
+    assert all(r["mock_mock_small_output_tokens"] <= 64 for r in first if r["max_tokens"] == 64)
+
+    summary = ReportSummary([t.label for t in mock_targets])
+    for row in first:
+        summary.add(row)
+    bench = {(r["label"], r["max_tokens"]): r for r in summary.benchmark_rows()}
+    assert len(bench) == 4
+    small, large = bench[("mock_mock_small", 512)], bench[("mock_mock_large", 512)]
+    assert small["calls"] == 3 * len(validate_prompts.TEST_QUERIES)
+    assert small["p50_latency_ms"] < large["p50_latency_ms"]
+    assert small["total_cost_usd"] == 0.0
+
+    summary.write_benchmark_report(tmp_path / "bench.csv")
+    assert (tmp_path / "bench.csv").read_text().startswith("label,model,max_tokens,calls")
+
+
+def test_preflight_plan_counts_matrix_and_trims_to_budget(tmp_path):
+    """The planner multiplies tokens across the matrix and skips cached calls."""
+    from scripts.preflight import count_tokens
+
+    assert count_tokens("") == 0
+    assert count_tokens("Summarize the capabilities, 2024!") == 10
+    prompts = make_prompts(2)
+    targets = validate_prompts.build_targets(["anthropic", "openai"])
+    tests = len(validate_prompts.TEST_QUERIES)
+
+    plan = validate_prompts.plan_validation(prompts, targets, [100, 200])
+    assert len(plan.rows) == 2 * tests * 2
+    assert plan.calls == 2 * tests * 2 * 2
+    assert plan.output_tokens == 2 * tests * 2 * (100 + 200)
+    assert plan.cost_usd > 0
+    assert plan.rows_within() == len(plan.rows)
+    assert plan.rows_within(max_cost=0) == 0
+    cost_of_first = plan.rows[0][1]
+    assert plan.rows_within(max_cost=cost_of_first) == 1
+    assert plan.over_budget(max_total_tokens=plan.total_tokens - 1)
+    assert not plan.over_budget(max_cost=plan.cost_usd, max_total_tokens=plan.total_tokens)
+
+    durations = plan.duration_seconds(8, {}, 4)
+    assert durations["total"] >= max(durations["anthropic"], durations["openai"]) > 0
+
+    cache = validate_prompts.ResponseCache(tmp_path / "cache.sqlite3")
+    mock = validate_prompts.build_targets(["mock"])
+    validate_prompts.run_validation(prompts[:1], cache=cache, targets=mock)
+    cached_plan = validate_prompts.plan_validation(prompts, mock, cache=cache)
+    assert (cached_plan.skipped, cached_plan.calls) == (tests, tests)
+    assert validate_prompts.run_validation(prompts, targets=mock, max_rows=3)[-1]["test_id"] == "T3"
+    cache.close()
+
+
+def test_prompt_caching_warms_each_group_once_and_batches(monkeypatch):
+    """One call per (prompt, target) writes the prompt cache; the rest read it."""
+    monkeypatch.setitem(providers.PROVIDER_ADAPTERS, "mock", providers.MockAdapter())
+    targets = validate_prompts.build_targets(["mock:mock-small", "mock:mock-large"])
+    prompts = make_prompts(3)
+    tests = len(validate_prompts.TEST_QUERIES)
+
+    results = validate_prompts.run_validation(
+        prompts, targets=targets, max_tokens=[64, 128], concurrency=16,
+        provider_concurrency={"mock": 8}, prompt_caching=True,
+    )
+    for target in targets:
+        writes = [r for r in results if r[f"{target.label}_cache_write_tokens"]]
+        reads = [r for r in results if r[f"{target.label}_cache_read_tokens"]]
+        assert len(writes) == len(prompts)
+        assert len(reads) == len(prompts) * (tests * 2 - 1)
+        assert all(w["test_id"] == "T1" and w["max_tokens"] == 64 for w in writes)
+
+    monkeypatch.setitem(providers.PROVIDER_ADAPTERS, "mock", providers.MockAdapter())
+    batched = validate_prompts.run_validation(prompts, targets=targets[:1], batch=True)
+    assert [(r["prompt_file"], r["test_id"]) for r in batched] == \
+        [(p["filename"], t["id"]) for p in prompts for t in validate_prompts.TEST_QUERIES]
+    assert {r["status"] for r in batched} == {"SUCCESS"}
+    single = validate_prompts.run_validation(prompts, targets=targets[:1])
+    assert [r["mock_mock_small_response"] for r in batched] == [r["mock_mock_small_response"] for r in single]
+
+
+def test_response_cache_hit_does_not_warm_the_prompt_cache(monkeypatch, tmp_path):
+    """A warming call served from the response cache leaves the next job to write the prompt cache."""
+    monkeypatch.setitem(providers.PROVIDER_ADAPTERS, "mock", providers.MockAdapter())
+    mock = validate_prompts.build_targets(["mock"])
+    prompts = make_prompts(1)
+    cache = validate_prompts.ResponseCache(tmp_path / "cache.sqlite3")
+    validate_prompts.run_validation(prompts, cache=cache, targets=mock, max_rows=1, prompt_caching=True)
+
+    # A fresh provider has an empty prompt cache; calls overlapping the
+    # one that writes it would all miss
+    monkeypatch.setitem(providers.PROVIDER_ADAPTERS, "mock", providers.MockAdapter(latency_scale=0.01))
+    results = validate_prompts.run_validation(prompts, cache=cache, targets=mock, concurrency=8,
+                                              prompt_caching=True)
+    called = [r for r in results if not r["mock_cached"]]
+    assert results[0]["mock_cached"]
+    assert [r["test_id"] for r in called if r["mock_cache_write_tokens"]] == ["T2"]
+    assert all(r["mock_cache_read_tokens"] for r in called[1:])
+    cache.close()
+
+
+def test_cost_accounts_for_prompt_cache_and_batch_pricing():
+    """Cache reads are billed at the cache price and batches at a discount."""
+    full = providers.estimate_cost("claude-sonnet-4-20250514", 1_000_000, 0)
+    assert full == pytest.approx(3.00)
+    assert providers.estimate_cost("claude-sonnet-4-20250514", 1_000_000, 0, cache_read_tokens=1_000_000) == \
+        pytest.approx(0.30)
+    assert providers.estimate_cost("claude-sonnet-4-20250514", 1_000_000, 0, batch=True) == pytest.approx(1.50)
+    assert providers.estimate_cost("unknown-model", 10, 10) is None
+
+
+def test_plan_rejects_dry_run(monkeypatch, capsys):
+    """--plan with --dry-run is refused instead of silently running the dry run."""
+    monkeypatch.setattr(sys, "argv", ["validate_prompts.py", "--plan", "--dry-run"])
+    with pytest.raises(SystemExit) as exited:
+        validate_prompts.main()
+    assert exited.value.code == 2
+    assert "--plan cannot be combined with --dry-run" in capsys.readouterr().err